@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import logging
+
+from streamlit.logger import set_log_level
+
+# Cache Streamlit dipakai tanpa server Streamlit; peringatan "No runtime found"
+# dari dekorator cache tidak relevan dan dimatikan sebelum dashboard diimpor
+set_log_level('error')
+
+from dashboards import Ayam_Petelur_Morotai, Cengkeh_Morotai, Kakao_Morotai, Padi_Morotai, Pisang_Morotai
+
+from core.api import AnalyticsAPI, make_server
+from core.async_api import MAX_WORKERS, AsyncAnalyticsServer
+
+# API HTTP/JSON baca-saja untuk hasil analisis, dijalankan terpisah dari
+# Streamlit:
+#
+#   python api_server.py --port 8600 --workers 4
+#   curl http://127.0.0.1:8600/api/padi/rekomendasi_implementasi?page=1
+#
+# Secara bawaan server memakai asyncio dengan pool proses untuk analisis berat;
+# --threaded menjalankan server satu-thread-per-koneksi yang sederhana.
+
+COMMODITIES = {
+    "ayam": (Ayam_Petelur_Morotai.load_data, Ayam_Petelur_Morotai.EXPORT_TABLES),
+    "cengkeh": (Cengkeh_Morotai.load_data, Cengkeh_Morotai.EXPORT_TABLES),
+    "kakao": (Kakao_Morotai.load_data, Kakao_Morotai.EXPORT_TABLES),
+    "padi": (Padi_Morotai.load_data, Padi_Morotai.EXPORT_TABLES),
+    "pisang": (Pisang_Morotai.load_data, Pisang_Morotai.EXPORT_TABLES),
+}
+
+
+# Dipanggil juga di setiap proses pekerja pool analisis
+def build_commodities():
+    return COMMODITIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API analisis pertanian Pulau Morotai")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="jumlah proses pekerja analisis")
+    parser.add_argument('--threaded', action='store_true', help="pakai server thread, bukan asyncio")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.info("API berjalan di http://%s:%s/api", args.host, args.port)
+
+    if args.threaded:
+        server = make_server(AnalyticsAPI(build_commodities()), args.host, args.port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    server = AsyncAnalyticsServer(build_commodities, max_workers=args.workers)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
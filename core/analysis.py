@@ -0,0 +1,113 @@
+import pandas as pd
+
+from core.cache import versioned_cache
+from core.risk import production_risk as _production_risk
+from core.risk import rolling_risk as _rolling_risk
+
+# Analisis yang dipakai bersama oleh dashboard komoditas.
+#
+# Setiap analisis hanya punya satu implementasi yang di-cache dengan kunci
+# (komoditas, versi dataset) lewat @versioned_cache, sehingga perbaikan atau
+# percepatan cukup dilakukan di sini dan hasilnya dipakai ulang oleh grafik,
+# teks kesimpulan, ekspor, dan API. Nama kolom permintaan dapat diganti
+# (misalnya 'permintaan_ayam' untuk ayam petelur).
+
+DEMAND = 'permintaan_pasar'
+CORRELATION_COLUMNS = ('produksi_pertahun', 'harga', 'luas_lahan_hektar', 'tingkat_konsumsi_perkapita_perkg')
+
+
+@versioned_cache
+def analyze_yearly_production(df):
+    yearly_production = df.groupby('tahun')['produksi_pertahun'].agg(['mean', 'sum']).round(2)
+    return yearly_production
+
+
+@versioned_cache
+def analyze_top_regions(df):
+    """
+    Rata-rata dan total produksi per wilayah, urut dari total tertinggi.
+    """
+    top_regions = df.groupby('wilayah', observed=True)['produksi_pertahun'].agg(['mean', 'sum']).round(2)
+    return top_regions.sort_values('sum', ascending=False)
+
+
+@versioned_cache
+def analyze_rain_production(df):
+    rain_production = df.groupby('curah_hujan', observed=True).agg(
+        mean=('produksi_pertahun', 'mean'),
+        count=('produksi_pertahun', 'count'),
+        harga=('harga', 'mean')
+    ).round(2)
+    return rain_production
+
+
+@versioned_cache
+def analyze_market_demand(df, demand=DEMAND):
+    """
+    Rata-rata produksi dan harga serta jumlah data per kategori permintaan
+    (juga dipakai untuk "Peluang Pasar Berdasarkan Permintaan").
+    """
+    market_demand = df.groupby(demand, observed=True).agg({
+        'produksi_pertahun': 'mean',
+        'harga': 'mean',
+        'wilayah': 'count'
+    }).round(2)
+    return market_demand
+
+
+@versioned_cache
+def analyze_price_per_region(df, demand=DEMAND):
+    price_analysis = df.groupby('wilayah', observed=True).agg({
+        'harga': ['mean', 'min', 'max'],
+        demand: lambda x: x.value_counts().index[0]
+    }).round(2)
+    return price_analysis
+
+
+@versioned_cache
+def analyze_correlation(df, columns=CORRELATION_COLUMNS):
+    """
+    Matriks korelasi kolom numerik; kolom bertingkat (rendah/sedang/tinggi)
+    dihitung dengan kode tabel globalnya (0/1/2).
+    """
+    data = pd.DataFrame({
+        column: df[column].cat.codes if isinstance(df[column].dtype, pd.CategoricalDtype) else df[column]
+        for column in columns
+    })
+    return data.corr()
+
+
+@versioned_cache
+def analyze_potential_regions(df, demand=DEMAND):
+    """
+    Skor potensi wilayah: 30% produksi, 30% konsumsi per kapita, dan 40% harga
+    (masing-masing relatif terhadap wilayah tertinggi).
+    """
+    potential_regions = df.groupby('wilayah', observed=True).agg({
+        'produksi_pertahun': 'mean',
+        demand: lambda x: x.value_counts().index[0],
+        'tingkat_konsumsi_perkapita_perkg': 'mean',
+        'harga': 'mean'
+    }).round(2)
+    potential_regions['skor_potensi'] = (
+        (potential_regions['produksi_pertahun'] / potential_regions['produksi_pertahun'].max()) * 0.3 +
+        (potential_regions['tingkat_konsumsi_perkapita_perkg'] / potential_regions['tingkat_konsumsi_perkapita_perkg'].max()) * 0.3 +
+        (potential_regions['harga'] / potential_regions['harga'].max()) * 0.4
+    ).round(2)
+    return potential_regions
+
+
+@versioned_cache
+def analyze_production_risk(df):
+    """
+    Mean, std, dan CV produksi per wilayah ("Analisis Risiko Produksi").
+    """
+    return _production_risk(df)
+
+
+@versioned_cache
+def analyze_rolling_risk(df, window=3):
+    """
+    CV produksi bergulir `window` tahun per wilayah dan seluruh wilayah.
+    """
+    return _rolling_risk(df, window)
@@ -0,0 +1,242 @@
+import gzip
+import hashlib
+import json
+import logging
+from collections import namedtuple
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from core.cache import dataset_key, frame_key
+from core.export import slugify, table_slice
+
+# API HTTP/JSON baca-saja untuk hasil analisis dashboard.
+#
+# Setiap komoditas didaftarkan sebagai (load_data, tabel) dengan tabel berupa
+# dict judul -> fungsi analisis (sama dengan EXPORT_TABLES dashboard). Hasil
+# analisis diambil dari fungsi ber-cache yang sama dengan dashboard; halaman
+# JSON yang sudah diserialisasi (dan versi gzip-nya) disimpan di LRU. ETag
+# dibentuk dari versi dataset dan parameter permintaan, sehingga permintaan
+# bersyarat (If-None-Match) dijawab 304 tanpa menghitung apa pun.
+#
+# Rute:
+#   GET /api                                   daftar komoditas dan analisis
+#   GET /api/<komoditas>                       daftar analisis komoditas
+#   GET /api/<komoditas>/<analisis>?page=&page_size=
+#   GET /api/<komoditas>/data_mentah?page=&page_size=
+
+RAW_DATA = 'data_mentah'
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+PAGE_CACHE_SIZE = 512
+GZIP_MIN_SIZE = 1024
+RETRY_AFTER = 1
+
+logger = logging.getLogger(__name__)
+
+# Hasil resolve(): fingerprint untuk ETag, render(compress) -> bytes, dan kunci
+# halaman analisis (None untuk daftar analisis yang ringan)
+Resolved = namedtuple('Resolved', ['fingerprint', 'render', 'page'])
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+    def __reduce__(self):
+        # Agar tetap utuh saat dikirim balik dari proses pekerja
+        return type(self), (self.status, str(self))
+
+
+def fingerprint(*parts):
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def json_bytes(payload):
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+def etag_matches(etag, if_none_match):
+    return etag in [tag.strip() for tag in (if_none_match or '').split(',')]
+
+
+def wants_gzip(accept_encoding, size):
+    return 'gzip' in (accept_encoding or '') and size >= GZIP_MIN_SIZE
+
+
+def response_headers(status, length, etag=None, compressed=False):
+    headers = []
+    if status != 304:
+        headers.append(('Content-Type', 'application/json; charset=utf-8'))
+    if etag is not None:
+        headers += [('ETag', etag), ('Cache-Control', 'no-cache')]
+    if compressed:
+        headers.append(('Content-Encoding', 'gzip'))
+    headers += [('Vary', 'Accept-Encoding'), ('Content-Length', str(length))]
+    return headers
+
+
+class AnalyticsAPI:
+    def __init__(self, commodities, cache_size=PAGE_CACHE_SIZE):
+        # Nama analisis di URL adalah judul tabel yang di-slug
+        self.commodities = {
+            name: (load_data, {slugify(title): (title, func) for title, func in tables.items()})
+            for name, (load_data, tables) in commodities.items()
+        }
+        self.render_page = lru_cache(maxsize=cache_size)(self._render_page)
+
+    def _dataset(self, commodity):
+        if commodity not in self.commodities:
+            raise ApiError(404, f"Komoditas '{commodity}' tidak ditemukan.")
+        load_data, analyses = self.commodities[commodity]
+        df = load_data()
+        return df, analyses, dataset_key(df) or frame_key(df)
+
+    def analysis_table(self, commodity, analysis, version=None):
+        """
+        (judul, tabel, index) untuk satu analisis; index diteruskan ke
+        table_slice. Bila version diberikan dan dataset yang termuat sudah
+        berbeda versi (data sedang diperbarui), ApiError 503 dilempar agar
+        tabel versi lain tidak tersimpan dengan kunci versi ini.
+        """
+        df, analyses, loaded = self._dataset(commodity)
+        if version is not None and loaded != version:
+            raise ApiError(503, "Data sedang diperbarui, silakan coba lagi sebentar.")
+        if analysis == RAW_DATA:
+            return "Data Mentah", df, False
+        title, func = analyses[analysis]
+        return title, func(df), None
+
+    @staticmethod
+    def _pagination(query):
+        try:
+            page = int(query.get('page', ['1'])[0])
+            page_size = int(query.get('page_size', [str(PAGE_SIZE)])[0])
+        except ValueError:
+            raise ApiError(400, "Parameter page dan page_size harus berupa bilangan bulat.")
+        if page < 1 or not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ApiError(400, f"page minimal 1 dan page_size antara 1 dan {MAX_PAGE_SIZE}.")
+        return page, page_size
+
+    def _render_page(self, commodity, analysis, version, page, page_size, compress=False):
+        # version hanya bagian dari kunci LRU: versi baru = entri baru
+        if compress:
+            return gzip.compress(self.render_page(commodity, analysis, version, page, page_size))
+        table = self.analysis_table(commodity, analysis, version)
+        return self.page_body(commodity, analysis, version, table, page, page_size)
+
+    @staticmethod
+    def page_body(commodity, analysis, version, table, page, page_size):
+        """
+        Isi JSON satu halaman dari hasil analysis_table yang sudah dihitung.
+        """
+        title, table, index = table
+        start = (page - 1) * page_size
+        rows = table_slice(table, start, start + page_size, index)
+        header = json_bytes({
+            'komoditas': commodity,
+            'analisis': analysis,
+            'judul': title,
+            'versi': version,
+            'total': len(table),
+            'halaman': page,
+            'ukuran_halaman': page_size,
+            'jumlah_halaman': -(-len(table) // page_size),
+            'kolom': list(rows.columns),
+        })
+        # Baris diserialisasi sekali oleh pandas lalu disisipkan apa adanya
+        # sebagai nilai 'data', tanpa diurai ulang menjadi objek Python
+        records = rows.to_json(orient='records', date_format='iso', force_ascii=False)
+        return header[:-1] + b', "data": ' + records.encode('utf-8') + b'}'
+
+    def _analysis_list(self, commodity, analyses):
+        return [{'analisis': slug, 'judul': title, 'url': f"/api/{commodity}/{slug}"}
+                for slug, (title, _) in analyses.items()] + [
+                {'analisis': RAW_DATA, 'judul': "Data Mentah", 'url': f"/api/{commodity}/{RAW_DATA}"}]
+
+    def resolve(self, path, query):
+        """
+        Mengembalikan Resolved untuk satu permintaan; render(compress)
+        menghasilkan isi respons JSON (bytes).
+        """
+        parts = [part for part in path.split('/') if part]
+        if parts[:1] != ['api'] or len(parts) > 3:
+            raise ApiError(404, "Rute tidak ditemukan.")
+
+        if len(parts) == 1:
+            datasets = {name: self._dataset(name) for name in self.commodities}
+            payload = {name: {'versi': version, 'analisis': self._analysis_list(name, analyses)}
+                       for name, (_, analyses, version) in datasets.items()}
+            versions = tuple(version for _, _, version in datasets.values())
+            return Resolved(fingerprint('index', versions), lambda compress: json_bytes(payload), None)
+
+        commodity = parts[1]
+        _, analyses, version = self._dataset(commodity)
+        if len(parts) == 2:
+            payload = {'komoditas': commodity, 'versi': version,
+                       'analisis': self._analysis_list(commodity, analyses)}
+            return Resolved(fingerprint('list', commodity, version), lambda compress: json_bytes(payload), None)
+
+        analysis = parts[2]
+        if analysis != RAW_DATA and analysis not in analyses:
+            raise ApiError(404, f"Analisis '{analysis}' tidak tersedia untuk {commodity}.")
+        page, page_size = self._pagination(query)
+        key = (commodity, analysis, version, page, page_size)
+        return Resolved(fingerprint(*key), lambda compress: self.render_page(*key, compress), key)
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    api = None
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MorotaiAnalyticsAPI/1.0'
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        url = urlsplit(self.path)
+        try:
+            resolved = self.api.resolve(url.path, parse_qs(url.query))
+            etag = f'"{resolved.fingerprint}"'
+            if etag_matches(etag, self.headers.get('If-None-Match')):
+                self._send(304, b'', etag)
+                return
+            body = resolved.render(False)
+            compress = wants_gzip(self.headers.get('Accept-Encoding'), len(body))
+            if compress:
+                body = resolved.render(True)
+            self._send(200, body, etag, compress, send_body)
+        except ApiError as exc:
+            self._send(exc.status, json_bytes({'error': str(exc)}), send_body=send_body,
+                       retry=exc.status == 503)
+        except Exception:
+            logger.exception("Gagal melayani %s", self.path)
+            self._send(500, json_bytes({'error': "Kesalahan internal server."}), send_body=send_body)
+
+    def _send(self, status, body, etag=None, compressed=False, send_body=True, retry=False):
+        self.send_response(status)
+        for name, value in response_headers(status, len(body), etag, compressed):
+            self.send_header(name, value)
+        if retry:
+            self.send_header('Retry-After', str(RETRY_AFTER))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class APIServer(ThreadingHTTPServer):
+    # Antrean koneksi besar agar ratusan permintaan bersamaan tidak ditolak
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def make_server(api, host='127.0.0.1', port=8600):
+    handler = type('Handler', (APIRequestHandler,), {'api': api})
+    return APIServer((host, port), handler)
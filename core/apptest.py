@@ -0,0 +1,56 @@
+import textwrap
+
+# Menjalankan dashboard tanpa browser dengan streamlit.testing AppTest.
+#
+# Dipakai bersama oleh core.snapshot (snapshot HTML statis) dan core.perfcheck
+# (uji regresi dan kinerja): satu DashboardRun per dashboard, dan pilihan menu
+# serta submenu diganti di antara rerun lewat widget().
+
+PAGE_TIMEOUT = 300
+
+MENU_LABEL = 'Pilih Menu'
+SUBMENU_LABEL = 'Pilih Submenu:'
+
+# slug halaman -> (judul seperti di main_dashboard.py, modul dashboard)
+DASHBOARDS = {
+    'ayam': ("🐔 Analisis Ayam Petelur di Pulau Morotai", 'Ayam_Petelur_Morotai'),
+    'cengkeh': ("🌿 Analisis Cengkeh di Pulau Morotai", 'Cengkeh_Morotai'),
+    'kakao': ("🍫 Analisis Kakao di Pulau Morotai", 'Kakao_Morotai'),
+    'pisang': ("🍌 Analisis Pisang di Pulau Morotai", 'Pisang_Morotai'),
+    'padi': ("🌾 Analisis Padi di Pulau Morotai", 'Padi_Morotai'),
+}
+
+# Pool proses rendering memakai spawn, sehingga isi skrip harus dijaga
+# __main__; `after` adalah kode tambahan yang dijalankan setelah main()
+SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+from dashboards.{module} import main
+if __name__ == "__main__":
+    main()
+{after}
+"""
+
+
+class DashboardRun:
+    """
+    Satu AppTest untuk satu modul dashboard. `after` adalah kode tambahan
+    (tanpa indentasi) yang dijalankan di skrip setelah main().
+    """
+
+    def __init__(self, module, root, after='', timeout=PAGE_TIMEOUT):
+        from streamlit.testing.v1 import AppTest
+        script = SCRIPT.format(root=root, module=module, after=textwrap.indent(textwrap.dedent(after), '    '))
+        self.app = AppTest.from_string(script, default_timeout=timeout)
+
+    def widget(self, kind, label, sidebar=False):
+        tree = self.app.sidebar if sidebar else self.app.main
+        for widget in tree.get(kind):
+            if widget.label == label:
+                return widget
+        return None
+
+    def options(self, kind, label, sidebar=False):
+        # Pilihan widget menu; [None] bila dashboard tidak punya widget itu
+        widget = self.widget(kind, label, sidebar)
+        return list(widget.options) if widget else [None]
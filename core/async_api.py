@@ -0,0 +1,263 @@
+import asyncio
+import gzip
+import logging
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from core.api import (GZIP_MIN_SIZE, RAW_DATA, RETRY_AFTER, AnalyticsAPI, ApiError, etag_matches, json_bytes,
+                      response_headers, wants_gzip)
+from core.singleflight import flights
+
+# Lapisan penyaji asyncio untuk API analisis.
+#
+# Satu event loop melayani seluruh koneksi. Permintaan ringan (daftar
+# analisis, 304, halaman yang sudah ada di cache hasil) dijawab langsung,
+# sedangkan tabel analisis yang berat (skor, proyeksi, Monte Carlo) dihitung
+# di pool proses berukuran tetap. Tabel dihitung, digabung saat sedang
+# berjalan, dan di-cache per (komoditas, analisis, versi), sehingga semua
+# halaman dan ukuran halaman memakai satu perhitungan; pemotongan halaman dan
+# serialisasi JSON dilakukan di proses server (thread). Bila antrean pool
+# penuh server menjawab 503 dengan Retry-After alih-alih menumpuk pekerjaan.
+# Pekerja menerima versi yang diminta dan menolak (503) bila dataset yang
+# dimuatnya sudah berbeda versi, sehingga tabel tidak pernah tersimpan dengan
+# kunci versi lain.
+
+# Jumlah proses pekerja dapat diatur dengan variabel lingkungan API_WORKERS
+MAX_WORKERS = int(os.environ.get('API_WORKERS', min(4, os.cpu_count() or 1)))
+# Jumlah perhitungan berbeda yang boleh menunggu per pekerja sebelum ditolak
+QUEUE_PER_WORKER = 4
+RESULT_CACHE_SIZE = 512
+TABLE_CACHE_SIZE = 64
+KEEPALIVE_TIMEOUT = 15
+MAX_HEADER_LINES = 100
+
+logger = logging.getLogger(__name__)
+
+_worker_api = None
+
+
+def _init_worker(factory):
+    # Fungsi ber-cache Streamlit di pekerja berjalan tanpa runtime
+    from streamlit.logger import set_log_level
+    set_log_level('error')
+
+    global _worker_api
+    _worker_api = AnalyticsAPI(factory())
+
+
+def _encode(body):
+    return body, gzip.compress(body) if len(body) >= GZIP_MIN_SIZE else None
+
+
+def _table_in_worker(commodity, analysis, version):
+    # Selalu versi terbaru di pekerja (bukan hasil lama single-flight), agar
+    # cocok dengan versi yang sudah dilihat server
+    with flights.fresh():
+        return _worker_api.analysis_table(commodity, analysis, version)
+
+
+class AsyncAnalyticsServer:
+    def __init__(self, factory, max_workers=MAX_WORKERS, max_pending=None, cache_size=RESULT_CACHE_SIZE,
+                 table_cache_size=TABLE_CACHE_SIZE):
+        """
+        factory adalah fungsi tingkat modul yang mengembalikan dict komoditas
+        untuk AnalyticsAPI; fungsi ini juga dipanggil di setiap proses pekerja.
+        """
+        self.api = AnalyticsAPI(factory())
+        self.factory = factory
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * QUEUE_PER_WORKER
+        self.cache_size = cache_size
+        self.table_cache_size = table_cache_size
+        self._pool = None
+        self._inflight = {}
+        self._pool_pending = 0
+        self._tables = OrderedDict()
+        self._results = OrderedDict()
+        self.stats = {'dihitung': 0, 'digabung': 0, 'dari_cache': 0, 'ditolak': 0}
+
+    def _get_pool(self):
+        if self._pool is None:
+            # spawn dipakai agar pekerja tidak mewarisi thread dan loop server
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.factory,)
+            )
+        return self._pool
+
+    def _reset_pool(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+    @staticmethod
+    def _remember(cache, key, value, size):
+        cache[key] = value
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+    async def table(self, key):
+        """
+        Hasil analysis_table untuk key (komoditas, analisis, versi), dengan
+        cache, penggabungan perhitungan yang sedang berjalan, dan backpressure.
+        """
+        if key in self._tables:
+            self._tables.move_to_end(key)
+            self.stats['dari_cache'] += 1
+            return self._tables[key]
+        if key in self._inflight:
+            self.stats['digabung'] += 1
+            return await asyncio.shield(self._inflight[key])
+
+        commodity, analysis, version = key
+        heavy = analysis != RAW_DATA
+        if heavy and self._pool_pending >= self.max_pending:
+            self.stats['ditolak'] += 1
+            raise ApiError(503, "Server sedang sibuk, silakan coba lagi sebentar.")
+
+        loop = asyncio.get_running_loop()
+        if heavy:
+            future = loop.run_in_executor(self._get_pool(), _table_in_worker, commodity, analysis, version)
+            self._pool_pending += 1
+        else:
+            # Data mentah adalah dataset yang sudah dimuat; cukup di thread
+            future = loop.run_in_executor(None, self.api.analysis_table, commodity, analysis, version)
+        self.stats['dihitung'] += 1
+        self._inflight[key] = future
+        # Hasil dicatat lewat callback agar tetap tersimpan walaupun klien
+        # pertama memutus koneksi sebelum perhitungan selesai
+        future.add_done_callback(lambda done: self._finish(key, done, heavy))
+        return await asyncio.shield(future)
+
+    def _finish(self, key, future, heavy):
+        self._inflight.pop(key, None)
+        if heavy:
+            self._pool_pending -= 1
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if isinstance(exc, BrokenProcessPool):
+            self._reset_pool()
+        if exc is None:
+            self._remember(self._tables, key, future.result(), self.table_cache_size)
+
+    async def page(self, page):
+        """
+        (isi, isi_gzip) untuk satu halaman (komoditas, analisis, versi,
+        halaman, ukuran_halaman); halaman dipotong dari tabel di thread.
+        """
+        if page in self._results:
+            self._results.move_to_end(page)
+            self.stats['dari_cache'] += 1
+            return self._results[page]
+        table = await self.table(page[:3])
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, lambda: _encode(self.api.page_body(*page[:3], table, *page[3:])))
+        self._remember(self._results, page, result, self.cache_size)
+        return result
+
+    def status(self):
+        return {**self.stats, 'sedang_dihitung': len(self._inflight), 'antrean_pool': self._pool_pending,
+                'batas_antrean': self.max_pending, 'pekerja': self.max_workers, 'cache_tabel': len(self._tables),
+                'cache_hasil': len(self._results)}
+
+    async def respond(self, method, target, headers):
+        """
+        Mengembalikan (status, header, isi) untuk satu permintaan.
+        """
+        if method not in ('GET', 'HEAD'):
+            body = json_bytes({'error': "Hanya metode GET dan HEAD yang didukung."})
+            return 405, response_headers(405, len(body)) + [('Allow', 'GET, HEAD')], body
+
+        url = urlsplit(target)
+        try:
+            if url.path.rstrip('/') == '/api/_status':
+                body = json_bytes(self.status())
+                return 200, response_headers(200, len(body)), body
+
+            # Memuat dataset bisa membaca disk, sehingga dijalankan di thread
+            loop = asyncio.get_running_loop()
+            resolved = await loop.run_in_executor(None, self.api.resolve, url.path, parse_qs(url.query))
+            etag = f'"{resolved.fingerprint}"'
+            if etag_matches(etag, headers.get('if-none-match')):
+                return 304, response_headers(304, 0, etag), b''
+
+            if resolved.page is None:
+                body, compressed_body = _encode(resolved.render(False))
+            else:
+                body, compressed_body = await self.page(resolved.page)
+            compress = compressed_body is not None and wants_gzip(headers.get('accept-encoding'), len(body))
+            if compress:
+                body = compressed_body
+            return 200, response_headers(200, len(body), etag, compress), body
+        except ApiError as exc:
+            body = json_bytes({'error': str(exc)})
+            extra = [('Retry-After', str(RETRY_AFTER))] if exc.status == 503 else []
+            return exc.status, response_headers(exc.status, len(body)) + extra, body
+        except Exception:
+            logger.exception("Gagal melayani %s", target)
+            body = json_bytes({'error': "Kesalahan internal server."})
+            return 500, response_headers(500, len(body)), body
+
+    async def handle(self, reader, writer):
+        # Satu koneksi HTTP/1.1 dengan keep-alive
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._write(writer, 400, response_headers(400, 0), b'', close=True)
+                    break
+
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                # Isi permintaan (tidak dipakai untuk GET/HEAD) tetap dibaca agar koneksi sinkron
+                length = headers.get('content-length', '')
+                if length.isdigit() and int(length):
+                    await reader.readexactly(int(length))
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                status, response, body = await self.respond(method, target, headers)
+                await self._write(writer, status, response, b'' if method == 'HEAD' else body,
+                                  close=not keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write(writer, status, headers, body, close=False):
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        lines += [f"{name}: {value}" for name, value in headers]
+        if close:
+            lines.append("Connection: close")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def serve(self, host='127.0.0.1', port=8600):
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self._reset_pool()
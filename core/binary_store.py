@@ -0,0 +1,284 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.schema import CODE_TABLES, LEVEL_CATEGORIES, from_codes, global_codes, is_table_dtype, schema_for, validate
+
+# Format biner kolumnar untuk dataset komoditas.
+#
+# File CSV di folder data/ tetap menjadi sumber kebenaran. Setiap CSV
+# dikonversi menjadi satu folder di data/_binary/<nama>/ yang berisi meta.json
+# dan satu subfolder per versi CSV sumber (v<format>-<ukuran>-<mtime>) berisi
+# satu file mentah per kolom (<kolom>.bin). meta.json mencatat subfolder versi
+# terbaru, dtype, tabel kode kategori (tabel global dari core/schema.py bila
+# ada, beserta nilai tambahan untuk tabel terbuka seperti wilayah), jumlah
+# baris, serta ukuran dan waktu modifikasi CSV sumber.
+# Kolom dibuka dengan np.memmap sehingga waktu muat hampir konstan. File kolom
+# tidak pernah ditulis ulang: konversi baru ditulis ke folder sementara yang
+# di-rename menjadi subfolder versinya, lalu meta.json diganti dengan
+# os.replace. Dataset versi lama yang masih dipegang sesi atau cache tetap
+# membaca file lamanya. Konversi dijalankan di bawah kunci per dataset.
+# CSV komoditas divalidasi dengan skemanya (core/schema.py) saat konversi;
+# baris yang tidak valid ditulis ke data/_quarantine/<nama>.csv dan jumlahnya
+# dicatat di meta.json.
+
+DATA_DIR = "data"
+BINARY_DIR = os.path.join(DATA_DIR, "_binary")
+QUARANTINE_DIR = os.path.join(DATA_DIR, "_quarantine")
+FORMAT_VERSION = 5
+
+_lock = threading.Lock()
+# Kunci konversi per folder dataset biner
+_convert_locks = {}
+
+
+def _binary_path(csv_path):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(BINARY_DIR, name)
+
+
+def quarantine_path(csv_path):
+    return os.path.join(QUARANTINE_DIR, os.path.basename(csv_path))
+
+
+def _convert_lock(csv_path):
+    target = _binary_path(csv_path)
+    with _lock:
+        lock = _convert_locks.get(target)
+        if lock is None:
+            lock = _convert_locks[target] = threading.Lock()
+    return lock
+
+
+def _source_signature(csv_path):
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _code_dtype(n_categories):
+    if n_categories <= np.iinfo(np.int8).max:
+        return np.int8
+    if n_categories <= np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
+
+
+def _code_table(series):
+    for name in CODE_TABLES:
+        if is_table_dtype(series.dtype, name):
+            return name
+    return None
+
+
+def _encode_column(series):
+    # Mengembalikan (nilai, kategori, nama tabel kode global).
+    # Kolom numerik disimpan sebagai int32 bila muat, selain itu float64;
+    # tipe yang lebih kecil dari skema (int8, int16) dipertahankan
+    if pd.api.types.is_integer_dtype(series):
+        if series.dtype.itemsize <= 4:
+            return series.to_numpy(), None, None
+        info = np.iinfo(np.int32)
+        if series.empty or (series.min() >= info.min and series.max() <= info.max):
+            return series.to_numpy(dtype=np.int32), None, None
+        return series.to_numpy(dtype=np.int64), None, None
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=np.float64), None, None
+
+    # Kolom kategori dari skema sudah berisi kode tabel global (termasuk
+    # nilai tambahan tabel terbuka)
+    table = _code_table(series)
+    if table is not None:
+        categories = list(series.cat.categories)
+        return series.cat.codes.to_numpy().astype(_code_dtype(len(categories))), categories, table
+    if set(series.astype(str).unique()) <= set(LEVEL_CATEGORIES):
+        table = 'level'
+        categories = list(CODE_TABLES[table].categories)
+        codes = global_codes(series, table)
+        return codes.astype(_code_dtype(len(categories))), categories, table
+
+    # Kolom teks lain disimpan sebagai kode integer dengan tabel kategori sendiri
+    values = series.astype(str)
+    categories = sorted(set(values.unique()))
+    codes = pd.Categorical(values, categories=categories).codes
+    return codes.astype(_code_dtype(len(categories))), categories, None
+
+
+def _read_valid(csv_path):
+    # Mengembalikan (data bersih, laporan validasi atau None)
+    schema = schema_for(csv_path)
+    if schema is None:
+        return pd.read_csv(csv_path), None
+    raw = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    df, quarantined, report = validate(raw, schema)
+
+    path = quarantine_path(csv_path)
+    if len(quarantined):
+        os.makedirs(QUARANTINE_DIR, exist_ok=True)
+        quarantined.to_csv(path, index=False)
+        report['file'] = path
+    elif os.path.exists(path):
+        # Karantina dari versi CSV sebelumnya sudah tidak berlaku
+        os.remove(path)
+    return df, report
+
+
+def convert(csv_path):
+    """
+    Mengonversi satu file CSV menjadi format biner kolumnar dan mengembalikan
+    path folder hasil konversi. SchemaError dilempar bila CSV tidak memenuhi
+    skema komoditasnya.
+    """
+    with _convert_lock(csv_path):
+        return _convert(csv_path)
+
+
+def _convert(csv_path):
+    signature = _source_signature(csv_path)
+    df, report = _read_valid(csv_path)
+    target = _binary_path(csv_path)
+    os.makedirs(target, exist_ok=True)
+    files = f"v{FORMAT_VERSION}-{signature['size']}-{signature['mtime_ns']}"
+
+    # Kolom ditulis ke folder sementara yang baru, lalu di-rename sekaligus
+    staging = tempfile.mkdtemp(prefix='.tmp-', dir=target)
+    columns = []
+    try:
+        for name in df.columns:
+            values, categories, table = _encode_column(df[name])
+            values.tofile(os.path.join(staging, f'{name}.bin'))
+            columns.append({
+                'name': name,
+                'dtype': values.dtype.str,
+                'categories': categories,
+                'code_table': table
+            })
+        try:
+            os.rename(staging, os.path.join(target, files))
+        except OSError:
+            # Proses lain sudah menulis versi yang sama; file miliknya dipakai
+            if not os.path.isdir(os.path.join(target, files)):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'files': files,
+        'n_rows': len(df),
+        'columns': columns,
+        'source': signature,
+        'validation': report
+    }
+    # meta.json ditulis paling akhir agar pembaca tidak melihat data setengah jadi
+    tmp_meta = os.path.join(target, 'meta.json.tmp')
+    with open(tmp_meta, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_meta, os.path.join(target, 'meta.json'))
+    _prune_versions(target, files)
+    return target
+
+
+def _prune_versions(target, current):
+    # Folder versi lama dihapus (unlink), tidak dipotong atau ditimpa, sehingga
+    # memmap yang masih terbuka tetap membaca isinya sampai ditutup. Di Windows
+    # file yang masih dibuka tidak bisa dihapus dan dibiarkan sampai konversi
+    # berikutnya.
+    for entry in os.scandir(target):
+        if entry.is_dir() and entry.name != current and not entry.name.startswith('.tmp-'):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        elif entry.is_file() and entry.name.endswith('.bin'):
+            # Sisa format lama (file kolom langsung di folder dataset)
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _read_meta(csv_path):
+    try:
+        with open(os.path.join(_binary_path(csv_path), 'meta.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_stale(csv_path):
+    meta = _read_meta(csv_path)
+    return (
+        meta is None
+        or meta.get('format_version') != FORMAT_VERSION
+        or meta.get('source') != _source_signature(csv_path)
+    )
+
+
+def validation_report(csv_path):
+    """
+    Laporan validasi konversi terakhir: jumlah baris total, valid, dan yang
+    dikarantina (per kolom), atau None bila CSV tidak memiliki skema.
+    """
+    meta = _read_meta(csv_path)
+    return meta.get('validation') if meta else None
+
+
+def read_dataset(csv_path):
+    """
+    Memuat dataset dari format biner dengan np.memmap. Bila CSV sumber berubah
+    atau belum pernah dikonversi, format biner dibuat ulang terlebih dahulu.
+    Kolom kategori dikembalikan sebagai pd.Categorical; kolom dengan tabel
+    kode global memakai dtype kategori bersama dari core/schema.py.
+    """
+    with _convert_lock(csv_path):
+        if is_stale(csv_path):
+            _convert(csv_path)
+        meta = _read_meta(csv_path)
+    target = os.path.join(_binary_path(csv_path), meta['files'])
+
+    data = {}
+    for column in meta['columns']:
+        dtype = np.dtype(column['dtype'])
+        if meta['n_rows'] == 0:
+            values = np.empty(0, dtype=dtype)
+        else:
+            values = np.memmap(os.path.join(target, f"{column['name']}.bin"),
+                               dtype=dtype, mode='r', shape=(meta['n_rows'],))
+        if column['code_table'] is not None:
+            values = from_codes(values, column['code_table'], column['categories'])
+        elif column['categories'] is not None:
+            values = pd.Categorical.from_codes(values, categories=column['categories'])
+        data[column['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def convert_all(data_dir=DATA_DIR):
+    paths = sorted(
+        os.path.join(data_dir, name)
+        for name in os.listdir(data_dir)
+        if name.endswith('.csv')
+    )
+    for path in paths:
+        print(f"{path} -> {convert(path)}")
+        _print_report(path)
+    return paths
+
+
+def _print_report(csv_path):
+    report = validation_report(csv_path)
+    if report and report['karantina']:
+        print(f"  {report['karantina']} dari {report['total']} baris dikarantina ke {report['file']}: "
+              f"{report['per_kolom']}")
+
+
+# Konversi manual: python -m core.binary_store [file.csv ...]
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            print(f"{path} -> {convert(path)}")
+            _print_report(path)
+    else:
+        convert_all()
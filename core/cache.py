@@ -0,0 +1,237 @@
+import functools
+import hashlib
+import threading
+import types
+import weakref
+
+import pandas as pd
+import streamlit as st
+
+from core.catalog import commodity_report, dataset_version, read_commodity
+from core.memory import AGGREGATES, DATASETS, FIGURES, MODELS, argument_key, governor
+from core.outliers import robust_pass
+from core.singleflight import flights
+
+# Cache yang dikunci dengan versi dataset.
+#
+# Dataset dimuat sekali per (komoditas, versi) dan dibagikan ke semua sesi.
+# Fungsi yang didekorasi dengan @versioned_cache mengenali DataFrame dataset
+# tersebut dan memakai (komoditas, versi) sebagai kunci cache, bukan hash isi
+# DataFrame. Bila satu CSV diperbarui, hanya hasil turunan komoditas tersebut
+# yang dihitung ulang. DataFrame lain (hasil filter, agregat) tetap di-hash
+# berdasarkan isinya. Semua hasil disimpan di tier pengatur memori
+# (core/memory.py) yang dibatasi anggaran byte.
+
+# Akhiran kunci dataset tanpa outlier ('komoditas:versi:robust')
+ROBUST = 'robust'
+
+_dataset_keys = {}
+_dataset_keys_lock = threading.Lock()
+
+
+def _register_dataset(df, key):
+    frame_id = id(df)
+
+    def forget(_ref):
+        with _dataset_keys_lock:
+            _dataset_keys.pop(frame_id, None)
+
+    with _dataset_keys_lock:
+        _dataset_keys[frame_id] = (weakref.ref(df, forget), key)
+    return df
+
+
+def dataset_key(df):
+    """
+    Mengembalikan kunci 'komoditas:versi' (atau 'komoditas:versi:robust'
+    untuk dataset tanpa outlier) bila df adalah dataset yang dimuat lewat
+    load_dataset, selain itu None.
+    """
+    with _dataset_keys_lock:
+        entry = _dataset_keys.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    return None
+
+
+def frame_key(df):
+    """
+    Kunci isi DataFrame: 'komoditas:versi' untuk dataset, selain itu hash isi.
+    """
+    key = dataset_key(df)
+    if key is not None:
+        return key
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    digest.update(repr((list(df.columns), [str(t) for t in df.dtypes])).encode())
+    return digest.hexdigest()
+
+
+def function_key(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+HASH_FUNCS = {pd.DataFrame: frame_key, types.FunctionType: function_key}
+
+
+def versioned_cache(func=None, *, tier=AGGREGATES, hash_funcs=None):
+    """
+    Pengganti @st.cache_data untuk fungsi yang menerima DataFrame dataset.
+    Hasil disimpan (sebagai pickle) di tier pengatur memori, misalnya
+    @versioned_cache(tier=MODELS) untuk model dan simulasi.
+    """
+    if func is None:
+        return lambda f: versioned_cache(f, tier=tier, hash_funcs=hash_funcs)
+    hash_funcs = {**HASH_FUNCS, **(hash_funcs or {})}
+    name = function_key(func)
+
+    def cache_entry(*args, **kwargs):
+        # (tier, kunci, dibagikan) entri hasil untuk argumen ini
+        return tier, (name, argument_key(args, hash_funcs), argument_key(kwargs, hash_funcs)), False
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _, key, _ = cache_entry(*args, **kwargs)
+        return governor.get_or_compute(tier, key, lambda: func(*args, **kwargs))
+
+    wrapper.clear = lambda: governor.clear(tier, lambda key: key[0] == name)
+    wrapper.cache_entry = cache_entry
+    return wrapper
+
+
+def shared_cache(func):
+    """
+    Pengganti @st.cache_resource di tier dataset: objek hasil dibagikan (tidak
+    disalin) ke semua sesi, sehingga tidak boleh diubah. Argumen harus
+    sederhana (komoditas, versi).
+    """
+    name = function_key(func)
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        return governor.get_or_compute(DATASETS, (name, args), lambda: func(*args), shared=True)
+
+    wrapper.clear = lambda: governor.clear(DATASETS, lambda key: key[0] == name)
+    wrapper.cache_entry = lambda *args: (DATASETS, (name, args), True)
+    return wrapper
+
+
+def _is_simple(value):
+    if isinstance(value, tuple):
+        return all(_is_simple(item) for item in value)
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def single_flight(func=None, *, timeout=None):
+    """
+    Dipasang di atas @versioned_cache. Sesi yang bersamaan meminta hasil
+    dataset dan argumen yang sama menunggu satu perhitungan. Setelah versi
+    dataset berubah, hasil versi sebelumnya dipakai sementara
+    (stale-while-revalidate) selama versi baru dihitung di latar belakang.
+    """
+    if func is None:
+        return lambda f: single_flight(f, timeout=timeout)
+    name = function_key(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = dataset_key(args[0]) if args and isinstance(args[0], pd.DataFrame) else None
+        rest = (args[1:], tuple(sorted(kwargs.items())))
+        # Hanya argumen sederhana yang bisa dipakai sebagai slot
+        if key is None or not _is_simple(rest):
+            return func(*args, **kwargs)
+        # Varian dataset (misalnya tanpa outlier) mendapat slot sendiri agar
+        # hasil varian lain tidak pernah disajikan sebagai versi lama
+        commodity, version, *variant = key.split(':')
+        return flights.do((name, commodity, *variant, rest), version, lambda: func(*args, **kwargs),
+                          func.cache_entry(*args, **kwargs), timeout)
+
+    wrapper.clear = func.clear
+    return wrapper
+
+
+# Dataset dibagikan (tidak disalin) ke semua sesi, sehingga tidak boleh diubah
+@shared_cache
+def _load_dataset(commodity, version):
+    df = read_commodity(commodity)
+    return _register_dataset(df, f"{commodity}:{version}")
+
+
+# Statistik robust dihitung sekali per versi dataset, saat dataset dimuat
+@shared_cache
+def _robust_statistics(commodity, version):
+    return robust_pass(_load_dataset(commodity, version))
+
+
+# Dataset tanpa outlier mendapat kunci sendiri, sehingga semua agregat
+# ber-cache versi robust dihitung sekali dan dipakai ulang oleh semua sesi
+@shared_cache
+def _load_robust_dataset(commodity, version):
+    df = _load_dataset(commodity, version)
+    clean = df[~_robust_statistics(commodity, version)['outliers']]
+    return _register_dataset(clean, f"{commodity}:{version}:{ROBUST}")
+
+
+def dataset_for_key(key):
+    """
+    Dataset untuk kunci 'komoditas:versi' atau 'komoditas:versi:robust'
+    (misalnya di proses pekerja), atau None bila versi tersebut bukan lagi
+    versi terbaru file komoditasnya.
+    """
+    commodity, version, *variant = key.split(':')
+    if dataset_version(commodity) != version:
+        return None
+    df = (_load_robust_dataset if variant else _load_dataset)(commodity, version)
+    # File bisa berubah tepat saat dimuat
+    return df if dataset_key(df) == key else None
+
+
+def load_dataset(commodity, exclude_outliers=False):
+    """
+    Memuat dataset komoditas versi terbaru. CSV yang diperbarui langsung
+    terbaca tanpa perlu me-restart server atau membersihkan cache; selama
+    versi baru dimuat, sesi lain tetap memakai versi sebelumnya. Dengan
+    exclude_outliers, baris outlier (pagar IQR per wilayah) dikecualikan.
+    """
+    version = dataset_version(commodity)
+    if exclude_outliers:
+        return flights.do(('load_dataset', commodity, ROBUST), version,
+                          lambda: _load_robust_dataset(commodity, version),
+                          _load_robust_dataset.cache_entry(commodity, version))
+    df = flights.do(('load_dataset', commodity), version, lambda: _load_dataset(commodity, version),
+                    _load_dataset.cache_entry(commodity, version))
+    _robust_statistics(commodity, version)
+    return df
+
+
+def outlier_report(commodity):
+    """
+    Statistik robust per wilayah (median, MAD, kuartil, batas pagar, jumlah
+    outlier) dan jumlah baris outlier dataset komoditas versi terbaru.
+    """
+    return _robust_statistics(commodity, dataset_version(commodity))
+
+
+def exclude_outliers_toggle():
+    """
+    Sakelar sidebar "Kecualikan outlier"; berlaku untuk semua dashboard
+    dalam sesi yang sama.
+    """
+    return st.sidebar.toggle("Kecualikan outlier", key='exclude_outliers',
+                             help="Analisis memakai data tanpa baris di luar pagar IQR per wilayah "
+                                  "(produksi dan harga).")
+
+
+def show_data_quality(commodity):
+    """
+    Peringatan di dashboard bila sebagian baris CSV dikarantina saat validasi.
+    """
+    report = commodity_report(commodity)
+    if report and report['karantina']:
+        columns = ", ".join(f"{name} ({count})" for name, count in report['per_kolom'].items())
+        st.warning(f"{report['karantina']} dari {report['total']} baris data {commodity} tidak valid dan "
+                   f"tidak dianalisis (kolom: {columns}). Baris tersebut disimpan di {report['file']}.")
+
+    if st.session_state.get('exclude_outliers'):
+        outliers = outlier_report(commodity)
+        columns = ", ".join(f"{name} ({count})" for name, count in outliers['per_kolom'].items())
+        st.caption(f"{outliers['total']} baris outlier data {commodity} dikecualikan dari analisis (kolom: {columns}).")
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import threading
+
+from core.binary_store import DATA_DIR, read_dataset, validation_report
+
+# Katalog dataset komoditas.
+#
+# Setiap file komoditas mendapat versi berupa hash isi file. Versi hanya
+# dihitung ulang bila ukuran atau waktu modifikasi file berubah, sehingga
+# memeriksanya di setiap rerun dashboard cukup murah.
+
+DATASETS = {
+    'ayam': os.path.join(DATA_DIR, 'data_ayam.csv'),
+    'cengkeh': os.path.join(DATA_DIR, 'data_cengkeh.csv'),
+    'kakao': os.path.join(DATA_DIR, 'data_kakao.csv'),
+    'padi': os.path.join(DATA_DIR, 'data_padi.csv'),
+    'pisang': os.path.join(DATA_DIR, 'data_pisang.csv')
+}
+
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+def dataset_path(commodity):
+    try:
+        return DATASETS[commodity]
+    except KeyError:
+        raise ValueError(f"Komoditas tidak dikenal: {commodity}") from None
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def dataset_version(commodity):
+    """
+    Mengembalikan versi dataset komoditas (hash isi file CSV).
+    """
+    path = dataset_path(commodity)
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _versions_lock:
+        cached = _versions.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    version = _file_hash(path)
+    with _versions_lock:
+        _versions[path] = (signature, version)
+    return version
+
+
+def dataset_versions():
+    return tuple((commodity, dataset_version(commodity)) for commodity in DATASETS)
+
+
+def read_commodity(commodity):
+    return read_dataset(dataset_path(commodity))
+
+
+def commodity_report(commodity):
+    return validation_report(dataset_path(commodity))
+
+
+# Menampilkan katalog: python -m core.catalog
+if __name__ == "__main__":
+    for commodity, version in dataset_versions():
+        read_commodity(commodity)
+        report = commodity_report(commodity)
+        print(f"{commodity:<10} {version}  {dataset_path(commodity)}  "
+              f"{report['valid']}/{report['total']} baris valid")
@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from core.cache import MODELS, versioned_cache
+from core.longtail import show_table
+
+# Segmentasi wilayah dan catatan produksi dengan mini-batch k-means.
+#
+# Fitur distandarkan lalu dikelompokkan dengan MiniBatchKMeans yang dilatih
+# per potongan data (partial_fit). Setiap potongan diambil langsung dari kolom
+# sumber dan distandarkan saat itu juga, sehingga matriks fitur dan salinan
+# terstandarnya untuk seluruh catatan tidak pernah dibuat. Evaluasi jumlah klaster (elbow dan
+# silhouette) hanya memakai sampel agar halaman tetap responsif.
+
+# Fitur pengelompokan per jenis dataset
+POULTRY_FEATURES = ('produksi_pertahun', 'harga', 'kapasitas_kandang', 'kondisi_kandang', 'ketersediaan_pakan')
+CROP_FEATURES = ('produksi_pertahun', 'harga', 'luas_lahan_hektar', 'tingkat_kesuburan_tanah')
+
+BATCH_SIZE = 1024
+EPOCHS = 3
+SAMPLE_SIZE = 2000
+RANDOM_STATE = 42
+
+
+def feature_matrix(df, columns):
+    """
+    Matriks fitur float64; kolom kategorikal berurutan (rendah/sedang/tinggi)
+    memakai kode urutannya.
+    """
+    features = []
+    for column in columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.cat.codes.where(values.notna())
+        features.append(values.to_numpy(dtype=np.float64))
+    return np.column_stack(features)
+
+
+class FeatureColumns:
+    """
+    Kolom fitur sebuah DataFrame sebagai sumber potongan: X[rows] merangkai
+    matriks float64 hanya untuk baris yang diminta. Baris dengan nilai kosong
+    tidak disertakan; kolom numerik tidak disalin.
+    """
+
+    def __init__(self, df, columns):
+        self.arrays = []
+        self.valid = np.ones(len(df), dtype=bool)
+        for column in columns:
+            values = df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.cat.codes.to_numpy()
+                self.valid &= values >= 0
+            elif values.dtype.kind in 'iub':
+                values = values.to_numpy()
+            else:
+                values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                self.valid &= ~np.isnan(values)
+            self.arrays.append(values)
+        self.rows = np.flatnonzero(self.valid)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, batch):
+        rows = self.rows[batch]
+        X = np.empty((len(rows), len(self.arrays)))
+        for i, values in enumerate(self.arrays):
+            X[:, i] = values[rows]
+        return X
+
+
+class ScaledBatches:
+    """
+    Potongan dari sumber fitur yang distandarkan saat diambil.
+    """
+
+    def __init__(self, source, scaler):
+        self.source = source
+        self.scaler = scaler
+
+    def __len__(self):
+        return len(self.source)
+
+    def __getitem__(self, batch):
+        return self.scaler.transform(self.source[batch])
+
+
+def iter_batches(n_rows, batch_size=BATCH_SIZE, rng=None):
+    order = np.arange(n_rows) if rng is None else rng.permutation(n_rows)
+    for start in range(0, n_rows, batch_size):
+        yield order[start:start + batch_size]
+
+
+def fit_scaler(X, batch_size=BATCH_SIZE):
+    scaler = StandardScaler()
+    for batch in iter_batches(len(X), batch_size):
+        scaler.partial_fit(X[batch])
+    return scaler
+
+
+def fit_minibatch_kmeans(X, n_clusters, batch_size=BATCH_SIZE, epochs=EPOCHS, random_state=RANDOM_STATE):
+    """
+    Melatih MiniBatchKMeans pada data terstandar secara bertahap (beberapa
+    epoch, urutan potongan diacak setiap epoch).
+    """
+    rng = np.random.default_rng(random_state)
+    model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size,
+                            random_state=random_state, n_init=3)
+    # Potongan pertama harus memuat minimal n_clusters baris
+    first = rng.permutation(len(X))[:max(batch_size, n_clusters)]
+    model.partial_fit(X[first])
+    for _ in range(epochs):
+        for batch in iter_batches(len(X), batch_size, rng):
+            model.partial_fit(X[batch])
+    return model
+
+
+def predict_batches(model, X, batch_size=BATCH_SIZE):
+    labels = np.empty(len(X), dtype=np.int64)
+    for batch in iter_batches(len(X), batch_size):
+        labels[batch] = model.predict(X[batch])
+    return labels
+
+
+# Fungsi untuk mengelompokkan catatan produksi (di-cache per versi dataset dan parameter)
+@versioned_cache(tier=MODELS)
+def cluster_records(df, columns, n_clusters=3, batch_size=BATCH_SIZE):
+    columns = list(columns)
+    source = FeatureColumns(df, columns)
+    scaler = fit_scaler(source, batch_size)
+    scaled = ScaledBatches(source, scaler)
+    model = fit_minibatch_kmeans(scaled, n_clusters, batch_size)
+
+    labels = np.full(len(df), -1, dtype=np.int64)
+    labels[source.valid] = predict_batches(model, scaled, batch_size)
+    return {
+        'labels': pd.Series(labels, index=df.index, name='klaster'),
+        'profiles': _cluster_profiles(scaler, model, labels[source.valid], columns)
+    }
+
+
+# Fungsi untuk mengelompokkan wilayah berdasarkan rata-rata fiturnya
+@versioned_cache(tier=MODELS)
+def cluster_regions(df, columns, n_clusters=3, by='wilayah'):
+    columns = list(columns)
+    regional = pd.DataFrame(feature_matrix(df, columns), columns=columns, index=df.index)
+    regional = regional.groupby(df[by].astype(str)).mean().dropna()
+    n_clusters = min(n_clusters, len(regional))
+
+    X = regional.to_numpy()
+    scaler = fit_scaler(X)
+    scaled = scaler.transform(X)
+    model = fit_minibatch_kmeans(scaled, n_clusters)
+    labels = model.predict(scaled)
+
+    regional.insert(0, 'klaster', labels)
+    return {
+        'regions': regional.round(2),
+        'profiles': _cluster_profiles(scaler, model, labels, columns)
+    }
+
+
+def _cluster_profiles(scaler, model, labels, columns):
+    # Pusat klaster dikembalikan ke satuan asli agar mudah dibaca
+    centers = scaler.inverse_transform(model.cluster_centers_)
+    profiles = pd.DataFrame(centers, columns=columns).round(2)
+    profiles.insert(0, 'jumlah', np.bincount(labels, minlength=len(profiles)))
+    profiles.index.name = 'klaster'
+    return profiles
+
+
+# Fungsi untuk evaluasi jumlah klaster (elbow dan silhouette) pada sampel data
+@versioned_cache(tier=MODELS)
+def evaluate_clusters(df, columns, k_values=tuple(range(2, 9)), sample_size=SAMPLE_SIZE):
+    source = FeatureColumns(df, list(columns))
+    rng = np.random.default_rng(RANDOM_STATE)
+    sample = rng.choice(len(source), sample_size, replace=False) if len(source) > sample_size else slice(None)
+    X = source[sample]
+    scaled = fit_scaler(X).transform(X)
+
+    scores = []
+    for k in k_values:
+        if k >= len(scaled):
+            break
+        model = fit_minibatch_kmeans(scaled, k)
+        labels = model.predict(scaled)
+        silhouette = silhouette_score(scaled, labels) if len(set(labels)) > 1 else np.nan
+        # Inertia dihitung ulang pada seluruh sampel (bukan potongan terakhir)
+        scores.append({'k': k, 'inertia': -model.score(scaled), 'silhouette': silhouette})
+    return pd.DataFrame(scores).set_index('k')
+
+
+@st.fragment
+def show_clustering(df, columns, key='clustering'):
+    """
+    Bagian "Segmentasi (Clustering)": memilih jumlah klaster dan tingkat
+    pengelompokan, lalu menampilkan profil klaster, anggota, dan evaluasi k.
+    """
+    columns = tuple(columns)
+    st.subheader("Segmentasi (Mini-Batch K-Means)")
+    level = st.radio("Kelompokkan:", ["Wilayah", "Catatan Produksi"], horizontal=True, key=f"{key}_level")
+    n_clusters = st.slider("Jumlah klaster:", min_value=2, max_value=6, value=3, key=f"{key}_k")
+
+    if level == "Wilayah":
+        result = cluster_regions(df, columns, n_clusters)
+        st.write("Profil klaster (rata-rata fitur dalam satuan asli):")
+        st.dataframe(result['profiles'])
+        st.write("Anggota klaster per wilayah:")
+        show_table(result['regions'].sort_values('klaster'), key=f"{key}_regions")
+        points = result['regions'].reset_index()
+        hover = points.columns[0]
+    else:
+        result = cluster_records(df, columns, n_clusters)
+        st.write("Profil klaster (rata-rata fitur dalam satuan asli):")
+        st.dataframe(result['profiles'])
+        points = df.assign(klaster=result['labels'])
+        points = points[points['klaster'] >= 0]
+        hover = 'wilayah'
+
+    # Grafik sebar cukup memakai sampel bila jumlah titik sangat besar
+    if len(points) > SAMPLE_SIZE:
+        points = points.sample(SAMPLE_SIZE, random_state=RANDOM_STATE)
+    points = points.assign(klaster=points['klaster'].astype(str))
+    fig = px.scatter(points, x=columns[0], y=columns[1], color='klaster', hover_name=hover,
+                     title=f'Klaster berdasarkan {columns[0]} dan {columns[1]}')
+    st.plotly_chart(fig, key=f"{key}_scatter")
+
+    with st.expander("Evaluasi jumlah klaster (elbow dan silhouette)"):
+        scores = evaluate_clusters(df, columns)
+        st.dataframe(scores.round(3))
+        fig = px.line(scores.reset_index(), x='k', y=['inertia', 'silhouette'], markers=True,
+                      facet_row='variable', title='Elbow (inertia) dan Silhouette per Jumlah Klaster')
+        fig.update_yaxes(matches=None)
+        st.plotly_chart(fig, key=f"{key}_evaluation")
@@ -0,0 +1,324 @@
+import io
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+import streamlit as st
+
+from core.binary_store import DATA_DIR
+from core.cache import frame_key
+from core.montecarlo import revenue_risk
+from core.narrative import format_number
+from core.trends import analyze_trends, trend_table
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet bersifat opsional
+    pa = pq = None
+
+# Ekspor tabel analisis dan data mentah ke CSV, JSON, atau Parquet.
+#
+# Tabel ditulis per potongan baris langsung ke file, sehingga hasil ekspor
+# tidak pernah berada dua kali di memori (DataFrame + teks lengkapnya). File
+# disimpan di data/_export/ dengan nama yang memuat kunci isi tabel
+# ('komoditas:versi' untuk dataset, hash isi untuk tabel lain); ekspor yang
+# sama dari sesi mana pun memakai ulang file yang sudah ada. Penulisan dikunci
+# per file, sehingga ekspor yang berbeda tidak saling menunggu. Unduhan
+# membaca file lewat handle; file yang sedang dibaca atau masih dalam masa
+# simpan (EXPORT_RETENTION) tidak dibersihkan.
+
+EXPORT_DIR = os.path.join(DATA_DIR, "_export")
+CHUNK_ROWS = 50_000
+MAX_EXPORT_FILES = 50
+# File ekspor yang lebih baru dari ini (detik) selalu disimpan
+EXPORT_RETENTION = 3600
+
+# Format: (ekstensi, tipe MIME)
+FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'JSON': ('json', 'application/json'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+_lock = threading.Lock()
+# Kunci penulisan per path file ekspor: path -> [Lock, jumlah pemakai]
+_path_locks = {}
+# Jumlah handle unduhan yang masih terbuka per path file ekspor
+_open_files = Counter()
+
+
+def available_formats():
+    return [name for name in FORMATS if name != 'Parquet' or pq is not None]
+
+
+def _as_frame(table):
+    if isinstance(table, pd.Series):
+        return table.to_frame(table.name if table.name is not None else 'nilai')
+    return table
+
+
+def _has_default_index(df):
+    index = df.index
+    return isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+
+
+def _prepare(chunk, index):
+    # Kolom bertingkat (hasil agg) diratakan; indeks bermakna (misalnya
+    # wilayah) menjadi kolom biasa agar ikut terekspor di semua format
+    if isinstance(chunk.columns, pd.MultiIndex):
+        chunk = chunk.set_axis(['_'.join(map(str, filter(None, column))) for column in chunk.columns], axis=1)
+    if index:
+        chunk = chunk.reset_index()
+    return chunk.rename(columns=str)
+
+
+def table_slice(table, start, stop, index=None):
+    """
+    Baris start:stop tabel dalam bentuk siap tulis. index=None berarti indeks
+    ikut diekspor bila bukan RangeIndex bawaan.
+    """
+    table = _as_frame(table)
+    if index is None:
+        index = not _has_default_index(table)
+    return _prepare(table.iloc[start:stop], index)
+
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS, index=None):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield table_slice(df, start, start + chunk_rows, index)
+
+
+def write_csv(chunks, out):
+    text = io.TextIOWrapper(out, encoding='utf-8', newline='')
+    for number, chunk in enumerate(chunks):
+        chunk.to_csv(text, header=number == 0, index=False)
+    text.flush()
+    text.detach()
+
+
+def write_json(chunks, out):
+    """
+    Array JSON berisi satu objek per baris, ditulis per potongan.
+    """
+    out.write(b'[')
+    first = True
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        records = chunk.to_json(orient='records', lines=True, date_format='iso', force_ascii=False)
+        for line in records.splitlines():
+            out.write((line if first else ',' + line).encode('utf-8'))
+            first = False
+    out.write(b']')
+
+
+def write_parquet(chunks, out):
+    if pq is None:
+        raise RuntimeError("Ekspor Parquet memerlukan paket pyarrow.")
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(out, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+WRITERS = {'CSV': write_csv, 'JSON': write_json, 'Parquet': write_parquet}
+
+
+def write_export(table, out, fmt='CSV', index=None, chunk_rows=CHUNK_ROWS):
+    """
+    Menulis tabel (DataFrame atau Series) ke file biner `out` dalam format
+    'CSV', 'JSON', atau 'Parquet'.
+    """
+    WRITERS[fmt](iter_chunks(table, chunk_rows, index), out)
+
+
+def slugify(name):
+    return re.sub(r'[^0-9a-z]+', '_', name.lower()).strip('_') or 'data'
+
+
+class _PathLock:
+    """
+    Kunci penulisan satu file ekspor; entri kunci dilepas bila tidak ada lagi
+    yang memakainya.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        with _lock:
+            entry = _path_locks.get(self.path)
+            if entry is None:
+                entry = _path_locks[self.path] = [threading.Lock(), 0]
+            entry[1] += 1
+        self.entry = entry
+        entry[0].acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.entry[0].release()
+        with _lock:
+            self.entry[1] -= 1
+            if self.entry[1] == 0:
+                _path_locks.pop(self.path, None)
+
+
+class ExportReader(io.FileIO):
+    """
+    Handle file ekspor untuk diunduh. Selama terbuka, file tidak ikut
+    dibersihkan; handle menutup dirinya sendiri setelah dibaca sampai habis.
+    """
+
+    def __init__(self, path):
+        super().__init__(path, 'rb')
+        self.path = path
+        with _lock:
+            _open_files[path] += 1
+
+    def read(self, size=-1):
+        data = super().read(size)
+        if size is None or size < 0 or not data:
+            self.close()
+        return data
+
+    def close(self):
+        if not self.closed:
+            with _lock:
+                _open_files[self.path] -= 1
+                if _open_files[self.path] <= 0:
+                    del _open_files[self.path]
+        super().close()
+
+
+def _prune_exports():
+    # Hanya file di luar MAX_EXPORT_FILES terbaru yang sudah melewati masa
+    # simpan dan tidak sedang ditulis atau dibaca yang dihapus. Pemeriksaan dan
+    # penghapusan dilakukan di bawah kunci yang sama dengan pendaftaran kunci
+    # path dan handle unduhan, sehingga tidak ada file yang hilang di tengah
+    # dipakai.
+    files = []
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if not entry.name.endswith('.tmp'):
+                files.append((entry.stat().st_mtime, entry.path))
+        except OSError:  # sudah dihapus oleh pembersihan lain
+            pass
+    cutoff = time.time() - EXPORT_RETENTION
+    for _, path in sorted(files)[:-MAX_EXPORT_FILES]:
+        with _lock:
+            if path in _open_files or path in _path_locks:
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def _export_path(table, fmt, name, index):
+    key = re.sub(r'[^0-9a-zA-Z]+', '-', frame_key(table))[:64]
+    return os.path.join(EXPORT_DIR, f"{slugify(name)}-{key}-{index}.{FORMATS[fmt][0]}")
+
+
+def _write_once(table, path, fmt, index):
+    # Dipanggil di bawah kunci path
+    if os.path.exists(path):
+        # File yang dipakai ulang diperbarui waktunya agar masa simpannya diperpanjang
+        os.utime(path)
+        return
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    # Ditulis ke file sementara dulu agar unduhan lain tidak membaca file setengah jadi
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as out:
+        write_export(table, out, fmt, index)
+    os.replace(tmp_path, path)
+
+
+def export_file(table, fmt='CSV', name='data', index=None):
+    """
+    Path file ekspor untuk tabel. File dibuat sekali per isi tabel dan format,
+    lalu dipakai ulang.
+    """
+    table = _as_frame(table)
+    path = _export_path(table, fmt, name, index)
+    with _PathLock(path):
+        _write_once(table, path, fmt, index)
+    _prune_exports()
+    return path
+
+
+def open_export(table, fmt='CSV', name='data', index=None):
+    """
+    Handle baca file ekspor tabel (lihat export_file). Handle dibuka di bawah
+    kunci path, sehingga file tidak dapat dihapus di antara dibuat dan dibaca.
+    """
+    table = _as_frame(table)
+    path = _export_path(table, fmt, name, index)
+    with _PathLock(path):
+        _write_once(table, path, fmt, index)
+        reader = ExportReader(path)
+    _prune_exports()
+    return reader
+
+
+# Tabel yang tersedia di semua dashboard
+COMMON_TABLES = {
+    "Tren Produksi per Wilayah": lambda df: trend_table(analyze_trends(df)),
+    "Simulasi Monte Carlo Pendapatan": lambda df: revenue_risk(df)['summary'],
+}
+
+
+def filter_raw(df, regions=None, years=None):
+    mask = pd.Series(True, index=df.index)
+    if regions:
+        mask &= df['wilayah'].isin(regions)
+    if years is not None:
+        mask &= df['tahun'].between(*years)
+    # Tanpa filter, dataset asli dipakai langsung (kunci ekspor = versi dataset)
+    return df if mask.all() else df[mask]
+
+
+@st.fragment
+def show_export(df, tables, key='export', title='data'):
+    """
+    Bagian "Ekspor Data": mengunduh tabel analisis (dari hasil yang sudah
+    di-cache) atau data mentah yang difilter per wilayah dan tahun.
+    """
+    with st.expander("📥 Ekspor Data"):
+        raw_label = "Data Mentah (difilter)"
+        choice = st.selectbox("Tabel:", [raw_label, *tables], key=f"{key}_tabel")
+        fmt = st.radio("Format:", available_formats(), horizontal=True, key=f"{key}_format")
+        if pq is None:
+            st.caption("Format Parquet tersedia bila paket pyarrow terpasang.")
+
+        if choice == raw_label:
+            years = (int(df['tahun'].min()), int(df['tahun'].max()))
+            regions = st.multiselect("Wilayah (kosong = semua):", sorted(df['wilayah'].astype(str).unique()),
+                                     key=f"{key}_wilayah")
+            if years[0] < years[1]:
+                years = st.slider("Tahun:", *years, years, key=f"{key}_tahun")
+            table = filter_raw(df, regions, years)
+            index = False
+        else:
+            table = tables[choice](df)
+            index = None
+        st.caption(f"{format_number(len(table))} baris")
+
+        name = f"{title}_{choice}"
+        st.download_button(
+            "Unduh", lambda: open_export(table, fmt, name, index),
+            file_name=f"{slugify(name)}.{FORMATS[fmt][0]}", mime=FORMATS[fmt][1],
+            on_click='ignore', key=f"{key}_unduh"
+        )
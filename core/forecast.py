@@ -0,0 +1,295 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from core.cache import MODELS, versioned_cache
+from core.longtail import show_table
+from core.risk import grouped_moments
+from core.trends import ALL_REGIONS
+
+# Evaluasi metode proyeksi dengan backtesting rolling-origin.
+#
+# Setiap deret (wilayah, ditambah seluruh wilayah) adalah rata-rata produksi
+# per tahun. Untuk setiap titik asal (origin) model dilatih dengan tahun
+# sebelum origin dan meramal HORIZON tahun berikutnya. Semua deret dan semua
+# origin ditumpuk menjadi satu matriks (origin x deret, tahun) dengan mask
+# tahun yang boleh dilihat, sehingga setiap metode cukup dihitung sekali
+# secara tervektor. MAE dan MAPE dihitung per deret dan metode; metode dengan
+# MAE terkecil dipakai untuk proyeksi deret tersebut dan hasilnya di-cache
+# per versi dataset. Satu komoditas hanya butuh beberapa milidetik, sehingga
+# laporan semua komoditas dihitung berurutan tanpa pool proses.
+
+MIN_TRAIN = 3
+HORIZON = 2
+WINDOW = 3
+ALPHA = 0.5
+# Dipakai bila deret terlalu pendek untuk dievaluasi (perilaku sebelumnya)
+DEFAULT_METHOD = 'tren_linear'
+
+PRODUCTION = 'produksi_pertahun'
+
+
+def series_matrix(df, column=PRODUCTION, by='wilayah', time='tahun'):
+    """
+    Matriks rata-rata `column` per wilayah x tahun, ditambah baris rata-rata
+    seluruh wilayah. Tahun tanpa data bernilai NaN.
+    """
+    moments = grouped_moments(df, [by, time], [column])[column]
+    matrix = (moments['sum'] / moments['count']).unstack(time)
+    matrix.index = matrix.index.astype(str)
+    totals = moments.groupby(level=1).sum()
+
+    years = matrix.columns.astype(int)
+    matrix = matrix.reindex(columns=range(years.min(), years.max() + 1))
+    matrix.loc[ALL_REGIONS] = (totals['sum'] / totals['count']).reindex(matrix.columns)
+    matrix.columns.name = time
+    return matrix
+
+
+# Setiap metode menerima (values, valid, origin, targets): nilai (0 untuk
+# tahun yang tidak boleh dilihat), mask tahun yang boleh dilihat, jumlah
+# tahun latih per baris, dan posisi tahun yang diramal (baris x horizon).
+
+def _last_valid(values, valid):
+    positions = np.arange(values.shape[1])
+    last = np.where(valid, positions, -1).max(axis=1)
+    value = np.where(last >= 0, values[np.arange(len(values)), last.clip(0)], np.nan)
+    return last, value
+
+
+def _flat(level, targets):
+    return np.broadcast_to(level[:, None], targets.shape).astype(np.float64)
+
+
+def _masked_mean(values, valid):
+    counts = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, (values * valid).sum(axis=1) / counts, np.nan)
+
+
+def naive(values, valid, origin, targets):
+    return _flat(_last_valid(values, valid)[1], targets)
+
+
+def historical_mean(values, valid, origin, targets):
+    return _flat(_masked_mean(values, valid), targets)
+
+
+def moving_average(values, valid, origin, targets):
+    recent = valid & (np.arange(values.shape[1]) >= (origin - WINDOW)[:, None])
+    return _flat(_masked_mean(values, recent), targets)
+
+
+def drift(values, valid, origin, targets):
+    positions = np.arange(values.shape[1])
+    first = np.where(valid, positions, values.shape[1]).min(axis=1)
+    last, last_value = _last_valid(values, valid)
+    first_value = values[np.arange(len(values)), first.clip(max=values.shape[1] - 1)]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where(last > first, (last_value - first_value) / (last - first), 0.0)
+    return last_value[:, None] + slope[:, None] * (targets - last[:, None])
+
+
+def linear_trend(values, valid, origin, targets):
+    # Regresi linear per baris dalam bentuk tertutup dari jumlah-jumlah bermask
+    x = np.arange(values.shape[1], dtype=np.float64)
+    weights = valid.astype(np.float64)
+    n = weights.sum(axis=1)
+    sx = weights @ x
+    sxx = weights @ (x * x)
+    sy = (values * weights).sum(axis=1)
+    sxy = (values * weights) @ x
+    denominator = n * sxx - sx * sx
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, 0.0)
+        intercept = np.where(n > 0, (sy - slope * sx) / n, np.nan)
+    return intercept[:, None] + slope[:, None] * targets
+
+
+def exponential_smoothing(values, valid, origin, targets):
+    level = np.full(len(values), np.nan)
+    for t in range(values.shape[1]):
+        observed = valid[:, t]
+        smoothed = np.where(np.isnan(level), values[:, t], ALPHA * values[:, t] + (1 - ALPHA) * level)
+        level = np.where(observed, smoothed, level)
+    return _flat(level, targets)
+
+
+# Urutan menentukan pemenang bila MAE sama (metode yang lebih sederhana dulu)
+METHODS = {
+    'naif': naive,
+    'rata_rata': historical_mean,
+    'rata_bergulir': moving_average,
+    'pemulusan_eksponensial': exponential_smoothing,
+    'drift': drift,
+    'tren_linear': linear_trend,
+}
+
+METHOD_NAMES = {
+    'naif': "naif (nilai terakhir)",
+    'rata_rata': "rata-rata historis",
+    'rata_bergulir': f"rata-rata bergulir {WINDOW} tahun",
+    'pemulusan_eksponensial': "pemulusan eksponensial",
+    'drift': "drift",
+    'tren_linear': "tren linear",
+}
+
+
+def _forecast_all(values, valid, origin, targets):
+    # (metode, baris, horizon) untuk semua metode
+    filled = np.where(valid, values, 0.0)
+    return np.stack([method(filled, valid, origin, targets) for method in METHODS.values()])
+
+
+def backtest(matrix, horizon=HORIZON, min_train=MIN_TRAIN):
+    """
+    Backtesting rolling-origin untuk seluruh deret (baris matrix) dan metode
+    sekaligus. Mengembalikan dict berisi galat per (wilayah, metode),
+    ringkasan per metode, metode terbaik per wilayah, dan proyeksi setiap
+    metode untuk `horizon` tahun setelah tahun terakhir.
+    """
+    values = matrix.to_numpy(dtype=np.float64)
+    n_series, n_years = values.shape
+    positions = np.arange(n_years)
+    steps = np.arange(horizon)
+    names = list(METHODS)
+
+    # Baris tumpukan: setiap origin untuk setiap deret
+    origins = np.arange(min_train, n_years)
+    origin = np.repeat(origins, n_series)
+    series = np.tile(np.arange(n_series), len(origins))
+    history = values[series]
+    visible = ~np.isnan(history) & (positions < origin[:, None])
+    targets = origin[:, None] + steps
+    actual = np.where(targets < n_years, history[np.arange(len(series))[:, None], targets.clip(max=n_years - 1)], np.nan)
+    forecasts = _forecast_all(history, visible, origin, targets)
+
+    errors = np.abs(forecasts - actual)
+    scored = ~np.isnan(errors)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percent = np.where(scored & (actual != 0), errors / np.abs(actual) * 100, np.nan)
+    target_series = np.broadcast_to(series[:, None], targets.shape).ravel()
+
+    def per_series(array):
+        # Rata-rata per (metode, deret) dengan np.bincount atas nilai yang ada
+        result = np.full((len(names), n_series), np.nan)
+        counts = np.zeros((len(names), n_series))
+        for i, flat in enumerate(array.reshape(len(names), -1)):
+            ok = ~np.isnan(flat)
+            counts[i] = np.bincount(target_series[ok], minlength=n_series)
+            sums = np.bincount(target_series[ok], weights=flat[ok], minlength=n_series)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result[i] = np.where(counts[i] > 0, sums / counts[i], np.nan)
+        return result, counts
+
+    mae, counts = per_series(errors)
+    mape, _ = per_series(percent)
+
+    index = pd.MultiIndex.from_product([matrix.index, names], names=['wilayah', 'metode'])
+    error_table = pd.DataFrame({
+        'mae': mae.T.ravel(),
+        'mape': mape.T.ravel(),
+        'jumlah_prediksi': counts.T.ravel().astype(int),
+    }, index=index).round(2)
+
+    evaluated = ~np.isnan(mae).all(axis=0)
+    winner = np.where(evaluated, np.where(np.isnan(mae), np.inf, mae).argmin(axis=0), names.index(DEFAULT_METHOD))
+    columns = np.arange(n_series)
+    best = pd.DataFrame({
+        'metode': np.array(names)[winner],
+        'mae': mae[winner, columns],
+        'mape': mape[winner, columns],
+    }, index=matrix.index).round(2)
+
+    # Proyeksi setiap metode dari seluruh riwayat
+    future_years = [int(matrix.columns[-1]) + 1 + step for step in steps]
+    full = _forecast_all(values, ~np.isnan(values), np.full(n_series, n_years), n_years + np.tile(steps, (n_series, 1)))
+    forecast_table = pd.DataFrame(full.transpose(1, 0, 2).reshape(-1, horizon), index=index,
+                                  columns=pd.Index(future_years, name=matrix.columns.name)).round(2)
+    best_forecast = pd.DataFrame(full[winner, columns], index=matrix.index, columns=forecast_table.columns).round(2)
+
+    summary = pd.DataFrame({
+        # Rata-rata galat seluruh deret yang dapat dievaluasi
+        'mae': pd.DataFrame(mae.T).mean().to_numpy(),
+        'mape': pd.DataFrame(mape.T).mean().to_numpy(),
+        'menang': np.bincount(winner[evaluated], minlength=len(names)),
+    }, index=pd.Index(names, name='metode')).round(2)
+
+    return {
+        'errors': error_table,
+        'summary': summary,
+        'best': best,
+        'forecasts': forecast_table,
+        'forecast': best_forecast,
+    }
+
+
+# Fungsi untuk backtesting proyeksi (di-cache per versi dataset)
+@versioned_cache(tier=MODELS)
+def analyze_forecast(df, column=PRODUCTION, horizon=HORIZON):
+    matrix = series_matrix(df, column)
+    result = backtest(matrix, horizon)
+    result['yearly'] = matrix
+    return result
+
+
+def best_projection(df, region=ALL_REGIONS, column=PRODUCTION, horizon=HORIZON):
+    """
+    Proyeksi `horizon` tahun ke depan untuk satu deret dengan metode terbaik
+    hasil backtesting, sebagai tabel (tahun, proyeksi, metode).
+    """
+    result = analyze_forecast(df, column, horizon)
+    forecast = result['forecast'].loc[region]
+    return pd.DataFrame({
+        'tahun': forecast.index.astype(int),
+        'proyeksi_produksi': forecast.to_numpy(),
+        'metode': result['best'].loc[region, 'metode'],
+    })
+
+
+@st.fragment
+def show_forecast(df, column=PRODUCTION, horizon=HORIZON, key='forecast'):
+    """
+    Bagian proyeksi: riwayat dan proyeksi metode terbaik untuk wilayah
+    terpilih, galat backtesting setiap metode, dan metode terbaik per wilayah.
+    """
+    result = analyze_forecast(df, column, horizon)
+    yearly = result['yearly']
+
+    regions = [ALL_REGIONS] + [region for region in yearly.index if region != ALL_REGIONS]
+    region = st.selectbox("Pilih Wilayah:", regions, key=f"{key}_wilayah")
+    best = result['best'].loc[region]
+
+    history = yearly.loc[region].dropna()
+    forecast = result['forecast'].loc[region]
+    # Titik terakhir riwayat disertakan agar garis proyeksi tersambung
+    projection = pd.concat([history.iloc[-1:], forecast])
+    chart_data = pd.DataFrame({'Historis': history, f"Proyeksi ({METHOD_NAMES[best['metode']]})": projection})
+    fig = px.line(chart_data, x=chart_data.index, y=chart_data.columns, markers=True,
+                  title=f'Proyeksi {column} - {region}')
+    fig.update_layout(xaxis_title='Tahun', yaxis_title=column, legend_title_text='')
+    st.plotly_chart(fig, key=f"{key}_chart")
+
+    st.write(f"Galat backtesting rolling-origin ({horizon} tahun ke depan, minimal {MIN_TRAIN} tahun latih):")
+    st.dataframe(result['errors'].loc[region].sort_values('mae'))
+    st.write("Metode terbaik per wilayah:")
+    show_table(result['best'], key=f"{key}_best")
+
+
+# Laporan backtesting semua komoditas: python -m core.forecast
+if __name__ == "__main__":
+    from core.catalog import DATASETS, read_commodity
+
+    parser = argparse.ArgumentParser(description="Backtesting metode proyeksi produksi")
+    parser.add_argument('commodities', nargs='*', default=list(DATASETS))
+    args = parser.parse_args()
+
+    for commodity in args.commodities:
+        result = backtest(series_matrix(read_commodity(commodity)))
+        print(f"\n== {commodity} ==")
+        print(result['summary'].to_string())
+        best = result['best'].loc[ALL_REGIONS]
+        print(f"Seluruh wilayah: {METHOD_NAMES[best['metode']]} (MAE {best['mae']}, MAPE {best['mape']}%)")
@@ -0,0 +1,162 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy import sparse
+
+# Dukungan kelompok berkardinalitas tinggi (ribuan kecamatan/desa, puluhan tahun).
+#
+# Grafik per wilayah hanya menampilkan N wilayah teratas ditambah satu
+# kelompok "Lainnya". N teratas dipilih dengan np.argpartition (O(n), tanpa
+# mengurutkan seluruh wilayah). Matriks wilayah x tahun disimpan sebagai
+# matriks sparse (hanya pasangan yang ada datanya), dan baris yang perlu
+# digambar saja yang dijadikan padat. Tabel per wilayah ditampilkan per
+# halaman, sehingga memori dan ukuran grafik/tabel yang dikirim ke browser
+# tidak bertambah dengan jumlah wilayah.
+
+TOP_N = 15
+OTHERS = 'Lainnya'
+PAGE_SIZE = 50
+
+# sums dan counts: matriks CSR (baris x kolom); rows dan columns: label indeks
+SparseMatrix = namedtuple('SparseMatrix', ['sums', 'counts', 'rows', 'columns'])
+
+
+def top_positions(values, n=TOP_N, ascending=False):
+    """
+    Posisi n nilai teratas (atau terbawah) terurut, dipilih dengan
+    argpartition. NaN selalu ditempatkan paling akhir.
+    """
+    array = np.asarray(values, dtype=np.float64)
+    order = array if ascending else -array
+    order = np.where(np.isnan(order), np.inf, order)
+    if n < len(order):
+        keep = np.argpartition(order, n - 1)[:n]
+    else:
+        keep = np.arange(len(order))
+    return keep[np.argsort(order[keep], kind='stable')]
+
+
+def top_n(values, n=TOP_N, others='sum', weights=None, ascending=False):
+    """
+    Series n nilai teratas ditambah baris "Lainnya (k wilayah)" untuk sisa
+    kelompok. others='sum' menjumlahkan sisa (total, pangsa), 'mean' memakai
+    rata-rata berbobot `weights` (jumlah data per kelompok), dan None tanpa
+    baris Lainnya (untuk skor atau simpangan baku yang tidak bisa digabung).
+    """
+    keep = top_positions(values, n, ascending)
+    top = values.iloc[keep]
+    top.index = top.index.astype(str)
+    rest = np.ones(len(values), dtype=bool)
+    rest[keep] = False
+    if others is None or not rest.any():
+        return top
+
+    remaining = values.to_numpy(dtype=np.float64)[rest]
+    if others == 'sum':
+        other_value = np.nansum(remaining)
+    else:
+        remaining_weights = np.asarray(weights, dtype=np.float64)[rest]
+        other_value = np.nansum(remaining * remaining_weights) / remaining_weights.sum()
+    other = pd.Series([other_value], index=[f"{OTHERS} ({int(rest.sum())} wilayah)"])
+    return pd.concat([top, other]).rename_axis(values.index.name).rename(values.name)
+
+
+def top_n_mean(means, labels, n=TOP_N):
+    """
+    top_n untuk rata-rata per kelompok; "Lainnya" adalah rata-rata seluruh
+    data kelompok lain (berbobot jumlah baris `labels` per kelompok).
+    """
+    return top_n(means, n, others='mean', weights=labels.value_counts().reindex(means.index).fillna(0))
+
+
+def group_top(labels, top):
+    """
+    Kolom kategori berisi label kelompok, dengan kelompok di luar `top`
+    digabung menjadi "Lainnya". Hanya kode kategori yang dipetakan ulang.
+    """
+    labels = labels.astype('category')
+    categories = [str(label) for label in top] + [OTHERS]
+    mapping = pd.Index(categories).get_indexer(labels.cat.categories.astype(str))
+    mapping[mapping < 0] = len(categories) - 1
+    codes = labels.cat.codes.to_numpy()
+    new_codes = np.where(codes >= 0, mapping[codes.clip(0)], -1)
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories), index=labels.index, name=labels.name)
+
+
+def sparse_matrix(df, column, by='wilayah', time='tahun'):
+    """
+    Jumlah dan banyaknya nilai `column` per (by, time) sebagai matriks
+    sparse; pasangan tanpa data tidak menempati memori.
+    """
+    groups = df[by].astype('category')
+    rows = groups.cat.codes.to_numpy()
+    years = df[time].to_numpy()
+    first_year = int(years.min())
+    columns = pd.RangeIndex(first_year, int(years.max()) + 1, name=time)
+    values = df[column].to_numpy(dtype=np.float64)
+    valid = (rows >= 0) & ~np.isnan(values)
+
+    shape = (len(groups.cat.categories), len(columns))
+    coordinates = (rows[valid], years[valid] - first_year)
+    sums = sparse.csr_matrix((values[valid], coordinates), shape=shape)
+    counts = sparse.csr_matrix((np.ones(int(valid.sum())), coordinates), shape=shape)
+    return SparseMatrix(sums, counts, groups.cat.categories.astype(str).rename(by), columns)
+
+
+def _mean(sums, counts):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def dense_rows(matrix, labels):
+    """
+    Rata-rata per tahun untuk baris `labels` saja sebagai DataFrame padat.
+    """
+    positions = matrix.rows.get_indexer(labels)
+    sums = matrix.sums[positions].toarray()
+    counts = matrix.counts[positions].toarray()
+    return pd.DataFrame(_mean(sums, counts), index=pd.Index(labels, name=matrix.rows.name), columns=matrix.columns)
+
+
+def top_rows(matrix, n=TOP_N):
+    """
+    Rata-rata per tahun n baris dengan total terbesar, ditambah baris
+    "Lainnya" (rata-rata seluruh data baris lain per tahun).
+    """
+    # Hanya baris yang punya data yang dihitung sebagai wilayah
+    observed = np.flatnonzero(matrix.counts.getnnz(axis=1))
+    totals = np.asarray(matrix.sums.sum(axis=1)).ravel()[observed]
+    keep = observed[top_positions(totals, n)]
+    result = dense_rows(matrix, list(matrix.rows[keep]))
+    if len(keep) < len(observed):
+        rest_sums = np.asarray(matrix.sums.sum(axis=0)).ravel() - matrix.sums[keep].toarray().sum(axis=0)
+        rest_counts = np.asarray(matrix.counts.sum(axis=0)).ravel() - matrix.counts[keep].toarray().sum(axis=0)
+        result.loc[f"{OTHERS} ({len(observed) - len(keep)} wilayah)"] = _mean(rest_sums, rest_counts)
+    return result
+
+
+def region_year_lines(df, column='produksi_pertahun', n=TOP_N, by='wilayah', time='tahun'):
+    """
+    Data panjang (time, by, column) untuk grafik garis per wilayah: n wilayah
+    dengan total terbesar ditambah "Lainnya", tanpa tahun yang kosong.
+    """
+    lines = top_rows(sparse_matrix(df, column, by, time), n)
+    return lines.stack().rename(column).reset_index()
+
+
+def show_table(table, key, page_size=PAGE_SIZE):
+    """
+    Menampilkan tabel; tabel yang lebih panjang dari page_size ditampilkan
+    per halaman sehingga hanya satu halaman baris yang dikirim ke browser.
+    """
+    total = len(table)
+    if total <= page_size:
+        st.dataframe(table)
+        return
+    pages = -(-total // page_size)
+    page = st.number_input(f"Halaman (1-{pages})", min_value=1, max_value=pages, value=1, key=f"{key}_halaman")
+    start = (int(page) - 1) * page_size
+    st.dataframe(table.iloc[start:start + page_size])
+    st.caption(f"Baris {start + 1}-{min(start + page_size, total)} dari {total}")
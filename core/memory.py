@@ -0,0 +1,311 @@
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Pengatur memori cache per tingkat (tier).
+#
+# Dataset yang dimuat, agregat, grafik (PNG), dan model masing-masing disimpan
+# di tier dengan anggaran byte sendiri. Tier dataset menyimpan objek apa
+# adanya (dibagikan ke semua sesi); tier lain menyimpan hasil yang sudah
+# di-pickle, sehingga ukurannya tepat dan setiap pemanggil mendapat salinan
+# seperti @st.cache_data. Bila anggaran terlampaui, entri dikeluarkan dengan
+# kebijakan 'lru' (paling lama tidak dipakai) atau 'lfu' (frekuensi per byte
+# terendah dengan penuaan, GreedyDual-Size-Frequency). Entri yang lebih besar
+# dari anggaran tier tidak disimpan. Jumlah hit, miss, dan eviksi setiap tier
+# ditampilkan di panel instrumentasi sidebar.
+#
+# Anggaran (MB) dan kebijakan dapat diatur dengan variabel lingkungan, misalnya
+# CACHE_BUDGET_GRAFIK_MB=128 dan CACHE_POLICY_GRAFIK=lfu.
+
+DATASETS = 'dataset'
+AGGREGATES = 'agregat'
+FIGURES = 'grafik'
+MODELS = 'model'
+
+# Anggaran (MB) dan kebijakan bawaan per tier
+DEFAULT_TIERS = {
+    DATASETS: (512, 'lru'),
+    AGGREGATES: (256, 'lfu'),
+    FIGURES: (256, 'lru'),
+    MODELS: (256, 'lfu'),
+}
+POLICIES = ('lru', 'lfu')
+MB = 1024 * 1024
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'hits', 'priority')
+
+    def __init__(self, value, size):
+        self.value = value
+        self.size = size
+        self.hits = 1
+        self.priority = 0.0
+
+
+class Tier:
+    def __init__(self, name, budget, policy='lru'):
+        if policy not in POLICIES:
+            raise ValueError(f"Kebijakan cache '{policy}' tidak dikenal (pilihan: {', '.join(POLICIES)}).")
+        self.name = name
+        self.budget = budget
+        self.policy = policy
+        self.bytes = 0
+        self.peak = 0
+        self._clock = 0.0
+        self._entries = OrderedDict()
+        self.stats = {'hit': 0, 'miss': 0, 'eviksi': 0, 'byte_dikeluarkan': 0, 'ditolak': 0}
+
+    def _touch(self, entry):
+        entry.priority = self._clock + entry.hits / max(entry.size, 1)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.hits += 1
+        self.stats['hit'] += 1
+        if self.policy == 'lru':
+            self._entries.move_to_end(key)
+        else:
+            self._touch(entry)
+        return entry
+
+    def put(self, key, value, size):
+        if size > self.budget:
+            self.stats['ditolak'] += 1
+            return False
+        self.discard(key)
+        while self._entries and self.bytes + size > self.budget:
+            self._evict()
+        entry = self._entries[key] = _Entry(value, size)
+        self._touch(entry)
+        self.bytes += size
+        self.peak = max(self.peak, self.bytes)
+        return True
+
+    def _evict(self):
+        if self.policy == 'lru':
+            key = next(iter(self._entries))
+        else:
+            key = min(self._entries, key=lambda k: self._entries[k].priority)
+            # Penuaan: entri baru mulai dari prioritas entri yang dikeluarkan
+            self._clock = self._entries[key].priority
+        size = self.discard(key)
+        self.stats['eviksi'] += 1
+        self.stats['byte_dikeluarkan'] += size
+
+    def discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return 0
+        self.bytes -= entry.size
+        return entry.size
+
+    def clear(self, match=None):
+        for key in [key for key in self._entries if match is None or match(key)]:
+            self.discard(key)
+
+    def status(self):
+        return {**self.stats, 'entri': len(self._entries), 'byte': self.bytes,
+                'byte_puncak': self.peak, 'anggaran': self.budget, 'kebijakan': self.policy}
+
+
+def object_size(value):
+    """
+    Perkiraan ukuran objek di memori (byte), termasuk isi kolom teks dan
+    kategori DataFrame.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(object_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(object_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class MemoryGovernor:
+    def __init__(self, tiers):
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.tiers = {name: Tier(name, budget, policy) for name, (budget, policy) in tiers.items()}
+
+    @classmethod
+    def from_env(cls, defaults=DEFAULT_TIERS):
+        tiers = {}
+        for name, (budget_mb, policy) in defaults.items():
+            budget_mb = float(os.environ.get(f"CACHE_BUDGET_{name.upper()}_MB", budget_mb))
+            policy = os.environ.get(f"CACHE_POLICY_{name.upper()}", policy).lower()
+            tiers[name] = (int(budget_mb * MB), policy)
+        return cls(tiers)
+
+    def _key_lock(self, key):
+        # Kunci per entri agar satu nilai hanya dihitung sekali walaupun
+        # diminta beberapa thread sekaligus
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = [threading.Lock(), 0]
+            lock[1] += 1
+        return lock
+
+    def _release_key_lock(self, key, lock):
+        with self._lock:
+            lock[1] -= 1
+            if lock[1] == 0:
+                self._key_locks.pop(key, None)
+
+    def _lookup(self, tier, key):
+        with self._lock:
+            entry = tier.get(key)
+            return (True, entry.value) if entry is not None else (False, None)
+
+    def get_or_compute(self, tier_name, key, compute, shared=False):
+        """
+        Nilai untuk key dari tier, atau hasil compute() yang kemudian
+        disimpan. Tier bersama (shared) menyimpan objeknya langsung; tier lain
+        menyimpan pickle dan mengembalikan salinan.
+        """
+        tier = self.tiers[tier_name]
+        found, stored = self._lookup(tier, key)
+        if not found:
+            lock = self._key_lock(key)
+            try:
+                with lock[0]:
+                    found, stored = self._lookup(tier, key)
+                    if not found:
+                        value = compute()
+                        stored, size = self._encode(value, shared)
+                        with self._lock:
+                            tier.stats['miss'] += 1
+                            if stored is None:
+                                tier.stats['ditolak'] += 1
+                            if stored is not None:
+                                tier.put(key, stored, size)
+                        return value
+            finally:
+                self._release_key_lock(key, lock)
+        return stored if shared else pickle.loads(stored)
+
+    def peek(self, tier_name, key, shared=False):
+        """
+        (ditemukan, nilai) untuk key dari tier tanpa menghitung apa pun; nilai
+        tier yang tidak dibagikan dikembalikan sebagai salinan.
+        """
+        found, stored = self._lookup(self.tiers[tier_name], key)
+        if not found:
+            return False, None
+        return True, stored if shared else pickle.loads(stored)
+
+    @staticmethod
+    def _encode(value, shared):
+        if shared:
+            return value, object_size(value)
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Nilai yang tidak bisa di-pickle tetap dikembalikan, tanpa di-cache
+            return None, 0
+        return data, len(data)
+
+    def clear(self, tier_name=None, match=None):
+        with self._lock:
+            for name, tier in self.tiers.items():
+                if tier_name is None or name == tier_name:
+                    tier.clear(match)
+
+    def status(self):
+        with self._lock:
+            return {name: tier.status() for name, tier in self.tiers.items()}
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def argument_key(value, hash_funcs):
+    """
+    Kunci argumen fungsi ber-cache: nilai sederhana apa adanya, tipe yang
+    terdaftar di hash_funcs lewat fungsinya, array lewat hash isinya, dan
+    objek lain lewat hash pickle-nya.
+    """
+    if value is None or isinstance(value, (str, int, float, bool, bytes)):
+        return value
+    for kind, hash_func in hash_funcs.items():
+        if isinstance(value, kind):
+            return (kind.__name__, hash_func(value))
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__, tuple(argument_key(item, hash_funcs) for item in value))
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((repr(k), argument_key(v, hash_funcs)) for k, v in value.items())))
+    if isinstance(value, pd.Series):
+        return ('Series', value.name, _digest(pd.util.hash_pandas_object(value, index=True).values.tobytes()))
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape, _digest(np.ascontiguousarray(value).tobytes()))
+    return (type(value).__name__, _digest(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+
+
+def peak_rss():
+    """
+    Puncak resident set size proses ini (byte), atau None bila tidak
+    tersedia di sistem operasi ini.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS byte
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def memory_report(governor):
+    """
+    Tabel status setiap tier: hit, miss, rasio hit, eviksi, entri, dan
+    pemakaian terhadap anggaran (MB).
+    """
+    table = pd.DataFrame(governor.status()).T
+    requests = table['hit'] + table['miss']
+    table['rasio_hit_persen'] = (table['hit'] / requests.where(requests > 0) * 100).astype(float).round(1)
+    for column, mb_column in (('anggaran', 'anggaran_mb'), ('byte', 'mb'), ('byte_puncak', 'mb_puncak'),
+                              ('byte_dikeluarkan', 'mb_dikeluarkan')):
+        table[mb_column] = (table[column].astype(float) / MB).round(2)
+    return table[['kebijakan', 'anggaran_mb', 'mb', 'mb_puncak', 'entri', 'hit', 'miss',
+                  'rasio_hit_persen', 'eviksi', 'mb_dikeluarkan', 'ditolak']].rename_axis('tier')
+
+
+def show_memory_panel(governor, flight_status=None):
+    """
+    Panel instrumentasi di sidebar: pemakaian memori cache per tier dan
+    puncak RSS proses, sebagai acuan ukuran kontainer pekerja.
+    """
+    with st.sidebar.expander("Instrumentasi Memori Cache"):
+        report = memory_report(governor)
+        st.dataframe(report.T)
+        rss = peak_rss()
+        st.caption(f"Total cache {report['mb'].sum():.1f} MB dari anggaran {report['anggaran_mb'].sum():.0f} MB"
+                   + (f"; puncak RSS proses {rss / MB:.0f} MB." if rss is not None else "."))
+        if flight_status is not None:
+            st.caption(f"Single-flight: {flight_status['slot']} slot, {flight_status['basi']} hasil basi disajikan "
+                       f"dari tier cache, {flight_status['basi_dikeluarkan']} sudah dikeluarkan, "
+                       f"{flight_status['menunggu']} pemanggil menunggu.")
+
+
+# Satu instans untuk seluruh sesi di server ini
+governor = MemoryGovernor.from_env()
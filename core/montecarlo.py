@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from core.cache import MODELS, single_flight, versioned_cache
+from core.longtail import show_table
+from core.narrative import format_number
+
+# Simulasi Monte Carlo risiko pendapatan per wilayah.
+#
+# Harga dan produksi setiap wilayah dimodelkan sebagai distribusi log-normal
+# bivariat (rata-rata, simpangan baku, dan korelasi log-nilai dari data
+# historis). Pendapatan = harga x produksi disimulasikan untuk seluruh wilayah
+# sekaligus dalam potongan jalur (batch) dengan RNG ber-seed, sehingga hasil
+# dapat direproduksi dan di-cache. Setiap potongan langsung direduksi menjadi
+# statistik yang dilaporkan (jumlah, jumlah jalur rugi, minimum, maksimum, dan
+# sketsa histogram log-pendapatan untuk kuantil dan distribusi laba), sehingga
+# memori tidak tumbuh dengan jumlah jalur.
+
+N_PATHS = 100_000
+SEED = 42
+BATCH_SIZE = 20_000
+CONFIDENCE = 0.95
+
+# Sketsa kuantil: histogram log-pendapatan per wilayah pada grid tetap rata-rata
+# log +/- SKETCH_WIDTH simpangan baku. Log-pendapatan berdistribusi normal,
+# sehingga grid dapat ditentukan sebelum simulasi.
+SKETCH_BINS = 4096
+SKETCH_WIDTH = 8
+
+# Biaya produksi sebagai proporsi rata-rata pendapatan historis wilayah
+COST_RATIO = 0.8
+
+PRICE = 'harga'
+PRODUCTION = 'produksi_pertahun'
+
+
+def fit_distributions(df, by='wilayah'):
+    """
+    Parameter log-normal per wilayah: rata-rata dan simpangan baku log harga
+    dan log produksi, korelasi keduanya, serta rata-rata pendapatan historis.
+    """
+    values = df[[PRICE, PRODUCTION]].astype(np.float64)
+    logs = np.log(values.clip(lower=1e-9))
+    groups = df[by].astype(str)
+
+    grouped = logs.groupby(groups)
+    params = pd.DataFrame({
+        'mu_harga': grouped[PRICE].mean(),
+        'sigma_harga': grouped[PRICE].std(),
+        'mu_produksi': grouped[PRODUCTION].mean(),
+        'sigma_produksi': grouped[PRODUCTION].std(),
+        'korelasi': grouped.corr().xs(PRICE, level=1)[PRODUCTION]
+    }).fillna(0)
+    params['pendapatan_historis'] = (values[PRICE] * values[PRODUCTION]).groupby(groups).mean()
+    return params
+
+
+def simulate_revenue(params, cost, n_paths=N_PATHS, seed=SEED, batch_size=BATCH_SIZE):
+    """
+    Ringkasan pendapatan simulasi per wilayah tanpa menyimpan jalurnya: jumlah
+    pendapatan, jumlah jalur di bawah biaya (rugi), minimum, maksimum, dan
+    sketsa histogram log-pendapatan. Jalur dibangkitkan per potongan.
+    """
+    rng = np.random.default_rng(seed)
+    column = lambda name: params[name].to_numpy(dtype=np.float64)[:, None]
+    mu_price, sigma_price = column('mu_harga'), column('sigma_harga')
+    mu_production, sigma_production = column('mu_produksi'), column('sigma_produksi')
+    rho = column('korelasi').clip(-1, 1)
+    rho_complement = np.sqrt(1 - rho ** 2)
+    cost = np.asarray(cost, dtype=np.float64)[:, None]
+
+    # Grid sketsa dari sebaran log-pendapatan (jumlah dua log-normal berkorelasi)
+    n_regions = len(params)
+    log_std = np.sqrt(sigma_price ** 2 + sigma_production ** 2 + 2 * rho * sigma_price * sigma_production)
+    half_width = np.where(log_std > 0, SKETCH_WIDTH * log_std, 1.0)
+    lower = mu_price + mu_production - half_width
+    bin_width = 2 * half_width / SKETCH_BINS
+    offsets = np.arange(n_regions)[:, None] * SKETCH_BINS
+
+    total = np.zeros(n_regions)
+    below = np.zeros(n_regions, dtype=np.int64)
+    low = np.full(n_regions, np.inf)
+    high = np.full(n_regions, -np.inf)
+    sketch = np.zeros(n_regions * SKETCH_BINS, dtype=np.int64)
+    for start in range(0, n_paths, batch_size):
+        stop = min(start + batch_size, n_paths)
+        z = rng.standard_normal((2, n_regions, stop - start))
+        log_revenue = mu_price + sigma_price * z[0]
+        log_revenue += mu_production + sigma_production * (rho * z[0] + rho_complement * z[1])
+        bins = ((log_revenue - lower) / bin_width).astype(np.int64).clip(0, SKETCH_BINS - 1)
+        sketch += np.bincount((bins + offsets).ravel(), minlength=sketch.size)
+        revenue = np.exp(log_revenue, out=log_revenue)
+        total += revenue.sum(axis=1)
+        below += (revenue < cost).sum(axis=1)
+        np.minimum(low, revenue.min(axis=1), out=low)
+        np.maximum(high, revenue.max(axis=1), out=high)
+    return {
+        'n': n_paths, 'sum': total, 'below': below, 'min': low, 'max': high,
+        'sketch': sketch.reshape(n_regions, SKETCH_BINS), 'lower': lower[:, 0], 'bin_width': bin_width[:, 0],
+    }
+
+
+def sketch_quantile(simulated, q):
+    """
+    Kuantil pendapatan per wilayah dari sketsa (posisi sama dengan
+    np.percentile; nilai di dalam satu bin dianggap tersebar merata).
+    """
+    counts = simulated['sketch']
+    cumulative = counts.cumsum(axis=1)
+    rank = q * (simulated['n'] - 1)
+    index = (cumulative <= rank).sum(axis=1).clip(max=counts.shape[1] - 1)
+    rows = np.arange(len(counts))
+    in_bin = counts[rows, index]
+    fraction = (rank - (cumulative[rows, index] - in_bin) + 0.5) / np.maximum(in_bin, 1)
+    value = np.exp(simulated['lower'] + (index + fraction) * simulated['bin_width'])
+    return value.clip(simulated['min'], simulated['max'])
+
+
+def sketch_histogram(simulated, region, cost, bins):
+    """
+    Histogram laba satu wilayah (bin sama lebar dari laba minimum sampai
+    maksimum, seperti np.histogram) yang disusun ulang dari bin sketsa.
+    """
+    low, high = simulated['min'][region] - cost, simulated['max'][region] - cost
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    centers = np.exp(simulated['lower'][region]
+                     + (np.arange(SKETCH_BINS) + 0.5) * simulated['bin_width'][region]) - cost
+    index = np.floor((centers - low) / (high - low) * bins).astype(np.int64).clip(0, bins - 1)
+    counts = np.bincount(index, weights=simulated['sketch'][region], minlength=bins).astype(np.int64)
+    edges = np.linspace(low, high, bins + 1)
+    return pd.DataFrame({'laba': (edges[:-1] + edges[1:]) / 2, 'jumlah_jalur': counts})
+
+
+# Fungsi untuk simulasi risiko pendapatan (di-cache per versi dataset dan parameter)
+@single_flight
+@versioned_cache(tier=MODELS)
+def revenue_risk(df, n_paths=N_PATHS, seed=SEED, cost_ratio=COST_RATIO, confidence=CONFIDENCE, bins=50):
+    params = fit_distributions(df)
+    cost = params['pendapatan_historis'].to_numpy() * cost_ratio
+    simulated = simulate_revenue(params, cost, n_paths, seed)
+
+    # Laba = pendapatan - biaya, sehingga rata-rata dan kuantil laba cukup
+    # digeser dari statistik pendapatan
+    expected_revenue = simulated['sum'] / n_paths
+    expected_profit = expected_revenue - cost
+    quantile = sketch_quantile(simulated, 1 - confidence) - cost
+
+    var_column = f'var_{round(confidence * 100)}'
+    summary = pd.DataFrame({
+        'pendapatan_rata_rata': expected_revenue,
+        'laba_rata_rata': expected_profit,
+        var_column: expected_profit - quantile,
+        'peluang_rugi_persen': simulated['below'] / n_paths * 100
+    }, index=params.index).round(2)
+
+    histograms = {region: sketch_histogram(simulated, i, cost[i], bins) for i, region in enumerate(params.index)}
+    return {'summary': summary, 'histograms': histograms, 'var_column': var_column}
+
+
+def risk_columns(df, index):
+    """
+    Kolom VaR dan peluang rugi (parameter bawaan) yang diselaraskan dengan
+    indeks wilayah, untuk ditambahkan ke tabel rekomendasi.
+    """
+    result = revenue_risk(df)
+    columns = result['summary'][[result['var_column'], 'peluang_rugi_persen']]
+    return columns.reindex(pd.Index(index).astype(str)).set_axis(index)
+
+
+@st.fragment
+def show_revenue_risk(df, key='montecarlo'):
+    """
+    Bagian "Simulasi Monte Carlo": jumlah jalur, seed, dan rasio biaya dapat
+    diatur; menampilkan VaR, peluang rugi, dan distribusi laba per wilayah.
+    """
+    st.subheader("Simulasi Monte Carlo Risiko Pendapatan")
+    col1, col2, col3 = st.columns(3)
+    n_paths = col1.select_slider("Jumlah jalur", [10_000, 50_000, 100_000, 250_000, 500_000],
+                                 value=N_PATHS, key=f"{key}_jalur")
+    seed = col2.number_input("Seed", 0, 2 ** 32 - 1, SEED, key=f"{key}_seed")
+    cost_ratio = col3.slider("Biaya / pendapatan historis", 0.0, 1.5, COST_RATIO, step=0.05, key=f"{key}_biaya")
+
+    result = revenue_risk(df, n_paths, int(seed), cost_ratio)
+    summary = result['summary']
+    st.write(f"Hasil {format_number(n_paths)} jalur per wilayah (laba = harga x produksi - biaya, "
+             f"VaR {round(CONFIDENCE * 100)}% relatif terhadap laba rata-rata):")
+    show_table(summary.sort_values('peluang_rugi_persen', ascending=False), key=f"{key}_summary")
+
+    region = st.selectbox("Distribusi laba untuk wilayah:", list(summary.index), key=f"{key}_wilayah")
+    fig = px.bar(result['histograms'][region], x='laba', y='jumlah_jalur',
+                 title=f'Distribusi Laba Simulasi - {region}')
+    fig.update_layout(xaxis_title='Laba', yaxis_title='Jumlah Jalur', bargap=0)
+    st.plotly_chart(fig, key=f"{key}_histogram")
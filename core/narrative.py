@@ -0,0 +1,168 @@
+import numpy as np
+
+# Penyusun kalimat kesimpulan dari hasil agregasi.
+#
+# Fungsi-fungsi di sini hanya merangkai kalimat dari Series/nilai yang sudah
+# dihitung (puncak, peringkat, perubahan tahunan, korelasi), sehingga teks
+# kesimpulan di dashboard selalu sesuai dengan data terbaru. Angka ditulis
+# dengan format Indonesia (titik pemisah ribuan, koma desimal).
+
+ORDINALS = {1: 'pertama', 2: 'kedua', 3: 'ketiga'}
+
+
+def format_number(value, decimals=0):
+    text = f"{value:,.{decimals}f}"
+    return text.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def format_rupiah(value, decimals=0):
+    return f"Rp {format_number(value, decimals)}"
+
+
+def format_percent(value, decimals=1):
+    return f"{format_number(value, decimals)}%"
+
+
+def unit_formatter(unit, decimals=0):
+    """
+    Mengembalikan formatter angka dengan satuan, misalnya unit_formatter('kg').
+    """
+    if unit == 'Rp':
+        return lambda value: format_rupiah(value, decimals)
+    if unit == '%':
+        return lambda value: format_percent(value, decimals)
+    return lambda value: f"{format_number(value, decimals)} {unit}".strip()
+
+
+def ordinal(rank):
+    return ORDINALS.get(rank, f"ke-{rank}")
+
+
+def unavailable(subject):
+    """
+    Kalimat netral untuk data yang kosong, misalnya saat filter tidak
+    menyisakan baris.
+    """
+    return f"Data {subject[:1].lower()}{subject[1:]} belum tersedia."
+
+
+def join_words(words):
+    words = [str(word) for word in words]
+    if len(words) <= 1:
+        return ''.join(words)
+    return f"{', '.join(words[:-1])} dan {words[-1]}"
+
+
+def describe_extremes(series, subject, where='', fmt=format_number):
+    """
+    "<subject> tertinggi terjadi pada <where><maks> (...), sedangkan terendah
+    pada <where><min> (...)."
+    """
+    series = series.dropna()
+    if series.empty:
+        return unavailable(subject)
+    high, low = series.idxmax(), series.idxmin()
+    return (f"{subject} tertinggi terjadi pada {where}{high} ({fmt(series[high])}), "
+            f"sedangkan terendah pada {where}{low} ({fmt(series[low])}).")
+
+
+def describe_change(series, subject, significant=10):
+    """
+    Perubahan nilai periode terakhir terhadap periode sebelumnya.
+    """
+    series = series.dropna()
+    if len(series) < 2:
+        return f"Data {subject} belum cukup untuk melihat perubahan tahunan."
+    last, previous = series.index[-1], series.index[-2]
+    if series.iloc[-2] == 0:
+        return f"Pada tahun {previous}, {subject} bernilai nol sehingga perubahan tahunan tidak dapat dihitung."
+    change = (series.iloc[-1] - series.iloc[-2]) / series.iloc[-2] * 100
+    if abs(change) < 1:
+        return f"Pada tahun {last}, {subject} relatif stabil dibanding tahun {previous}."
+    direction = 'meningkat' if change > 0 else 'menurun'
+    if abs(change) >= significant:
+        direction += ' signifikan'
+    return (f"Pada tahun {last}, {subject} {direction} sebesar "
+            f"{format_percent(abs(change))} dibanding tahun {previous}.")
+
+
+def describe_slope(series, subject, fmt=format_number):
+    """
+    Arah tren linear (kemiringan garis regresi) sepanjang periode.
+    """
+    series = series.dropna()
+    if len(series) < 2:
+        return f"Data {subject} belum cukup untuk melihat tren."
+    slope = np.polyfit(series.index.astype(float), series.to_numpy(dtype=float), 1)[0]
+    direction = 'meningkat' if slope > 0 else 'menurun'
+    return f"Secara keseluruhan, tren {subject} {direction} rata-rata {fmt(abs(slope))} per tahun."
+
+
+def describe_ranking(series, subject, n=3, fmt=format_number):
+    """
+    "<pertama> memimpin <subject> (...), diikuti oleh <kedua> (...) dan ..."
+    """
+    top = series.dropna().sort_values(ascending=False).head(n)
+    if top.empty:
+        return unavailable(subject)
+    leader = f"{top.index[0]} memimpin {subject} ({fmt(top.iloc[0])})"
+    if len(top) == 1:
+        return f"{leader}."
+    followers = [f"{name} ({fmt(value)})" for name, value in top.iloc[1:].items()]
+    return f"{leader}, diikuti oleh {join_words(followers)}."
+
+
+def describe_position(series, item, subject, fmt=format_number, group='wilayah'):
+    """
+    Peringkat satu item (misalnya satu wilayah) di antara seluruh item.
+    """
+    ranked = series.dropna().sort_values(ascending=False)
+    if item not in ranked.index:
+        return f"Data {subject} untuk {item} tidak tersedia."
+    rank = ranked.index.get_loc(item) + 1
+    return (f"{item} menempati peringkat {ordinal(rank)} dari {len(ranked)} {group} "
+            f"untuk {subject} ({fmt(ranked[item])}).")
+
+
+def describe_share(counts, subject, where=''):
+    """
+    Kategori yang paling dominan beserta porsinya dari seluruh data.
+    """
+    counts = counts.sort_values(ascending=False)
+    if counts.sum() == 0:
+        return unavailable(subject)
+    share = counts.iloc[0] / counts.sum() * 100
+    return (f"{subject} didominasi oleh {where}{counts.index[0]} "
+            f"({format_percent(share)} dari {format_number(counts.sum())} data).")
+
+
+def correlation_strength(value):
+    magnitude = abs(value)
+    if magnitude < 0.2:
+        return 'sangat lemah'
+    if magnitude < 0.4:
+        return 'lemah'
+    if magnitude < 0.6:
+        return 'sedang'
+    if magnitude < 0.8:
+        return 'kuat'
+    return 'sangat kuat'
+
+
+def describe_correlation(value, first, second):
+    if np.isnan(value):
+        return f"Korelasi antara {first} dan {second} tidak dapat dihitung dari data yang tersedia."
+    direction = 'positif' if value >= 0 else 'negatif'
+    return (f"Korelasi antara {first} dan {second} {correlation_strength(value)} "
+            f"dan {direction} ({format_number(value, 3)}).")
+
+
+def bullet_list(sentences):
+    return '\n'.join(f"- {sentence}" for sentence in sentences)
+
+
+def conclusion_text(sentences, title='Kesimpulan'):
+    """
+    Teks markdown "**Kesimpulan:**" diikuti daftar kalimat.
+    """
+    return f"**{title}:**\n{bullet_list(sentences)}"
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+# Statistik robust dan deteksi outlier per wilayah.
+#
+# Median, kuartil, dan MAD setiap kolom dihitung per wilayah dalam satu
+# np.lexsort (kelompok, nilai) untuk seluruh wilayah sekaligus, tanpa
+# perulangan per kelompok. Baris di luar pagar Tukey (Q1 - 1.5 IQR,
+# Q3 + 1.5 IQR) wilayahnya ditandai sebagai outlier. Hasilnya dihitung sekali
+# per versi dataset (lihat core/cache.py), sehingga sakelar "Kecualikan
+# outlier" cukup memilih dataset yang sudah difilter.
+
+COLUMNS = ('produksi_pertahun', 'harga')
+IQR_FACTOR = 1.5
+
+
+def group_quantiles(codes, values, n_groups, quantiles):
+    """
+    Array (kuantil, kelompok) dengan interpolasi linear seperti
+    Series.quantile. Kode negatif dan NaN diabaikan; kelompok kosong NaN.
+    """
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes = codes[valid]
+    values = values[valid]
+    sorted_values = values[np.lexsort((values, codes))]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    present = counts > 0
+
+    result = np.full((len(quantiles), n_groups), np.nan)
+    for i, quantile in enumerate(quantiles):
+        position = starts[present] + quantile * (counts[present] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        fraction = position - lower
+        result[i, present] = sorted_values[lower] * (1 - fraction) + sorted_values[upper] * fraction
+    return result
+
+
+def robust_pass(df, columns=COLUMNS, by='wilayah', factor=IQR_FACTOR):
+    """
+    Statistik robust per kelompok (median, MAD, Q1, Q3, batas pagar, dan
+    jumlah outlier setiap kolom) serta mask baris outlier (True bila salah
+    satu kolom berada di luar pagar IQR kelompoknya).
+    """
+    groups = df[by].astype('category')
+    codes = groups.cat.codes.to_numpy().astype(np.int64)
+    n_groups = len(groups.cat.categories)
+    known = codes >= 0
+
+    stats = {}
+    outliers = np.zeros(len(df), dtype=bool)
+    per_column = {}
+    for column in columns:
+        values = df[column].to_numpy(dtype=np.float64)
+        q1, median, q3 = group_quantiles(codes, values, n_groups, (0.25, 0.5, 0.75))
+        deviation = np.abs(values - np.where(known, median[codes.clip(0)], np.nan))
+        mad = group_quantiles(codes, deviation, n_groups, (0.5,))[0]
+        iqr = q3 - q1
+        lower = q1 - factor * iqr
+        upper = q3 + factor * iqr
+
+        row_lower = np.where(known, lower[codes.clip(0)], -np.inf)
+        row_upper = np.where(known, upper[codes.clip(0)], np.inf)
+        flagged = (values < row_lower) | (values > row_upper)
+        outliers |= flagged
+        per_column[column] = int(flagged.sum())
+
+        stats[(column, 'median')] = median
+        stats[(column, 'mad')] = mad
+        stats[(column, 'q1')] = q1
+        stats[(column, 'q3')] = q3
+        stats[(column, 'batas_bawah')] = lower
+        stats[(column, 'batas_atas')] = upper
+        stats[(column, 'outlier')] = np.bincount(codes[flagged & known], minlength=n_groups)
+
+    index = pd.Index(groups.cat.categories, name=by)
+    return {
+        'stats': pd.DataFrame(stats, index=index).round(2),
+        'outliers': outliers,
+        'total': int(outliers.sum()),
+        'per_kolom': per_column,
+    }
@@ -0,0 +1,379 @@
+import argparse
+import hashlib
+import importlib
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from core.apptest import DASHBOARDS, MENU_LABEL, SUBMENU_LABEL, DashboardRun
+from core.binary_store import convert, is_stale
+from core.catalog import DATASETS
+from core.schema import SCHEMAS
+
+# Uji regresi tampilan dan kinerja dashboard tanpa browser.
+#
+# Setiap dashboard dijalankan dengan streamlit.testing AppTest, termasuk semua
+# kombinasi menu dan submenu Padi. Data yang dipakai adalah data/*.csv bawaan
+# atau dataset sintetis besar yang dibangkitkan dari data bawaan (baris
+# diambil ulang dengan seed tetap, tahun diperpanjang, angka diberi derau, dan
+# sebagian baris dipindah ke wilayah sintetis yang jumlahnya bertambah dari
+# tahun ke tahun). Untuk setiap halaman dicatat waktu render (tercepat dari
+# beberapa ulangan setelah cache dikosongkan), jumlah elemen, serta kolom,
+# jumlah baris, jumlah per kolom angka, dan checksum label serta kolom teks
+# setiap tabel. Puncak alokasi memori diukur di ulangan terpisah dengan
+# tracemalloc, agar pelacakan alokasi tidak ikut memperlambat waktu render;
+# tracemalloc hanya melihat proses utama, sehingga memori pekerja pool
+# rendering grafik tidak terhitung. Hasilnya dibandingkan dengan baseline yang
+# disimpan; halaman yang gagal, tabelnya berubah, lebih lambat dari toleransi,
+# atau belum punya baseline membuat perintah keluar dengan status 1. Baseline
+# hanya dibuat atau diperbarui dengan --update-baseline.
+#
+#   python -m core.perfcheck --update-baseline
+#   python -m core.perfcheck
+#   python -m core.perfcheck --data sintetis --rows 50000 --tolerance 30
+
+BASELINE = 'perf_baseline.json'
+BUNDLED = 'bawaan'
+SYNTHETIC = 'sintetis'
+
+# Toleransi perlambatan (persen) dan kenaikan memori (persen) terhadap baseline
+TOLERANCE = 25
+MEMORY_TOLERANCE = 25
+# Selisih absolut di bawah batas ini diabaikan agar halaman yang sangat cepat
+# tidak gagal karena derau pengukuran
+MIN_SLOWDOWN = 0.25
+MIN_MEMORY_GROWTH = 5.0
+
+REPEAT = 3
+SYNTHETIC_ROWS = 20_000
+SYNTHETIC_YEARS = 30
+# Satu wilayah sintetis per REGION_ROWS baris; SYNTHETIC_REGION_SHARE baris
+# dipindah ke wilayah sintetis
+REGION_ROWS = 100
+SYNTHETIC_REGION_SHARE = 0.5
+SEED = 42
+
+# Toleransi relatif jumlah kolom angka tabel terhadap baseline
+VALUE_TOLERANCE = 1e-6
+
+# Jenis elemen yang dihitung per halaman
+ELEMENTS = ('dataframe', 'table', 'plotly_chart', 'image', 'metric', 'error', 'warning')
+MB = 1024 * 1024
+# Pembulatan hasil pengukuran per jenis
+ROUNDING = {'detik': 3, 'memori_mb': 1}
+
+logger = logging.getLogger(__name__)
+
+
+def synthetic_dataset(df, schema, rows=SYNTHETIC_ROWS, years=SYNTHETIC_YEARS, seed=SEED):
+    """
+    Dataset sintetis sebesar `rows` baris dari baris data asli yang diambil
+    ulang: tahun disebar ke `years` tahun terakhir, angka jumlah dan harga
+    dikalikan derau log-normal, dan skor serta kolom bertingkat tetap.
+    Sebagian baris dipindah ke rows // REGION_ROWS wilayah sintetis (di luar
+    tabel kode wilayah); wilayah baru muncul bertahap sehingga jumlah wilayah
+    bertambah setiap tahun.
+    """
+    rng = np.random.default_rng(seed)
+    result = df.iloc[rng.integers(0, len(df), rows)].reset_index(drop=True)
+    last_year = int(df['tahun'].max())
+    first_year = last_year - years + 1
+    result['tahun'] = rng.integers(first_year, last_year + 1, rows)
+
+    regions = rows // REGION_ROWS
+    moved = np.flatnonzero(rng.random(rows) < SYNTHETIC_REGION_SHARE)
+    if regions > 0 and len(moved):
+        # Tahun ke-k hanya memakai wilayah sintetis yang sudah "ada" pada tahun itu
+        available = np.ceil(regions * (result['tahun'].to_numpy()[moved] - first_year + 1) / years).astype(np.int64)
+        index = (rng.random(len(moved)) * available).astype(np.int64)
+        result['wilayah'] = result['wilayah'].astype(object)
+        result.loc[moved, 'wilayah'] = [f"Desa Sintetis {i + 1:05d}" for i in index]
+    for name, column in schema.items():
+        if name == 'tahun' or column.kind != 'int' or column.max is not None:
+            continue
+        noise = rng.lognormal(0.0, 0.1, rows)
+        result[name] = np.maximum(np.round(result[name].to_numpy(dtype=np.float64) * noise), column.min).astype(np.int64)
+    return result.sort_values(['tahun', 'wilayah'], kind='stable')
+
+
+def write_synthetic(root, target, rows=SYNTHETIC_ROWS):
+    """
+    Menulis versi sintetis setiap data/<komoditas>.csv ke target/data.
+    """
+    os.makedirs(os.path.join(target, 'data'), exist_ok=True)
+    for commodity, path in DATASETS.items():
+        source = pd.read_csv(os.path.join(root, path))
+        synthetic_dataset(source, SCHEMAS[commodity], rows).to_csv(os.path.join(target, path), index=False)
+
+
+def _checksum(frame):
+    # Hash label baris dan kolom selain angka (teks yang sudah diformat,
+    # kategori, tanggal)
+    digest = hashlib.sha256(pd.util.hash_pandas_object(frame.index.astype(str), index=False).values.tobytes())
+    for column in frame.columns:
+        digest.update(pd.util.hash_pandas_object(frame[column].astype(str), index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def table_record(frame):
+    """
+    Ringkasan satu tabel untuk baseline: kolom, jumlah baris, jumlah setiap
+    kolom angka, dan checksum label serta kolom lain.
+    """
+    numeric = frame.select_dtypes('number')
+    return {
+        'kolom': [str(column) for column in frame.columns],
+        'baris': len(frame),
+        'jumlah': {str(column): float(numeric.iloc[:, i].sum()) for i, column in enumerate(numeric.columns)},
+        'checksum': _checksum(frame.drop(columns=numeric.columns)),
+    }
+
+
+def table_changes(page, base, tolerance=VALUE_TOLERANCE):
+    """
+    Daftar perubahan tabel halaman terhadap baseline: kolom, jumlah baris, dan
+    checksum harus sama persis; jumlah kolom angka boleh berbeda sebesar
+    toleransi relatif.
+    """
+    if len(page) != len(base):
+        return [f"jumlah tabel berubah {len(base)} -> {len(page)}"]
+    changes = []
+    for position, (table, expected) in enumerate(zip(page, base), 1):
+        if table['kolom'] != expected['kolom'] or table['baris'] != expected['baris']:
+            changes.append(f"tabel {position}: kolom atau jumlah baris berubah")
+        elif table['checksum'] != expected.get('checksum'):
+            changes.append(f"tabel {position}: isi label atau teks berubah")
+        else:
+            sums = expected.get('jumlah', {})
+            changed = [column for column, value in table['jumlah'].items()
+                       if column not in sums or not np.isclose(value, sums[column], rtol=tolerance, equal_nan=True)]
+            if changed or set(sums) - set(table['jumlah']):
+                changes.append(f"tabel {position}: nilai berubah ({', '.join(changed) or 'kolom angka'})")
+    return changes
+
+
+def _page_records(app):
+    # Ringkasan halaman yang dibandingkan dengan baseline
+    elements = {kind: len(app.get(kind)) for kind in ELEMENTS}
+    tables = [table_record(element.value) for kind in ('dataframe', 'table') for element in app.get(kind)]
+    errors = [str(exception.value) for exception in app.exception]
+    return elements, tables, errors
+
+
+class _Run(DashboardRun):
+    def measure(self, select=None):
+        # Waktu satu rerun, atau puncak alokasinya (MB) bila tracemalloc aktif;
+        # select mengubah widget dulu
+        if select is not None:
+            select()
+        if not tracemalloc.is_tracing():
+            started = time.perf_counter()
+            self.app.run()
+            return time.perf_counter() - started
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        self.app.run()
+        return (tracemalloc.get_traced_memory()[1] - current) / MB
+
+
+def run_dashboard(slug, root, field='detik'):
+    """
+    Menjalankan satu dashboard di semua kombinasi menu dan submenu, dan
+    mengembalikan dict nama halaman -> hasil. Pengukuran disimpan di `field`
+    ('detik', atau 'memori_mb' bila tracemalloc aktif).
+    """
+    module = DASHBOARDS[slug][1]
+    run = _Run(module, root)
+    pages = {}
+
+    def record(name, measured):
+        elements, tables, errors = _page_records(run.app)
+        pages[name] = {field: round(measured, ROUNDING[field]),
+                       'elemen': elements, 'tabel': tables, 'kesalahan': errors}
+
+    first = run.measure()
+    menus = run.options('selectbox', MENU_LABEL, sidebar=True)
+    for index, menu in enumerate(menus):
+        measured = first if index == 0 else run.measure(
+            lambda: run.widget('selectbox', MENU_LABEL, sidebar=True).select(menu))
+        submenus = run.options('radio', SUBMENU_LABEL)
+        for position, submenu in enumerate(submenus):
+            if position > 0:
+                measured = run.measure(lambda: run.widget('radio', SUBMENU_LABEL).set_value(submenu))
+            record(' / '.join(part for part in (slug, menu, submenu) if part), measured)
+    return pages
+
+
+def run_pages(slugs, root, repeat=REPEAT):
+    """
+    Hasil semua halaman dashboard `slugs`. Waktu diambil yang tercepat dari
+    `repeat` ulangan tanpa tracemalloc, dan memori dari satu ulangan terpisah
+    dengan tracemalloc; setiap ulangan dimulai dengan cache kosong.
+    """
+    from core.memory import governor
+    from core.rendering import start_pool
+
+    # Impor modul dan start pool tidak dihitung ke halaman pertama
+    for _, module in DASHBOARDS.values():
+        importlib.import_module(f"dashboards.{module}")
+    for path in DATASETS.values():
+        if is_stale(path):
+            convert(path)
+    start_pool()
+
+    results = {}
+    for attempt in range(repeat):
+        governor.clear()
+        for slug in slugs:
+            logger.info("Ulangan %d/%d: %s", attempt + 1, repeat, slug)
+            for name, page in run_dashboard(slug, root).items():
+                best = results.setdefault(name, page)
+                best['detik'] = min(best['detik'], page['detik'])
+                best['kesalahan'] = best['kesalahan'] or page['kesalahan']
+
+    governor.clear()
+    tracemalloc.start()
+    try:
+        for slug in slugs:
+            logger.info("Ulangan memori: %s", slug)
+            for name, page in run_dashboard(slug, root, 'memori_mb').items():
+                if name in results:
+                    results[name]['memori_mb'] = page['memori_mb']
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """
+    Tabel perbandingan per halaman dan daftar kegagalan (kesalahan render,
+    perubahan elemen atau tabel, perlambatan, dan kenaikan memori).
+    """
+    failures = []
+    rows = []
+    for name in sorted(set(results) | set(baseline)):
+        page, base = results.get(name), baseline.get(name)
+        if page is None:
+            failures.append(f"{name}: halaman tidak lagi dirender")
+            continue
+        row = {'halaman': name, 'detik': page['detik'], 'memori_mb': page['memori_mb'], 'status': 'ok'}
+        problems = [f"error: {error}" for error in page['kesalahan']]
+        if base is not None:
+            row['detik_baseline'] = base['detik']
+            row['memori_baseline_mb'] = base['memori_mb']
+            if page['elemen'] != base['elemen']:
+                changed = {kind: f"{base['elemen'].get(kind)} -> {count}"
+                           for kind, count in page['elemen'].items() if base['elemen'].get(kind) != count}
+                problems.append(f"jumlah elemen berubah {changed}")
+            problems.extend(table_changes(page['tabel'], base['tabel']))
+            slowdown = page['detik'] - base['detik']
+            if slowdown > MIN_SLOWDOWN and page['detik'] > base['detik'] * (1 + tolerance / 100):
+                problems.append(f"{slowdown / base['detik'] * 100:.0f}% lebih lambat "
+                                f"({base['detik']:.2f} -> {page['detik']:.2f} detik)")
+            growth = page['memori_mb'] - base['memori_mb']
+            if growth > MIN_MEMORY_GROWTH and page['memori_mb'] > base['memori_mb'] * (1 + memory_tolerance / 100):
+                problems.append(f"memori naik {base['memori_mb']:.1f} -> {page['memori_mb']:.1f} MB")
+        else:
+            row['status'] = 'baru'
+        if problems:
+            row['status'] = 'GAGAL'
+            failures.extend(f"{name}: {problem}" for problem in problems)
+        rows.append(row)
+    table = pd.DataFrame(rows).set_index('halaman') if rows else pd.DataFrame()
+    return table, failures
+
+
+def read_baseline(path=BASELINE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_baseline(baselines, path=BASELINE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, ensure_ascii=False)
+
+
+def _measure(mode, slugs, root, rows, repeat):
+    if mode == BUNDLED:
+        return run_pages(slugs, root, repeat)
+    # Dataset sintetis ditulis ke direktori sementara yang dijadikan direktori
+    # kerja, karena data/ dibaca relatif terhadap direktori kerja
+    workdir = tempfile.mkdtemp(prefix='perfcheck-')
+    previous = os.getcwd()
+    try:
+        write_synthetic(root, workdir, rows)
+        os.chdir(workdir)
+        return run_pages(slugs, root, repeat)
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji regresi dan kinerja dashboard tanpa browser")
+    parser.add_argument('--data', choices=(BUNDLED, SYNTHETIC, 'semua'), default=BUNDLED,
+                        help="data bawaan, dataset sintetis besar, atau keduanya")
+    parser.add_argument('--rows', type=int, default=SYNTHETIC_ROWS, help="jumlah baris per dataset sintetis")
+    parser.add_argument('--dashboard', action='append', choices=list(DASHBOARDS),
+                        help="hanya dashboard ini (boleh diulang)")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="jumlah ulangan per halaman")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="batas perlambatan (persen)")
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE,
+                        help="batas kenaikan memori (persen)")
+    parser.add_argument('--baseline', default=BASELINE, help="file baseline JSON")
+    parser.add_argument('--update-baseline', action='store_true', help="simpan hasil sebagai baseline baru")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    # Peringatan runtime Streamlit dari dekorator cache tidak relevan di sini
+    from streamlit.logger import set_log_level
+    set_log_level('error')
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    slugs = args.dashboard or list(DASHBOARDS)
+    modes = (BUNDLED, SYNTHETIC) if args.data == 'semua' else (args.data,)
+    baselines = read_baseline(args.baseline)
+
+    failed = False
+    for mode in modes:
+        key = mode if mode == BUNDLED else f"{mode}-{args.rows}"
+        results = _measure(mode, slugs, root, args.rows, args.repeat)
+        stored = baselines.get(key, {}).get('halaman', {})
+        # Halaman dashboard yang tidak dijalankan tidak dibandingkan
+        stored = {name: page for name, page in stored.items() if name.split(' / ')[0] in slugs}
+        table, failures = compare(results, stored, args.tolerance, args.memory_tolerance)
+
+        print(f"\n== {key} ==")
+        with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 250,
+                               'display.max_colwidth', 70):
+            print(table)
+        if args.update_baseline:
+            entry = baselines.setdefault(key, {'halaman': {}})
+            entry['halaman'].update(results)
+            entry.update({'dibuat': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': platform.python_version(),
+                          'mesin': platform.machine(), 'cpu': os.cpu_count()})
+            write_baseline(baselines, args.baseline)
+            print(f"Baseline {key} disimpan di {args.baseline}")
+            failures = [failure for failure in failures if 'error:' in failure]
+        elif key not in baselines:
+            failures.append(f"baseline {key} tidak ada di {args.baseline}; buat dengan --update-baseline")
+        for failure in failures:
+            print(f"GAGAL {failure}")
+        failed |= bool(failures)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
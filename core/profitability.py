@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from core.cache import versioned_cache
+from core.narrative import format_number
+
+# Model profitabilitas peternakan ayam petelur.
+#
+# Setiap wilayah dievaluasi pada grid skenario harga x biaya pakan x tingkat
+# utilisasi kandang dalam satu operasi broadcast NumPy berbentuk
+# (wilayah, harga, pakan, utilisasi). Kapasitas kandang, kondisi kandang, dan
+# ketersediaan pakan setiap wilayah diambil dari rata-rata datanya.
+
+# Parameter biaya bawaan; semuanya dapat diubah dari dashboard
+DEFAULT_COSTS = {
+    'hasil_per_kapasitas': 150.0,           # kg telur per unit kapasitas per tahun pada utilisasi 100%
+    'rasio_konversi_pakan': 2.2,            # kg pakan per kg telur
+    'biaya_tenaga_kerja_per_kg': 1500.0,    # Rp per kg telur
+    'biaya_tetap_per_kapasitas': 750000.0,  # Rp per unit kapasitas per tahun
+}
+
+# Tambahan biaya pakan menurut ketersediaan pakan (rendah, sedang, tinggi)
+FEED_PREMIUM = (1.25, 1.10, 1.00)
+
+# Faktor produktivitas menurut kondisi kandang (skala 1-10)
+HOUSING_FACTOR_MIN = 0.75
+HOUSING_FACTOR_MAX = 1.0
+
+
+# Fungsi untuk menyiapkan input model per wilayah (di-cache per versi dataset)
+@versioned_cache
+def region_inputs(df):
+    inputs = pd.DataFrame({
+        'harga': df['harga'].astype(np.float64),
+        'kapasitas_kandang': df['kapasitas_kandang'].astype(np.float64),
+        'kondisi_kandang': df['kondisi_kandang'].astype(np.float64),
+        'ketersediaan_pakan': df['ketersediaan_pakan'].cat.codes.where(df['ketersediaan_pakan'].notna())
+    })
+    inputs = inputs.groupby(df['wilayah'].astype(str)).mean()
+    inputs['premi_pakan'] = np.interp(inputs['ketersediaan_pakan'], [0, 1, 2], FEED_PREMIUM)
+    inputs['faktor_kandang'] = np.interp(inputs['kondisi_kandang'], [1, 10],
+                                         [HOUSING_FACTOR_MIN, HOUSING_FACTOR_MAX])
+    return inputs
+
+
+def simulate_profit(inputs, price_factors, feed_costs, utilizations, costs=None):
+    """
+    Laba tahunan (Rp) untuk setiap kombinasi wilayah x faktor harga x biaya
+    pakan (Rp/kg) x utilisasi kandang, sebagai array 4 dimensi.
+    """
+    costs = {**DEFAULT_COSTS, **(costs or {})}
+
+    def column(name):
+        # Nilai per wilayah di sumbu pertama
+        return inputs[name].to_numpy(dtype=np.float64)[:, None, None, None]
+
+    price = column('harga') * np.asarray(price_factors, dtype=np.float64)[None, :, None, None]
+    feed_cost = column('premi_pakan') * np.asarray(feed_costs, dtype=np.float64)[None, None, :, None]
+    utilization = np.asarray(utilizations, dtype=np.float64)[None, None, None, :]
+
+    capacity = column('kapasitas_kandang')
+    production = capacity * costs['hasil_per_kapasitas'] * column('faktor_kandang') * utilization
+    variable_cost = feed_cost * costs['rasio_konversi_pakan'] + costs['biaya_tenaga_kerja_per_kg']
+    fixed_cost = capacity * costs['biaya_tetap_per_kapasitas']
+    return production * (price - variable_cost) - fixed_cost
+
+
+def summarize_profit(inputs, profit):
+    """
+    Ringkasan distribusi laba per wilayah: rata-rata, persentil 5/50/95, dan
+    peluang rugi.
+    """
+    flat = profit.reshape(len(inputs), -1)
+    p5, p50, p95 = np.percentile(flat, [5, 50, 95], axis=1)
+    return pd.DataFrame({
+        'rata_rata': flat.mean(axis=1),
+        'p5': p5,
+        'median': p50,
+        'p95': p95,
+        'peluang_rugi_persen': (flat < 0).mean(axis=1) * 100
+    }, index=inputs.index).round(0)
+
+
+@st.fragment
+def show_profitability(df, default_region='Kabupaten Pulau Morotai', key='profit'):
+    """
+    Bagian "Simulasi Profitabilitas": slider parameter biaya dan rentang
+    skenario, distribusi laba per wilayah, dan histogram wilayah terpilih.
+    """
+    inputs = region_inputs(df)
+    st.subheader("Simulasi Profitabilitas per Wilayah")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        price_range = st.slider("Perubahan harga (%)", -50, 50, (-20, 20), key=f"{key}_harga")
+        feed_range = st.slider("Biaya pakan (Rp/kg)", 3000, 15000, (6000, 9000), step=250, key=f"{key}_pakan")
+        utilization_range = st.slider("Utilisasi kandang (%)", 10, 100, (50, 95), key=f"{key}_utilisasi")
+        steps = st.slider("Jumlah titik per dimensi skenario", 5, 40, 20, key=f"{key}_titik")
+    with col2:
+        costs = {
+            'hasil_per_kapasitas': st.number_input(
+                "Hasil per unit kapasitas (kg/tahun)", 10.0, 1000.0, DEFAULT_COSTS['hasil_per_kapasitas'], key=f"{key}_hasil"),
+            'rasio_konversi_pakan': st.number_input(
+                "Rasio konversi pakan (kg pakan/kg telur)", 1.0, 5.0, DEFAULT_COSTS['rasio_konversi_pakan'], step=0.1, key=f"{key}_fcr"),
+            'biaya_tenaga_kerja_per_kg': st.number_input(
+                "Biaya tenaga kerja (Rp/kg)", 0.0, 20000.0, DEFAULT_COSTS['biaya_tenaga_kerja_per_kg'], step=100.0, key=f"{key}_tenaga"),
+            'biaya_tetap_per_kapasitas': st.number_input(
+                "Biaya tetap per unit kapasitas (Rp/tahun)", 0.0, 10000000.0, DEFAULT_COSTS['biaya_tetap_per_kapasitas'], step=50000.0, key=f"{key}_tetap"),
+        }
+
+    price_factors = 1 + np.linspace(*price_range, steps) / 100
+    feed_costs = np.linspace(*feed_range, steps)
+    utilizations = np.linspace(*utilization_range, steps) / 100
+    profit = simulate_profit(inputs, price_factors, feed_costs, utilizations, costs)
+    summary = summarize_profit(inputs, profit)
+
+    st.write(f"Distribusi laba tahunan (Rp) dari {format_number(steps ** 3)} skenario per wilayah:")
+    st.dataframe(summary.sort_values('median', ascending=False))
+
+    fan = summary.reset_index()
+    fig = px.bar(fan, x=fan.columns[0], y='median',
+                 error_y=fan['p95'] - fan['median'], error_y_minus=fan['median'] - fan['p5'],
+                 title='Median Laba per Wilayah (batang galat: persentil 5-95)')
+    fig.update_layout(xaxis_title='Wilayah', yaxis_title='Laba (Rp/tahun)')
+    st.plotly_chart(fig, key=f"{key}_fan")
+
+    regions = list(inputs.index)
+    index = regions.index(default_region) if default_region in regions else 0
+    region = st.selectbox("Distribusi laba untuk wilayah:", regions, index=index, key=f"{key}_wilayah")
+    counts, edges = np.histogram(profit[regions.index(region)].ravel(), bins=40)
+    histogram = pd.DataFrame({'laba': (edges[:-1] + edges[1:]) / 2, 'jumlah_skenario': counts})
+    fig = px.bar(histogram, x='laba', y='jumlah_skenario', title=f'Distribusi Laba Skenario - {region}')
+    fig.update_layout(xaxis_title='Laba (Rp/tahun)', yaxis_title='Jumlah Skenario', bargap=0)
+    st.plotly_chart(fig, key=f"{key}_histogram")
@@ -0,0 +1,171 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+import streamlit as st
+
+from core.cache import FIGURES, dataset_for_key, dataset_key, versioned_cache
+
+# Rendering grafik matplotlib secara paralel.
+#
+# Grafik dideskripsikan sebagai spesifikasi (builder, *argumen), dengan builder
+# berupa fungsi tingkat modul yang mengembalikan matplotlib Figure. Spesifikasi
+# dikirim ke pool proses pekerja yang memakai backend Agg, lalu setiap pekerja
+# mengembalikan PNG. Latensi satu halaman menjadi sebesar grafik paling lambat,
+# bukan jumlah seluruh grafik.
+#
+# Dataset yang dimuat lewat load_dataset tidak dikirim (di-pickle) ke pekerja;
+# yang dikirim hanya kuncinya ('komoditas:versi'), dan pekerja memuat dataset
+# itu sekali per versi dari format biner. Bila versi tersebut sudah diganti
+# saat pekerja memuatnya, grafik dirender ulang dengan DataFrame-nya langsung.
+# DataFrame lain (hasil filter) tetap dikirim apa adanya.
+
+# Jumlah proses pekerja dapat diatur dengan variabel lingkungan RENDER_WORKERS
+MAX_WORKERS = int(os.environ.get('RENDER_WORKERS', os.cpu_count() or 1))
+
+# Pengaturan yang sama dengan st.pyplot agar tampilan grafik tidak berubah
+SAVEFIG_KWARGS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Thread pembantu hanya menunggu hasil pool proses (tanpa konteks sesi
+# Streamlit), sehingga jumlahnya boleh lebih banyak dari jumlah grafik dalam
+# satu halaman
+_threads = ThreadPoolExecutor(max_workers=32, thread_name_prefix='render')
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+    # Fungsi ber-cache Streamlit di pekerja berjalan tanpa runtime
+    from streamlit.logger import set_log_level
+    set_log_level('error')
+
+
+class StaleDataset(Exception):
+    pass
+
+
+class _DatasetRef:
+    # Pengganti dataset di argumen yang dikirim ke pekerja
+    def __init__(self, key):
+        self.key = key
+
+
+def _resolve(arg):
+    if not isinstance(arg, _DatasetRef):
+        return arg
+    df = dataset_for_key(arg.key)
+    if df is None:
+        raise StaleDataset(arg.key)
+    return df
+
+
+def _reference(arg):
+    key = dataset_key(arg) if isinstance(arg, pd.DataFrame) else None
+    return arg if key is None else _DatasetRef(key)
+
+
+def _render_png(builder, args):
+    import matplotlib.pyplot as plt
+
+    fig = builder(*(_resolve(arg) for arg in args))
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, **SAVEFIG_KWARGS)
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn dipakai karena server Streamlit menjalankan banyak thread
+            _pool = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _render_all(specs):
+    pool = _get_pool()
+    futures = [(pool.submit(_render_png, builder, tuple(_reference(arg) for arg in args)), builder, args)
+               for builder, *args in specs]
+    return [_result(pool, *item) for item in futures]
+
+
+def _result(pool, future, builder, args):
+    try:
+        return future.result()
+    except StaleDataset:
+        return pool.submit(_render_png, builder, tuple(args)).result()
+
+
+def start_pool():
+    """
+    Menyalakan proses pekerja sebelum grafik pertama diminta (dipakai oleh
+    pengukuran kinerja agar waktu start pool tidak dihitung ke halaman).
+    """
+    try:
+        _get_pool().submit(int).result()
+    except BrokenProcessPool:
+        _reset_pool()
+        _get_pool().submit(int).result()
+
+
+def render_figures(specs):
+    """
+    Merender daftar spesifikasi (builder, *argumen) di pool proses dan
+    mengembalikan PNG dalam urutan yang sama dengan spesifikasi.
+    """
+    try:
+        return _render_all(specs)
+    except BrokenProcessPool:
+        # Pekerja mati (misalnya kehabisan memori); coba sekali lagi dengan pool baru
+        _reset_pool()
+        return _render_all(specs)
+
+
+# Fungsi untuk merender satu grafik menjadi PNG (di-cache per grafik dan versi dataset)
+@versioned_cache(tier=FIGURES)
+def render_chart(builder, *args):
+    return render_figures([(builder, *args)])[0]
+
+
+def submit_charts(builders, *args):
+    """
+    Memulai rendering seluruh grafik sekaligus tanpa menunggu hasilnya dan
+    mengembalikan dict builder -> Future berisi PNG. Grafik yang sudah ada di
+    cache langsung selesai; sisanya dirender paralel di pool proses.
+    """
+    # Tugas hanya memakai cache dan pool proses, bukan perintah st.*, sehingga
+    # thread pembantu tidak perlu (dan tidak boleh menyimpan) konteks sesi
+    return {builder: _threads.submit(render_chart, builder, *args) for builder in builders}
+
+
+def show_chart(future):
+    """
+    Menampilkan grafik begitu PNG-nya selesai; selama menunggu, spinner tampil
+    di posisi grafik sehingga konten di atasnya sudah terlihat lebih dulu.
+    """
+    with st.spinner("Menyiapkan grafik..."):
+        png = future.result()
+    st.image(png, width="stretch")
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+# Mesin analisis risiko.
+#
+# Seluruh statistik risiko (koefisien variasi, tercile risiko, matriks produksi
+# wilayah x curah hujan) diturunkan dari satu kali pengelompokan yang hanya
+# menghitung count, sum, dan sum-of-squares per kelompok. State ini dapat
+# digabung (dijumlahkan) sehingga bisa dihitung per potongan data atau per
+# tahun lalu digabung untuk jendela bergulir (rolling_moments), atau diringkas
+# ke level kelompok yang lebih kasar (collapse_moments) tanpa membaca data lagi.
+
+RISK_LABELS = ['Rendah', 'Sedang', 'Tinggi']
+
+
+def _group_codes(df, by):
+    codes = None
+    levels = []
+    for column in by:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            column_codes = values.cat.codes.to_numpy().astype(np.int64)
+            uniques = values.cat.categories
+        else:
+            column_codes, uniques = pd.factorize(values, sort=True)
+            column_codes = column_codes.astype(np.int64)
+        levels.append(pd.Index(uniques, name=column))
+        codes = column_codes if codes is None else codes * len(uniques) + column_codes
+    return codes, levels
+
+
+def grouped_moments(df, by, columns):
+    """
+    Menghitung count, sum, dan sum-of-squares setiap kolom per kelompok dalam
+    satu kali lintasan (np.bincount). Kelompok tanpa data tidak disertakan.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    codes, levels = _group_codes(df, by)
+    n_groups = int(np.prod([len(level) for level in levels]))
+    valid = codes >= 0
+
+    result = {}
+    for column in columns:
+        values = df[column].to_numpy(dtype=np.float64)
+        mask = valid & ~np.isnan(values)
+        column_codes = codes[mask]
+        values = values[mask]
+        result[(column, 'count')] = np.bincount(column_codes, minlength=n_groups).astype(np.float64)
+        result[(column, 'sum')] = np.bincount(column_codes, weights=values, minlength=n_groups)
+        result[(column, 'sumsq')] = np.bincount(column_codes, weights=values * values, minlength=n_groups)
+
+    if len(levels) == 1:
+        index = levels[0]
+    else:
+        index = pd.MultiIndex.from_product(levels)
+    moments = pd.DataFrame(result, index=index)
+    observed = np.bincount(codes[valid], minlength=n_groups) > 0
+    return moments[observed]
+
+
+def merge_moments(*states):
+    """
+    Menggabungkan beberapa state moments (misalnya dari potongan data yang
+    berbeda) menjadi satu state.
+    """
+    merged = states[0]
+    for state in states[1:]:
+        merged = merged.add(state, fill_value=0)
+    return merged
+
+
+def rolling_moments(df, window=3, by='wilayah', time='tahun', columns=('produksi_pertahun',)):
+    """
+    State moments per (wilayah, tahun) untuk jendela `window` tahun kalender
+    terakhir: state per tahun digeser 0..window-1 tahun lalu digabung. Hanya
+    tahun yang ada di data yang disertakan.
+    """
+    moments = grouped_moments(df, [by, time], list(columns))
+    regions = moments.index.get_level_values(by)
+    years = moments.index.get_level_values(time)
+    shifted = [moments.set_axis(pd.MultiIndex.from_arrays([regions, years + offset], names=[by, time]))
+               for offset in range(window)]
+    merged = merge_moments(*shifted)
+    return merged[merged.index.get_level_values(time).isin(years.unique())]
+
+
+def collapse_moments(moments, level):
+    """
+    Menggabungkan state moments ke satu level indeks, misalnya dari
+    (wilayah, curah_hujan) menjadi wilayah saja.
+    """
+    return moments.groupby(level=level, observed=True).sum()
+
+
+def summarize_moments(moments):
+    """
+    Mengubah state moments menjadi mean, std (ddof=1), dan koefisien variasi
+    (%) per kolom.
+    """
+    summary = {}
+    for column in moments.columns.get_level_values(0).unique():
+        count = moments[(column, 'count')]
+        total = moments[(column, 'sum')]
+        mean = total / count
+        variance = (moments[(column, 'sumsq')] - total * mean) / (count - 1)
+        std = np.sqrt(variance.clip(lower=0).where(count > 1))
+        summary[(column, 'mean')] = mean
+        summary[(column, 'std')] = std
+        summary[(column, 'cv')] = std / mean * 100
+    return pd.DataFrame(summary, index=moments.index)
+
+
+def risk_terciles(values):
+    return pd.qcut(values, q=3, labels=RISK_LABELS)
+
+
+def _most_frequent(df, counts, by, condition):
+    # Kondisi paling sering per wilayah; bila seri, yang muncul lebih dulu di
+    # data dipilih (sama dengan value_counts().index[0])
+    first_seen = df[[by, condition]].drop_duplicates().astype(str)
+    first_seen['urutan'] = np.arange(len(first_seen))
+    ranking = counts.rename('count').reset_index()
+    ranking[[by, condition]] = ranking[[by, condition]].astype(str)
+    ranking = ranking.merge(first_seen, on=[by, condition])
+    ranking = ranking.sort_values(['count', 'urutan'], ascending=[False, True])
+    mode = ranking.drop_duplicates(by).set_index(by)[condition]
+    return mode.reindex(counts.index.get_level_values(by).unique().astype(str)).values
+
+
+def analyze_risk(df, by='wilayah', condition='curah_hujan',
+                 columns=('produksi_pertahun', 'harga'), extra_means=()):
+    """
+    Analisis risiko per wilayah dari satu kali lintasan data: CV produksi dan
+    harga, tercile risiko, kondisi (curah hujan) yang paling sering, serta
+    matriks rata-rata produksi wilayah x curah hujan.
+    """
+    columns = list(columns)
+    moments = grouped_moments(df, [by, condition], columns + list(extra_means))
+    regional = summarize_moments(collapse_moments(moments, by))
+
+    risk_metrics = pd.DataFrame(index=regional.index)
+    for column in columns:
+        risk_metrics[column] = regional[(column, 'cv')]
+    for column in extra_means:
+        risk_metrics[column] = regional[(column, 'mean')]
+
+    risk_metrics[condition] = _most_frequent(df, moments[(columns[0], 'count')], by, condition)
+
+    risk_metrics['risiko_produksi'] = risk_terciles(risk_metrics[columns[0]])
+    if len(columns) > 1:
+        risk_metrics['risiko_harga'] = risk_terciles(risk_metrics[columns[1]])
+
+    production = moments[columns[0]]
+    weather_risk = (production['sum'] / production['count']).unstack(condition).fillna(0)
+
+    return {
+        'risk_metrics': risk_metrics,
+        'weather_risk': weather_risk,
+        'moments': moments
+    }
+
+
+def production_risk(df, by='wilayah', column='produksi_pertahun'):
+    """
+    Ringkasan mean, std, dan CV satu kolom per wilayah (untuk grafik
+    "Analisis Risiko Produksi").
+    """
+    return summarize_moments(grouped_moments(df, by, [column]))[column]
+
+
+def rolling_risk(df, window=3, by='wilayah', time='tahun', column='produksi_pertahun'):
+    """
+    Mean, std, dan CV bergulir `window` tahun per wilayah dan tahun, serta
+    untuk seluruh wilayah per tahun (state digabung per tahun).
+    """
+    moments = rolling_moments(df, window, by, time, [column])
+    return {
+        'wilayah': summarize_moments(moments)[column],
+        'total': summarize_moments(collapse_moments(moments, time))[column],
+    }
+
@@ -0,0 +1,240 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Skema kolom per komoditas untuk validasi saat CSV dikonversi.
+#
+# CSV dibaca sebagai teks, lalu setiap kolom dikonversi secara tervektor ke
+# tipe ringkas (int8/int16/int32, kategori) dengan pemeriksaan rentang dan
+# nilai yang diizinkan. Baris yang gagal di salah satu kolom dipisahkan ke
+# file karantina, sehingga dashboard selalu bekerja dengan kolom bertipe
+# bersih. Kolom wajib yang hilang atau terlalu banyak baris rusak dianggap
+# file yang salah dan konversi dihentikan.
+#
+# Kolom kategori memakai tabel kode global berurutan tetap yang sama untuk
+# semua komoditas: kode int8 'sedang' atau 'Kabupaten Pulau Morotai' selalu
+# bernilai sama di setiap dataset, cache, dan file biner, sehingga group-by
+# dan penggabungan antarkomoditas cukup membandingkan bilangan bulat.
+#
+# Tabel wilayah bersifat terbuka: nama yang tidak ada di tabel (misalnya data
+# tingkat kecamatan atau desa) tetap diterima dan ditambahkan per file setelah
+# kabupaten/kota yang dikenal, sehingga kode wilayah yang dikenal tetap sama.
+
+# Tabel kode tetap untuk kolom bertingkat rendah/sedang/tinggi
+LEVEL_CATEGORIES = ['rendah', 'sedang', 'tinggi']
+
+# Kabupaten/kota di Provinsi Maluku Utara
+REGIONS = [
+    'Kabupaten Halmahera Barat',
+    'Kabupaten Halmahera Selatan',
+    'Kabupaten Halmahera Tengah',
+    'Kabupaten Halmahera Timur',
+    'Kabupaten Halmahera Utara',
+    'Kabupaten Kepulauan Sula',
+    'Kabupaten Pulau Morotai',
+    'Kabupaten Pulau Taliabu',
+    'Kota Ternate',
+    'Kota Tidore Kepulauan',
+]
+
+# Nama tabel kode -> dtype kategori bersama (satu objek untuk semua dataset)
+CODE_TABLES = {
+    'level': pd.CategoricalDtype(LEVEL_CATEGORIES, ordered=True),
+    'region': pd.CategoricalDtype(REGIONS),
+}
+
+# Tabel kode yang dapat diperluas dengan nilai baru dari data
+OPEN_TABLES = {'region'}
+
+# Bila lebih dari separuh baris tidak valid, file kemungkinan salah format
+MAX_INVALID_FRACTION = 0.5
+
+# kind: 'int', 'float', 'text', atau nama tabel kode ('level', 'region')
+Column = namedtuple('Column', ['kind', 'dtype', 'min', 'max'], defaults=(None, None, None))
+
+YEAR = Column('int', 'int16', 1900, 2100)
+REGION = Column('region')
+LEVEL = Column('level')
+SCORE = Column('int', 'int8', 0, 10)
+AMOUNT = Column('int', 'int32', 0)
+PRICE = Column('int', 'int32', 1)
+
+CROP_SCHEMA = {
+    'tahun': YEAR,
+    'wilayah': REGION,
+    'produksi_pertahun': AMOUNT,
+    'curah_hujan': LEVEL,
+    'tingkat_kesuburan_tanah': SCORE,
+    'harga': PRICE,
+    'permintaan_pasar': LEVEL,
+    'luas_lahan_hektar': AMOUNT,
+    'tingkat_konsumsi_perkapita_perkg': AMOUNT,
+}
+
+POULTRY_SCHEMA = {
+    'tahun': YEAR,
+    'wilayah': REGION,
+    'produksi_pertahun': AMOUNT,
+    'ketersediaan_pakan': LEVEL,
+    'kondisi_kandang': SCORE,
+    'harga': PRICE,
+    'permintaan_ayam': LEVEL,
+    'kapasitas_kandang': AMOUNT,
+    'tingkat_konsumsi_perkapita_perkg': AMOUNT,
+}
+
+SCHEMAS = {
+    'ayam': POULTRY_SCHEMA,
+    'cengkeh': CROP_SCHEMA,
+    'kakao': CROP_SCHEMA,
+    'padi': CROP_SCHEMA,
+    'pisang': CROP_SCHEMA,
+}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def schema_for(csv_path):
+    """
+    Skema untuk file data_<komoditas>.csv, atau None bila tidak terdaftar.
+    """
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return SCHEMAS.get(name.removeprefix('data_'))
+
+
+def table_dtype(table, categories=None):
+    """
+    Dtype kategori tabel kode. Untuk tabel terbuka, categories (kategori
+    tabel global diikuti nilai tambahan dari data) menghasilkan dtype yang
+    diperluas; tanpa nilai tambahan, dtype bersama dipakai apa adanya.
+    """
+    dtype = CODE_TABLES[table]
+    if categories is None or len(categories) == len(dtype.categories):
+        return dtype
+    return pd.CategoricalDtype(categories, ordered=dtype.ordered)
+
+
+def is_table_dtype(dtype, table):
+    """
+    True bila dtype adalah dtype tabel kode (atau perluasannya untuk tabel
+    terbuka), sehingga kodenya sudah merupakan kode global.
+    """
+    base = CODE_TABLES[table]
+    if not isinstance(dtype, pd.CategoricalDtype) or dtype.ordered != base.ordered:
+        return False
+    if table not in OPEN_TABLES:
+        return dtype == base
+    return list(dtype.categories[:len(base.categories)]) == list(base.categories)
+
+
+def global_codes(values, table):
+    """
+    Kode int8 global nilai kategori (-1 untuk nilai di luar tabel). Untuk
+    kolom kategori dataset hanya berupa pemetaan ulang kode, tanpa string.
+    """
+    return pd.Categorical(values, dtype=CODE_TABLES[table]).codes
+
+
+def from_codes(codes, table, categories=None):
+    """
+    Kolom kategori dari kode global (categories: lihat table_dtype). Dtype
+    bersama dipakai apa adanya; untuk wilayah, kategori yang tidak muncul
+    dibuang agar grafik tidak menampilkan wilayah kosong (urutannya tetap
+    mengikuti tabel; kode global diperoleh lewat global_codes).
+    """
+    values = pd.Categorical.from_codes(codes, dtype=table_dtype(table, categories))
+    return values.remove_unused_categories() if table == 'region' else values
+
+
+def _coerce(text, column):
+    # Mengembalikan (nilai, mask tidak valid) untuk satu kolom teks
+    text = text.str.strip()
+    if column.kind == 'text':
+        return text, text.eq('')
+    if column.kind in CODE_TABLES:
+        # Penulisan huruf dan spasi dinormalkan ke ejaan di tabel kode
+        dtype = CODE_TABLES[column.kind]
+        spelling = {name.lower(): name for name in dtype.categories}
+        text = text.str.replace(r'\s+', ' ', regex=True)
+        names = text.str.lower().map(spelling)
+        if column.kind in OPEN_TABLES:
+            # Nilai baru ditambahkan setelah tabel global, urut abjad
+            names = names.fillna(text.where(text.ne('')))
+            extra = sorted(set(names.dropna().unique()) - set(dtype.categories))
+            dtype = table_dtype(column.kind, [*dtype.categories, *extra])
+        values = pd.Categorical(names, dtype=dtype)
+        return values, pd.Series(values.codes < 0, index=text.index)
+
+    numbers = pd.to_numeric(text, errors='coerce')
+    invalid = numbers.isna()
+    if column.kind == 'int':
+        invalid |= numbers.ne(numbers.round())
+    if column.min is not None:
+        invalid |= numbers.lt(column.min)
+    if column.max is not None:
+        invalid |= numbers.gt(column.max)
+    return numbers, invalid
+
+
+def _extra_column(text):
+    # Kolom di luar skema: numerik bila seluruh nilainya angka, selain itu teks
+    numbers = pd.to_numeric(text, errors='coerce')
+    if numbers.notna().all():
+        return numbers.to_numpy()
+    return text.fillna('').to_numpy(dtype=object)
+
+
+def validate(raw, schema):
+    """
+    Memvalidasi DataFrame teks (hasil read_csv dengan dtype=str) terhadap
+    skema. Mengembalikan (data bersih bertipe ringkas, baris karantina
+    beserta kolom 'alasan', laporan jumlah).
+    """
+    missing = [name for name in schema if name not in raw.columns]
+    if missing:
+        raise SchemaError(f"Kolom wajib tidak ditemukan: {', '.join(missing)}")
+
+    values = {}
+    masks = {}
+    for name, column in schema.items():
+        values[name], masks[name] = _coerce(raw[name].fillna(''), column)
+    invalid = np.logical_or.reduce([mask.to_numpy() for mask in masks.values()])
+
+    report = {
+        'total': len(raw),
+        'valid': int((~invalid).sum()),
+        'karantina': int(invalid.sum()),
+        'per_kolom': {name: int(mask.sum()) for name, mask in masks.items() if mask.any()},
+    }
+    if len(raw) and report['karantina'] > MAX_INVALID_FRACTION * len(raw):
+        columns = ', '.join(f"{name} ({count})" for name, count in report['per_kolom'].items())
+        raise SchemaError(f"{report['karantina']} dari {len(raw)} baris tidak valid: {columns}")
+
+    quarantined = raw[invalid].copy()
+    quarantined['alasan'] = [
+        ', '.join(name for name, mask in masks.items() if mask.iloc[row])
+        for row in np.flatnonzero(invalid)
+    ]
+
+    keep = ~invalid
+    clean = {}
+    for name in raw.columns:
+        if name not in schema:
+            clean[name] = _extra_column(raw[name][keep])
+            continue
+        column = schema[name]
+        if column.kind in CODE_TABLES:
+            clean[name] = values[name][keep]
+            continue
+        kept = values[name][keep].to_numpy()
+        if column.kind == 'int':
+            clean[name] = kept.astype(column.dtype)
+        elif column.kind == 'float':
+            clean[name] = kept.astype(column.dtype or np.float64)
+        else:
+            clean[name] = kept.astype(object)
+    return pd.DataFrame(clean, columns=raw.columns), quarantined, report
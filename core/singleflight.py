@@ -0,0 +1,152 @@
+import contextlib
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from core.memory import governor
+
+# Penggabungan perhitungan bersamaan (single-flight) dengan stale-while-revalidate.
+#
+# Setiap perhitungan diidentifikasi dengan slot (fungsi, komoditas, argumen)
+# dan versi dataset. Pemanggil bersamaan untuk (slot, versi) yang sama
+# menunggu satu perhitungan saja, dengan batas waktu. Bila slot sudah pernah
+# dihitung untuk versi sebelumnya, hasil lama langsung dikembalikan sementara
+# versi baru dihitung di satu thread latar belakang, sehingga pembaruan data
+# tidak memicu lonjakan CPU dari semua sesi sekaligus.
+#
+# Hasil lama tidak disimpan di sini. Setiap slot hanya mencatat versi terakhir
+# dan kunci entri cache-nya (tier, kunci, dibagikan) di pengatur memori; kunci
+# tersebut sudah memuat versi dataset. Hasil lama dibaca dari tier itu, sehingga
+# ikut anggaran dan eviksi tier. Bila entrinya sudah dikeluarkan, pemanggil
+# menunggu versi baru seperti biasa.
+
+TIMEOUT = 60
+MAX_SLOTS = 256
+REVALIDATE_WORKERS = 2
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.done = threading.Event()
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, timeout=TIMEOUT, max_slots=MAX_SLOTS, max_workers=REVALIDATE_WORKERS):
+        self.timeout = timeout
+        self.max_slots = max_slots
+        self._lock = threading.Lock()
+        self._calls = {}
+        # slot -> (urutan, versi, entri cache) dari perhitungan terbaru yang berhasil
+        self._latest = OrderedDict()
+        self._sequence = itertools.count()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='revalidate')
+        self.stats = {'dihitung': 0, 'menunggu': 0, 'basi': 0, 'basi_dikeluarkan': 0, 'batas_waktu': 0}
+
+    @contextlib.contextmanager
+    def fresh(self):
+        """
+        Di dalam blok ini hasil lama tidak dipakai; pemanggil selalu menunggu
+        versi terbaru (dipakai oleh pemanasan cache).
+        """
+        previous = getattr(self._local, 'fresh', False)
+        self._local.fresh = True
+        try:
+            yield
+        finally:
+            self._local.fresh = previous
+
+    def do(self, slot, version, compute, entry, timeout=None):
+        """
+        Menjalankan compute() sekali untuk (slot, versi). compute harus fungsi
+        ber-cache yang menyimpan hasilnya di entri `entry` = (tier, kunci,
+        dibagikan) pengatur memori, karena pemanggil yang menunggu memanggilnya
+        lagi setelah perhitungan selesai dan hasil lama dibaca dari entri itu.
+        """
+        compute = self._fresh_compute(compute)
+        with self._lock:
+            latest = self._latest.get(slot)
+            if latest is not None and latest[1] == version:
+                self._latest.move_to_end(slot)
+                call = None
+            else:
+                call = self._calls.get((slot, version))
+                leader = call is None
+                if leader:
+                    call = self._calls[(slot, version)] = _Call(next(self._sequence))
+                    self.stats['dihitung'] += 1
+
+        if call is None:
+            return compute()
+
+        if latest is not None and not getattr(self._local, 'fresh', False):
+            tier, key, shared = latest[2]
+            found, value = governor.peek(tier, key, shared)
+            with self._lock:
+                self.stats['basi' if found else 'basi_dikeluarkan'] += 1
+            if found:
+                if leader:
+                    self._executor.submit(self._revalidate, slot, version, call, compute, entry)
+                return value
+
+        if leader:
+            return self._run(slot, version, call, compute, entry)
+
+        with self._lock:
+            self.stats['menunggu'] += 1
+        if not call.done.wait(self.timeout if timeout is None else timeout):
+            with self._lock:
+                self.stats['batas_waktu'] += 1
+            raise TimeoutError(f"Perhitungan {slot[0]} belum selesai; muat ulang halaman sebentar lagi.")
+        if call.error is not None:
+            raise call.error
+        return compute()
+
+    def _fresh_compute(self, compute):
+        # Perhitungan versi baru tidak boleh memakai hasil lama dari fungsi
+        # single-flight lain yang dipanggil di dalamnya
+        def run():
+            with self.fresh():
+                return compute()
+        return run
+
+    def _run(self, slot, version, call, compute, entry):
+        try:
+            value = compute()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        else:
+            with self._lock:
+                latest = self._latest.get(slot)
+                # Versi lama yang selesai belakangan tidak menimpa versi baru
+                if latest is None or latest[0] < call.sequence:
+                    self._latest[slot] = (call.sequence, version, entry)
+                    self._latest.move_to_end(slot)
+                    while len(self._latest) > self.max_slots:
+                        self._latest.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                self._calls.pop((slot, version), None)
+            call.done.set()
+
+    def _revalidate(self, slot, version, call, compute, entry):
+        try:
+            self._run(slot, version, call, compute, entry)
+        except Exception:
+            logger.exception("Gagal memperbarui %s", slot[0])
+
+    def status(self):
+        with self._lock:
+            return {**self.stats, 'sedang_dihitung': len(self._calls), 'slot': len(self._latest)}
+
+
+# Satu instans untuk seluruh sesi di server ini
+flights = SingleFlight()
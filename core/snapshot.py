@@ -0,0 +1,517 @@
+import argparse
+import base64
+import html
+import itertools
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import textwrap
+import time
+
+from core.apptest import DASHBOARDS, MENU_LABEL, SUBMENU_LABEL, DashboardRun
+from core.catalog import dataset_versions
+from core.export import slugify
+
+# Snapshot statis dashboard untuk pengunjung yang hanya melihat.
+#
+# Setiap dashboard dijalankan tanpa browser (streamlit.testing AppTest) dalam
+# keadaan bawaannya, lalu pohon elemen hasilnya ditulis sebagai HTML biasa:
+# judul dan teks markdown, tabel, gambar matplotlib/seaborn sebagai data URI,
+# dan grafik plotly sebagai JSON yang digambar plotly.js di browser. Untuk
+# dashboard dengan menu ("Pilih Menu") dan submenu ("Pilih Submenu:"), setiap
+# kombinasi pilihan menjadi satu halaman yang saling ditautkan.
+#
+# Hasilnya cukup disajikan oleh server file statis (nginx, python -m
+# http.server, dsb.) tanpa proses Python. Snapshot dibangun ulang hanya bila
+# versi dataset berubah: lewat perintah di bawah (sekali, atau berkala dengan
+# --watch), atau otomatis oleh aplikasi Streamlit bila variabel lingkungan
+# SNAPSHOT_DIR diisi (lihat rebuild_in_background).
+#
+# out_dir adalah symlink ke direktori hasil pembangunan terakhir
+# (<out_dir>.build-<waktu>), yang ditukar sekaligus dengan os.replace.
+# Gambar diambil dari penyimpanan media runtime Streamlit, yang bukan API
+# publik; versi Streamlit dipatok di requirements.txt dan aksesnya diperiksa
+# sehingga perubahan internal menghasilkan SnapshotError yang jelas.
+#
+#   python -m core.snapshot --out snapshot
+#   python -m core.snapshot --out snapshot --watch 60
+
+OUT_DIR = 'snapshot'
+# Direktori snapshot yang dibangun ulang otomatis oleh aplikasi (opsional)
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR')
+# Versi Streamlit yang sudah diuji untuk akses penyimpanan media
+TESTED_STREAMLIT = '1.66'
+MANIFEST = 'manifest.json'
+PLOTLY_JS = 'plotly.min.js'
+# Dinaikkan bila tata letak HTML berubah agar snapshot lama dibangun ulang
+SNAPSHOT_VERSION = 1
+
+# Dijalankan setelah main(): penyimpanan media bukan API publik, jadi hanya
+# diambil di sini dan diperiksa di _media_storage
+MEDIA_SCRIPT = """
+import streamlit as st
+from streamlit.runtime import Runtime
+st.session_state['_snapshot_media'] = getattr(Runtime.instance().media_file_mgr, '_storage', None)
+"""
+
+STYLE = """
+body { font-family: "Source Sans Pro", sans-serif; margin: 0; color: #31333f; }
+.layout { display: flex; }
+aside { width: 18rem; min-height: 100vh; background: #f0f2f6; padding: 1rem 1.5rem; box-sizing: border-box; }
+main { flex: 1; max-width: 60rem; padding: 1rem 2rem; }
+img { max-width: 100%; }
+nav.tabs a, nav.options a { margin-right: 1rem; }
+nav.options a.current { font-weight: bold; text-decoration: none; color: #ff4b4b; }
+section.tab { border-top: 1px solid #ddd; margin-top: 1.5rem; }
+.columns { display: flex; gap: 1rem; }
+.columns > div { flex: 1; }
+.caption { color: #808495; font-size: 0.875rem; }
+.alert { padding: 0.75rem 1rem; border-radius: 0.5rem; margin: 0.5rem 0; }
+.warning { background: #fffce7; } .info { background: #e8f0fe; }
+.success { background: #e8f9ee; } .error { background: #ffecec; }
+.metric .value { font-size: 2rem; }
+table.dataframe { border-collapse: collapse; font-size: 0.875rem; margin: 0.5rem 0; }
+table.dataframe td, table.dataframe th { border: 1px solid #e6e6e6; padding: 0.25rem 0.5rem; }
+.chart { width: 100%; height: 450px; }
+details { border: 1px solid #ddd; border-radius: 0.5rem; padding: 0.5rem 1rem; margin: 0.5rem 0; }
+footer { color: #808495; font-size: 0.8rem; margin-top: 3rem; }
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotError(RuntimeError):
+    pass
+
+
+# Fungsi untuk mengubah markdown sederhana (yang dipakai dashboard) ke HTML
+def _inline(text):
+    text = html.escape(text, quote=False)
+    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<!\*)\*(?!\s)(.+?)(?<!\s)\*', r'<em>\1</em>', text)
+    return re.sub(r'\[([^\]]+)\]\(([^)\s]+)\)', r'<a href="\2">\1</a>', text)
+
+
+def markdown_html(body):
+    """
+    HTML untuk markdown dashboard: judul #, daftar -/*/1., garis ---, dan
+    format inline (tebal, miring, kode, tautan). HTML mentah di-escape.
+    """
+    parts = []
+    paragraph = []
+    list_tag = None
+
+    def close():
+        nonlocal list_tag
+        if paragraph:
+            parts.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+        if list_tag:
+            parts.append(f"</{list_tag}>")
+            list_tag = None
+
+    for line in textwrap.dedent(body).splitlines():
+        stripped = line.strip()
+        heading = re.match(r'(#{1,6})\s+(.*)', stripped)
+        item = re.match(r'(?:[-*+]|(\d+)\.)\s+(.*)', stripped)
+        if not stripped:
+            close()
+        elif re.fullmatch(r'(-{3,}|\*{3,}|_{3,})', stripped):
+            close()
+            parts.append('<hr>')
+        elif heading:
+            close()
+            level = len(heading.group(1))
+            parts.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif item:
+            tag = 'ol' if item.group(1) else 'ul'
+            if paragraph or list_tag != tag:
+                close()
+                parts.append(f"<{tag}>")
+                list_tag = tag
+            parts.append(f"<li>{_inline(item.group(2))}</li>")
+        elif list_tag and not paragraph and line[:1].isspace():
+            # Baris lanjutan item daftar
+            parts[-1] = parts[-1][:-len('</li>')] + ' ' + _inline(stripped) + '</li>'
+        else:
+            if list_tag:
+                close()
+            paragraph.append(stripped)
+    close()
+    return '\n'.join(parts)
+
+
+def _format_number(value):
+    return f"{value:,.4f}".rstrip('0').rstrip('.')
+
+
+def _dataframe_html(proto):
+    from streamlit.dataframe_util import convert_arrow_bytes_to_pandas_df
+    df = convert_arrow_bytes_to_pandas_df(proto.arrow_data.data)
+    return df.to_html(border=0, na_rep='', float_format=_format_number)
+
+
+class _PageWriter:
+    def __init__(self, media, chart_ids):
+        self.media = media
+        self.chart_ids = chart_ids
+
+    def _image(self, proto):
+        parts = []
+        for img in proto.imgs:
+            media_file = self.media.get_file(os.path.basename(img.url))
+            data = base64.b64encode(media_file.content).decode('ascii')
+            caption = f"<figcaption class=\"caption\">{html.escape(img.caption)}</figcaption>" if img.caption else ''
+            parts.append(f"<figure><img src=\"data:{media_file.mimetype};base64,{data}\" alt=\"\">{caption}</figure>")
+        return '\n'.join(parts)
+
+    def _plotly(self, proto):
+        chart_id = f"chart-{next(self.chart_ids)}"
+        spec = json.loads(proto.spec)
+        config = json.loads(proto.config) if proto.config else {}
+        config.setdefault('responsive', True)
+        # "</" di-escape agar teks grafik tidak menutup tag <script>
+        payload = json.dumps([spec.get('data', []), spec.get('layout', {}), config]).replace('</', '<\\/')
+        return (f"<div id=\"{chart_id}\" class=\"chart\"></div>\n"
+                f"<script>Plotly.newPlot(\"{chart_id}\", ...{payload});</script>")
+
+    def element(self, node):
+        kind = node.type
+        if kind in ('title', 'header', 'subheader'):
+            level = {'title': 1, 'header': 2, 'subheader': 3}[kind]
+            return f"<h{level}>{_inline(node.value)}</h{level}>"
+        if kind == 'markdown':
+            return markdown_html(node.value)
+        if kind == 'caption':
+            return f"<div class=\"caption\">{markdown_html(node.value)}</div>"
+        if kind == 'divider':
+            return '<hr>'
+        if kind in ('warning', 'info', 'success', 'error'):
+            return f"<div class=\"alert {kind}\">{markdown_html(node.value)}</div>"
+        if kind == 'metric':
+            return (f"<div class=\"metric\"><div>{html.escape(node.label)}</div>"
+                    f"<div class=\"value\">{html.escape(node.value)}</div></div>")
+        if kind in ('code', 'json', 'text'):
+            return f"<pre>{html.escape(str(node.value))}</pre>"
+        if kind == 'dataframe':
+            return _dataframe_html(node.proto)
+        if kind == 'image':
+            return self._image(node.proto)
+        if kind == 'plotly_chart':
+            return self._plotly(node.proto)
+        if kind in ('selectbox', 'radio') and node.label in (MENU_LABEL, SUBMENU_LABEL):
+            # Diisi tautan ke halaman pilihan lain setelah semua halaman dirender
+            return _nav_placeholder(node.label)
+        if kind == 'exception':
+            raise SnapshotError(f"Dashboard gagal dirender: {node.value}")
+        # Widget dan elemen lain hanya berguna di aplikasi interaktif
+        return ''
+
+    def block(self, node):
+        kind = node.type
+        children = [self.node(child) for child in node.children.values()]
+        if kind == 'tab_container':
+            labels = [child.label for child in node.children.values()]
+            ids = [f"tab-{next(self.chart_ids)}" for _ in labels]
+            # Semua tab ditampilkan berurutan; navigasi berupa tautan jangkar
+            nav = ' '.join(f"<a href=\"#{tab_id}\">{html.escape(label)}</a>" for tab_id, label in zip(ids, labels))
+            sections = [f"<section class=\"tab\" id=\"{tab_id}\">\n{content}</section>"
+                        for tab_id, content in zip(ids, children)]
+            return f"<nav class=\"tabs\">{nav}</nav>\n" + '\n'.join(sections)
+        content = '\n'.join(part for part in children if part)
+        if kind == 'tab':
+            return content
+        if kind == 'expander':
+            return f"<details><summary>{_inline(node.label)}</summary>\n{content}</details>"
+        if kind == 'horizontal' or (kind == 'flex_container' and node.proto.flex_container.direction == 2):
+            return f"<div class=\"columns\">\n{content}</div>"
+        if content:
+            return f"<div>\n{content}</div>"
+        return ''
+
+    def node(self, node):
+        if hasattr(node, 'children'):
+            return self.block(node)
+        return self.element(node)
+
+
+def _nav_placeholder(label):
+    return f"<!--nav:{label}-->"
+
+
+def _options_nav(label, options, current, pages):
+    links = []
+    for option in options:
+        css = ' class="current"' if option == current else ''
+        links.append(f"<a href=\"{pages[option]}\"{css}>{html.escape(option)}</a>")
+    return f"<nav class=\"options\"><strong>{html.escape(label)}</strong><br>\n" + '<br>\n'.join(links) + '</nav>'
+
+
+def _document(title, body, sidebar='', plotly=False, built_at=''):
+    script = f"<script src=\"{PLOTLY_JS}\"></script>\n" if plotly else ''
+    aside = f"<aside>\n<p><a href=\"index.html\">← Semua dashboard</a></p>\n{sidebar}</aside>\n"
+    return (f"<!DOCTYPE html>\n<html lang=\"id\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">\n"
+            f"<title>{html.escape(title)}</title>\n<style>{STYLE}</style>\n{script}</head>\n"
+            f"<body>\n<div class=\"layout\">\n{aside}<main>\n{body}\n"
+            f"<footer>Snapshot statis, dibuat {html.escape(built_at)}.</footer>\n"
+            f"</main>\n</div>\n</body>\n</html>\n")
+
+
+class _Run(DashboardRun):
+    # DashboardRun yang juga menyimpan penyimpanan media untuk gambar
+    def __init__(self, module, root):
+        super().__init__(module, root, after=MEDIA_SCRIPT)
+
+    def run(self):
+        self.app.run()
+        if self.app.exception:
+            raise SnapshotError(f"Dashboard gagal dirender: {self.app.exception[0].value}")
+
+    def _media_storage(self):
+        storage = self.app.session_state['_snapshot_media'] if '_snapshot_media' in self.app.session_state else None
+        if storage is None or not callable(getattr(storage, 'get_file', None)):
+            import streamlit
+            raise SnapshotError(f"Penyimpanan media Streamlit {streamlit.__version__} tidak dikenali; snapshot "
+                                f"diuji dengan Streamlit {TESTED_STREAMLIT}.x (lihat requirements.txt).")
+        return storage
+
+    def render(self, header, chart_ids):
+        # Berkas media hanya tersedia sampai rerun berikutnya, jadi gambar
+        # langsung disematkan; hasilnya (isi utama, sidebar)
+        writer = _PageWriter(self._media_storage(), chart_ids)
+        main = f"<h1>{_inline(header)}</h1>\n{writer.node(self.app.main)}"
+        try:
+            sidebar = writer.node(self.app.sidebar)
+        except (IndexError, KeyError):
+            sidebar = ''
+        return main, sidebar
+
+
+def _page_name(slug, menu=None, submenu=None):
+    parts = [slug] + [slugify(option) for option in (menu, submenu) if option is not None]
+    return '-'.join(parts) + '.html'
+
+
+def render_dashboard(slug, out_dir, root, built_at, chart_ids):
+    """
+    Menulis semua halaman satu dashboard (setiap kombinasi menu dan submenu)
+    ke out_dir dan mengembalikan daftar (nama file, menu, submenu).
+    """
+    header, module = DASHBOARDS[slug]
+    run = _Run(module, root)
+    run.run()
+
+    menus = run.options('selectbox', MENU_LABEL, sidebar=True)
+    submenus = {}
+    rendered = []
+    for menu in menus:
+        if menu is not None:
+            run.widget('selectbox', MENU_LABEL, sidebar=True).select(menu)
+            run.run()
+        submenus[menu] = run.options('radio', SUBMENU_LABEL)
+        for submenu in submenus[menu]:
+            if submenu is not None and submenu != run.widget('radio', SUBMENU_LABEL).value:
+                run.widget('radio', SUBMENU_LABEL).set_value(submenu)
+                run.run()
+            rendered.append((menu, submenu, run.render(header, chart_ids)))
+
+    menu_pages = {menu: _page_name(slug, menu, options[0]) for menu, options in submenus.items()}
+    written = []
+    for menu, submenu, (main, sidebar) in rendered:
+        navigation = {}
+        if menu is not None:
+            navigation[MENU_LABEL] = _options_nav(MENU_LABEL, menus, menu, menu_pages)
+        if submenu is not None:
+            submenu_pages = {option: _page_name(slug, menu, option) for option in submenus[menu]}
+            navigation[SUBMENU_LABEL] = _options_nav(SUBMENU_LABEL, submenus[menu], submenu, submenu_pages)
+        for label, nav in navigation.items():
+            main = main.replace(_nav_placeholder(label), nav)
+            sidebar = sidebar.replace(_nav_placeholder(label), nav)
+
+        name = _page_name(slug, menu, submenu)
+        title = ' – '.join(part for part in (header, menu, submenu) if part)
+        document = _document(title, main, sidebar, plotly='Plotly.newPlot' in main, built_at=built_at)
+        with open(os.path.join(out_dir, name), 'w', encoding='utf-8') as f:
+            f.write(document)
+        written.append((name, menu, submenu))
+    return written
+
+
+def _index(pages, versions, built_at):
+    items = []
+    for slug, written in pages.items():
+        header, _ = DASHBOARDS[slug]
+        first = written[0][0]
+        sub_items = ''
+        if len(written) > 1:
+            links = [f"<li><a href=\"{name}\">{html.escape(' – '.join(part for part in (menu, submenu) if part))}</a></li>"
+                     for name, menu, submenu in written]
+            sub_items = '\n<ul>\n' + '\n'.join(links) + '\n</ul>'
+        items.append(f"<li><a href=\"{first}\">{html.escape(header)}</a>{sub_items}</li>")
+    version_rows = ''.join(f"<li>{html.escape(commodity)}: <code>{html.escape(version)}</code></li>"
+                           for commodity, version in versions)
+    body = (f"<h1>🌿 Dashboard Analisis Pertanian Pulau Morotai</h1>\n<ul>\n" + '\n'.join(items) + "\n</ul>\n"
+            f"<h3>Versi dataset</h3>\n<ul>{version_rows}</ul>")
+    return _document("Dashboard Analisis Pertanian Pulau Morotai", body, built_at=built_at)
+
+
+def read_manifest(out_dir=OUT_DIR):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(out_dir=OUT_DIR, versions=None):
+    """
+    True bila snapshot di out_dir dibangun dari versi dataset saat ini.
+    """
+    manifest = read_manifest(out_dir)
+    versions = dataset_versions() if versions is None else versions
+    return (manifest is not None and manifest.get('snapshot_version') == SNAPSHOT_VERSION
+            and manifest.get('versions') == dict(versions))
+
+
+def build(out_dir=OUT_DIR, force=False):
+    """
+    Membangun snapshot semua dashboard bila versi dataset berubah (atau
+    force). Halaman ditulis ke direktori sementara lalu ditukar sekaligus,
+    sehingga pengunjung tidak pernah melihat snapshot setengah jadi.
+    Mengembalikan True bila snapshot dibangun ulang.
+    """
+    import plotly.offline
+
+    versions = dataset_versions()
+    if not force and is_current(out_dir, versions):
+        return False
+
+    out_dir = os.path.abspath(out_dir)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    staging = f"{out_dir}.build-{time.time_ns()}"
+    os.makedirs(staging)
+
+    started = time.time()
+    built_at = time.strftime('%Y-%m-%d %H:%M:%S')
+    chart_ids = itertools.count(1)
+    pages = {}
+    try:
+        for slug in DASHBOARDS:
+            logger.info("Merender dashboard %s", slug)
+            pages[slug] = render_dashboard(slug, staging, root, built_at, chart_ids)
+        with open(os.path.join(staging, PLOTLY_JS), 'w', encoding='utf-8') as f:
+            f.write(plotly.offline.get_plotlyjs())
+        with open(os.path.join(staging, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(_index(pages, versions, built_at))
+        manifest = {
+            'snapshot_version': SNAPSHOT_VERSION,
+            'versions': dict(versions),
+            'dibuat': built_at,
+            'detik': round(time.time() - started, 1),
+            'halaman': {slug: [name for name, _, _ in written] for slug, written in pages.items()},
+        }
+        with open(os.path.join(staging, MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    try:
+        _publish(staging, out_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    logger.info("Snapshot %s: %d halaman dalam %.1f detik", out_dir,
+                sum(len(written) for written in pages.values()), time.time() - started)
+    return True
+
+
+def _publish(build_dir, out_dir):
+    # Menukar out_dir (symlink) ke build_dir sekaligus, lalu menghapus
+    # direktori hasil pembangunan lama
+    link = f"{out_dir}.link-{os.getpid()}"
+    os.symlink(os.path.basename(build_dir), link)
+    try:
+        if os.path.isdir(out_dir) and not os.path.islink(out_dir):
+            # Snapshot lama berupa direktori biasa: dipindah sekali, dan
+            # dikembalikan bila penukaran gagal
+            previous = f"{out_dir}.build-0"
+            shutil.rmtree(previous, ignore_errors=True)
+            os.rename(out_dir, previous)
+            try:
+                os.replace(link, out_dir)
+            except BaseException:
+                os.rename(previous, out_dir)
+                raise
+        else:
+            os.replace(link, out_dir)
+    finally:
+        if os.path.lexists(link):
+            os.remove(link)
+
+    parent, name = os.path.split(out_dir)
+    for entry in os.scandir(parent):
+        if entry.name.startswith(f"{name}.build-") and entry.path != build_dir:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def build_until_current(out_dir=OUT_DIR, force=False):
+    """
+    Membangun snapshot lalu memeriksa versi dataset lagi, sampai snapshot
+    sesuai dengan data (data bisa berubah selama pembangunan).
+    """
+    rebuilt = build(out_dir, force)
+    while rebuilt and build(out_dir):
+        pass
+    return rebuilt
+
+
+_rebuild = None
+
+
+def rebuild_in_background(out_dir=SNAPSHOT_DIR):
+    """
+    Menjalankan pembangunan snapshot di proses terpisah (dipanggil aplikasi
+    saat versi dataset berubah). Tidak melakukan apa pun bila out_dir kosong
+    atau pembangunan sebelumnya masih berjalan; proses itu memeriksa ulang
+    versi dataset sebelum selesai.
+    """
+    global _rebuild
+    if not out_dir or (_rebuild is not None and _rebuild.poll() is None):
+        return False
+    _rebuild = subprocess.Popen([sys.executable, '-m', 'core.snapshot', '--out', out_dir])
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot HTML statis dashboard Pulau Morotai")
+    parser.add_argument('--out', default=OUT_DIR, help="direktori keluaran")
+    parser.add_argument('--force', action='store_true', help="bangun ulang walaupun data tidak berubah")
+    parser.add_argument('--watch', type=float, metavar='DETIK',
+                        help="periksa versi dataset setiap DETIK dan bangun ulang bila berubah")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    # Peringatan runtime Streamlit dari dekorator cache tidak relevan di sini
+    from streamlit.logger import set_log_level
+    set_log_level('error')
+
+    if not build_until_current(args.out, args.force):
+        logger.info("Snapshot %s sudah sesuai dengan versi dataset", args.out)
+    while args.watch:
+        time.sleep(args.watch)
+        try:
+            build(args.out)
+        except Exception:
+            # Snapshot lama tetap disajikan bila pembangunan ulang gagal
+            logger.exception("Gagal membangun ulang snapshot")
+
+
+if __name__ == "__main__":
+    main()
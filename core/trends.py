@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from core.analysis import analyze_rolling_risk
+from core.cache import versioned_cache
+from core.longtail import show_table, sparse_matrix
+
+# Analisis jendela waktu per wilayah.
+#
+# Data diringkas menjadi matriks sparse wilayah x tahun (core/longtail.py),
+# sehingga pasangan wilayah-tahun tanpa data tidak menempati memori. Rata-rata
+# bergulir, pertumbuhan tahunan (YoY), dan volatilitas dihitung dengan operasi
+# vektor (cumsum dan selisih kolom) pada bagian padat yang kecil saja: kolom
+# tahun terakhir untuk ringkasan seluruh wilayah, dan satu baris untuk grafik
+# wilayah yang dipilih.
+
+ALL_REGIONS = 'Semua Wilayah'
+
+
+def region_year_matrix(df, column='produksi_pertahun', by='wilayah', time='tahun'):
+    """
+    Total `column` per wilayah x tahun sebagai SparseMatrix (kolom mencakup
+    setiap tahun dari tahun pertama sampai terakhir).
+    """
+    return sparse_matrix(df, column, by, time)
+
+
+def _totals(sums, counts):
+    # Tahun tanpa data bernilai NaN, bukan 0
+    return np.where(counts > 0, sums, np.nan)
+
+
+def dense_totals(matrix, columns=slice(None)):
+    """
+    Total per tahun untuk potongan kolom `columns` sebagai DataFrame padat:
+    semua wilayah yang punya data ditambah baris total seluruh wilayah.
+    """
+    observed = np.flatnonzero(matrix.counts.getnnz(axis=1))
+    sums = matrix.sums[observed][:, columns].toarray()
+    counts = matrix.counts[observed][:, columns].toarray()
+    totals = pd.DataFrame(_totals(sums, counts), index=matrix.rows[observed], columns=matrix.columns[columns])
+    totals.loc[ALL_REGIONS] = _totals(sums.sum(axis=0), counts.sum(axis=0))
+    return totals
+
+
+def region_totals(matrix, region):
+    """
+    Total per tahun satu wilayah (atau ALL_REGIONS) sebagai Series.
+    """
+    if region == ALL_REGIONS:
+        sums = np.asarray(matrix.sums.sum(axis=0)).ravel()
+        counts = np.asarray(matrix.counts.sum(axis=0)).ravel()
+    else:
+        position = matrix.rows.get_loc(region)
+        sums = matrix.sums[position].toarray().ravel()
+        counts = matrix.counts[position].toarray().ravel()
+    return pd.Series(_totals(sums, counts), index=matrix.columns, name=region)
+
+
+def _window_sums(values, window):
+    # Jumlah per jendela `window` tahun terakhir lewat selisih cumsum; jendela
+    # yang belum lengkap di awal periode bernilai NaN
+    csum = np.cumsum(values, axis=1)
+    sums = np.full(values.shape, np.nan)
+    sums[:, window - 1:] = csum[:, window - 1:]
+    sums[:, window:] -= csum[:, :-window]
+    return sums
+
+
+def rolling_mean(matrix, window=3):
+    values = matrix.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    sums = _window_sums(np.where(valid, values, 0), window)
+    counts = _window_sums(valid.astype(np.float64), window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(counts == window, sums / counts, np.nan)
+    return pd.DataFrame(mean, index=matrix.index, columns=matrix.columns)
+
+
+def yoy_growth(matrix):
+    """
+    Pertumbuhan tahunan (%) terhadap tahun sebelumnya.
+    """
+    values = matrix.to_numpy(dtype=np.float64)
+    growth = np.full(values.shape, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        growth[:, 1:] = (values[:, 1:] - values[:, :-1]) / values[:, :-1] * 100
+    growth[~np.isfinite(growth)] = np.nan
+    return pd.DataFrame(growth, index=matrix.index, columns=matrix.columns)
+
+
+def rolling_volatility(matrix, window=3):
+    """
+    Volatilitas bergulir: koefisien variasi (%) nilai tahunan dalam jendela
+    `window` tahun terakhir.
+    """
+    values = matrix.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0)
+    counts = _window_sums(valid.astype(np.float64), window)
+    sums = _window_sums(filled, window)
+    sumsq = _window_sums(filled * filled, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / counts
+        variance = np.clip((sumsq - sums * mean) / (counts - 1), 0, None)
+        cv = np.sqrt(variance) / mean * 100
+    cv = np.where(counts == window, cv, np.nan)
+    return pd.DataFrame(cv, index=matrix.index, columns=matrix.columns)
+
+
+def latest_summary(totals, window=3):
+    """
+    Ringkasan tahun terakhir per wilayah dari matriks total padat: nilai,
+    rata-rata bergulir, pertumbuhan YoY, dan volatilitas.
+    """
+    year = totals.columns[-1]
+    return pd.DataFrame({
+        'total': totals[year],
+        'rata_rata_bergulir': rolling_mean(totals, window)[year],
+        'pertumbuhan_yoy_persen': yoy_growth(totals)[year],
+        'volatilitas_persen': rolling_volatility(totals, window)[year]
+    }).round(2)
+
+
+# Fungsi untuk analisis jendela waktu (di-cache per versi dataset)
+@versioned_cache
+def analyze_trends(df, column='produksi_pertahun', window=3):
+    matrix = region_year_matrix(df, column)
+    # Ringkasan tahun terakhir hanya membutuhkan window + 1 tahun terakhir,
+    # sehingga bagian padat tidak bertambah dengan panjang periode
+    recent = slice(max(len(matrix.columns) - window - 1, 0), None)
+    return {
+        'matrix': matrix,
+        'summary': latest_summary(dense_totals(matrix, recent), window),
+        'window': window
+    }
+
+
+def region_trend(trends, region):
+    """
+    Total per tahun dan rata-rata bergulir satu wilayah untuk grafik.
+    """
+    window = trends['window']
+    totals = region_totals(trends['matrix'], region)
+    return pd.DataFrame({
+        'Total per Tahun': totals,
+        f'Rata-rata Bergulir {window} Tahun': rolling_mean(totals.to_frame().T, window).iloc[0]
+    })
+
+
+def trend_table(trends):
+    """
+    Tabel panjang (wilayah, tahun, total) berisi pasangan wilayah-tahun yang
+    punya data saja, untuk ekspor.
+    """
+    matrix = trends['matrix']
+    pairs = matrix.counts.tocoo()
+    totals = np.asarray(matrix.sums[pairs.row, pairs.col]).ravel()
+    return pd.DataFrame({
+        matrix.rows.name: matrix.rows[pairs.row],
+        matrix.columns.name: matrix.columns[pairs.col],
+        'total': totals
+    })
+
+
+@st.fragment
+def show_trends(df, column='produksi_pertahun', window=3, key='trends'):
+    """
+    Bagian "Analisis Jendela Waktu" untuk tab tren: grafik nilai tahunan dan
+    rata-rata bergulir wilayah terpilih serta ringkasan tahun terakhir.
+    """
+    trends = analyze_trends(df, column, window)
+    summary = trends['summary']
+
+    st.subheader(f"Analisis Jendela Waktu ({window} Tahun)")
+    regions = [ALL_REGIONS] + [region for region in summary.index if region != ALL_REGIONS]
+    region = st.selectbox("Pilih Wilayah:", regions, key=f"{key}_wilayah")
+
+    # Hanya baris wilayah terpilih yang dijadikan padat
+    chart_data = region_trend(trends, region)
+    fig = px.line(chart_data, x=chart_data.index, y=chart_data.columns, markers=True,
+                  title=f'Tren {column} - {region}')
+    fig.update_layout(xaxis_title='Tahun', yaxis_title=column, legend_title_text='')
+    st.plotly_chart(fig, key=f"{key}_chart")
+
+    st.write(f"Ringkasan tahun {trends['matrix'].columns[-1]} per wilayah:")
+    show_table(summary, key=f"{key}_summary")
+
+
+@st.fragment
+def show_rolling_risk(df, window=3, key='rolling_risk'):
+    """
+    Grafik koefisien variasi produksi bergulir `window` tahun untuk wilayah
+    terpilih (atau seluruh wilayah), sebagai pelengkap risiko per wilayah.
+    """
+    risk = analyze_rolling_risk(df, window)
+    regional = risk['wilayah']
+    regions = [ALL_REGIONS] + list(regional.index.get_level_values(0).unique())
+    region = st.selectbox("Risiko bergulir untuk wilayah:", regions, key=f"{key}_wilayah")
+
+    cv = risk['total']['cv'] if region == ALL_REGIONS else regional.loc[region, 'cv']
+    chart_data = cv.rename('cv').reset_index()
+    fig = px.line(chart_data, x=chart_data.columns[0], y='cv', markers=True,
+                  title=f'Koefisien Variasi Produksi Bergulir {window} Tahun - {region}')
+    fig.update_layout(xaxis_title='Tahun', yaxis_title='CV Produksi (%)')
+    st.plotly_chart(fig, key=f"{key}_chart")
@@ -0,0 +1,105 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.singleflight import flights
+
+# Pemanasan cache dashboard di latar belakang.
+#
+# Setiap dashboard menyediakan fungsi warmup_tasks() yang mengembalikan daftar
+# (label, fungsi, *argumen). Fungsi-fungsi tersebut adalah fungsi ber-cache
+# (@versioned_cache), sehingga memanggilnya di thread latar belakang membuat
+# permintaan pertama pengguna langsung dilayani dari cache.
+
+
+class Warmup:
+    def __init__(self, max_workers=1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='warmup')
+        self._lock = threading.Lock()
+        self.signature = None
+        self._reset()
+
+    def _reset(self):
+        self.running = False
+        self.total = 0
+        self.done = 0
+        self.current = None
+        self.errors = []
+        self.started_at = None
+        self.finished_at = None
+
+    def ensure(self, signature, task_factories):
+        """
+        Menjalankan pemanasan bila signature data berbeda dari pemanasan
+        terakhir (saat server mulai atau setelah data diperbarui).
+        task_factories adalah dict nama dashboard -> fungsi warmup_tasks.
+        """
+        with self._lock:
+            if signature == self.signature:
+                return False
+            self.signature = signature
+            self.running = True
+        self._executor.submit(self._run, dict(task_factories))
+        return True
+
+    def _run(self, task_factories):
+        # Pemanasan selalu menghitung versi terbaru, bukan memakai hasil lama
+        with flights.fresh():
+            self._run_tasks(task_factories)
+
+    def _run_tasks(self, task_factories):
+        with self._lock:
+            self._reset()
+            self.running = True
+            self.total = len(task_factories)
+            self.started_at = time.time()
+
+        # Tahap 1: memuat dataset dan mengumpulkan daftar tugas
+        tasks = []
+        for dashboard, factory in task_factories.items():
+            self._set_current(dashboard)
+            try:
+                dashboard_tasks = factory()
+            except Exception as exc:
+                self._record_error(dashboard, exc)
+                dashboard_tasks = []
+            with self._lock:
+                self.done += 1
+                self.total += len(dashboard_tasks)
+            tasks.extend((dashboard, task) for task in dashboard_tasks)
+
+        # Tahap 2: menghitung agregat dan grafik default
+        for dashboard, (label, func, *args) in tasks:
+            self._set_current(f"{dashboard}: {label}")
+            try:
+                func(*args)
+            except Exception as exc:
+                self._record_error(f"{dashboard}: {label}", exc)
+            with self._lock:
+                self.done += 1
+
+        with self._lock:
+            self.running = False
+            self.current = None
+            self.finished_at = time.time()
+
+    def _set_current(self, label):
+        with self._lock:
+            self.current = label
+
+    def _record_error(self, label, exc):
+        with self._lock:
+            self.errors.append(f"{label}: {exc}")
+
+    def status(self):
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                'running': self.running,
+                'done': self.done,
+                'total': self.total,
+                'current': self.current,
+                'errors': list(self.errors),
+                'elapsed': end - self.started_at if self.started_at else 0.0
+            }
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from core.cache import MODELS, versioned_cache
+from core.clustering import feature_matrix
+from core.longtail import show_table, top_n
+from core.narrative import format_number
+from core.schema import LEVEL_CATEGORIES, SCORE
+
+# Simulasi "bagaimana jika" produksi per wilayah.
+#
+# Produksi setiap komoditas dimodelkan linear terhadap luas lahan, tingkat
+# kesuburan tanah, dan tingkat curah hujan (kode 0/1/2), dengan intersep per
+# wilayah (efek tetap). Model diestimasi sekali per versi dataset dengan
+# kuadrat terkecil. Skenario dari slider (perubahan luas lahan dalam persen,
+# tambahan poin kesuburan, pergeseran tingkat curah hujan) diterapkan ke fitur
+# dasar seluruh wilayah sekaligus, lalu produksi dihitung dengan satu perkalian
+# matriks (skenario x wilayah x fitur) @ koefisien.
+
+FEATURES = ('luas_lahan_hektar', 'tingkat_kesuburan_tanah', 'curah_hujan')
+TARGET = 'produksi_pertahun'
+
+# Batas fitur setelah skenario diterapkan (lahan tidak negatif, skor dan
+# tingkat curah hujan tetap dalam skala skema)
+LOWER = np.array([0.0, SCORE.min, 0.0])
+UPPER = np.array([np.inf, SCORE.max, len(LEVEL_CATEGORIES) - 1.0])
+
+
+@versioned_cache(tier=MODELS)
+def fit_response(df, by='wilayah'):
+    """
+    Model respons produksi: koefisien per satuan fitur, R², jumlah data, dan
+    tabel dasar per wilayah (rata-rata fitur, intersep wilayah, dan rata-rata
+    produksi).
+    """
+    features = feature_matrix(df, FEATURES)
+    target = df[TARGET].to_numpy(dtype=np.float64)
+    groups = df[by].astype('category')
+    codes = groups.cat.codes.to_numpy()
+    valid = (codes >= 0) & ~np.isnan(features).any(axis=1) & ~np.isnan(target)
+    features, target, codes = features[valid], target[valid], codes[valid]
+
+    # Intersep wilayah diserap dengan demeaning per wilayah (efek tetap),
+    # sehingga lstsq hanya berjalan pada kolom fitur tanpa matriks dummy
+    observed = np.flatnonzero(np.bincount(codes, minlength=len(groups.cat.categories)))
+    codes = np.searchsorted(observed, codes)
+    counts = np.bincount(codes)
+    feature_means = np.column_stack(
+        [np.bincount(codes, features[:, i]) / counts for i in range(len(FEATURES))])
+    target_means = np.bincount(codes, target) / counts
+    coefficients = np.linalg.lstsq(
+        features - feature_means[codes], target - target_means[codes], rcond=None)[0]
+    intercepts = target_means - feature_means @ coefficients
+
+    residual = target - features @ coefficients - intercepts[codes]
+    total = ((target - target.mean()) ** 2).sum()
+    baseline = pd.DataFrame(
+        feature_means, columns=list(FEATURES),
+        index=groups.cat.categories[observed].astype(str).rename(by))
+    baseline['intersep'] = intercepts
+    baseline[TARGET] = target_means
+    return {
+        'koefisien': pd.Series(coefficients, index=list(FEATURES)),
+        'r2': 1 - (residual ** 2).sum() / total if total > 0 else 0.0,
+        'n': len(target),
+        'dasar': baseline,
+    }
+
+
+def evaluate_scenarios(model, land_change=0.0, fertility_change=0.0, rain_change=0.0):
+    """
+    Array (skenario, wilayah) berisi produksi prediksi. Setiap argumen boleh
+    berupa skalar atau array sepanjang jumlah skenario; land_change dalam
+    persen, fertility_change dalam poin skor, rain_change dalam tingkat.
+    """
+    baseline = model['dasar']
+    features = baseline[list(FEATURES)].to_numpy(dtype=np.float64)[None, :, :]
+    land, fertility, rain = np.broadcast_arrays(*(np.atleast_1d(np.asarray(value, dtype=np.float64))
+                                                  for value in (land_change, fertility_change, rain_change)))
+    scale = np.stack([1 + land / 100, np.ones_like(land), np.ones_like(land)], axis=-1)[:, None, :]
+    shift = np.stack([np.zeros_like(land), fertility, rain], axis=-1)[:, None, :]
+    scenario = np.clip(features * scale + shift, LOWER, UPPER)
+    production = scenario @ model['koefisien'].to_numpy() + baseline['intersep'].to_numpy()
+    return production.clip(min=0)
+
+
+def scenario_table(model, production):
+    """
+    Produksi dasar (prediksi model pada fitur rata-rata) dan produksi skenario
+    per wilayah beserta perubahannya.
+    """
+    base = evaluate_scenarios(model)[0]
+    table = pd.DataFrame({
+        'produksi_dasar': base,
+        'produksi_skenario': production,
+        'perubahan': production - base,
+    }, index=model['dasar'].index)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        table['perubahan_persen'] = np.where(base > 0, table['perubahan'] / base * 100, np.nan)
+    return table.round(2)
+
+
+@st.fragment
+def show_whatif(df, default_region='Kabupaten Pulau Morotai', key='whatif'):
+    """
+    Bagian "Simulasi Bagaimana Jika": slider perubahan luas lahan, kesuburan
+    tanah, dan curah hujan; produksi skenario untuk semua wilayah.
+    """
+    model = fit_response(df)
+    st.subheader("Simulasi Bagaimana Jika: Lahan, Kesuburan, dan Curah Hujan")
+
+    col1, col2, col3 = st.columns(3)
+    land_change = col1.slider("Perubahan luas lahan (%)", -50, 100, 20, step=5, key=f"{key}_lahan")
+    fertility_change = col2.slider("Perubahan kesuburan tanah (poin)", -3.0, 3.0, 2.0, step=0.5, key=f"{key}_kesuburan")
+    rain_change = col3.slider("Perubahan curah hujan (tingkat)", -2, 2, 0, key=f"{key}_hujan")
+
+    table = scenario_table(model, evaluate_scenarios(model, land_change, fertility_change, rain_change)[0])
+    total_base, total_scenario = table['produksi_dasar'].sum(), table['produksi_skenario'].sum()
+    coefficients = model['koefisien']
+    st.caption(f"Model (R² {model['r2']:.2f}, {format_number(model['n'])} data): setiap tambahan 1 hektar lahan "
+               f"mengubah produksi {format_number(coefficients['luas_lahan_hektar'], 2)}, 1 poin kesuburan "
+               f"{format_number(coefficients['tingkat_kesuburan_tanah'], 2)}, dan 1 tingkat curah hujan "
+               f"{format_number(coefficients['curah_hujan'], 2)} per tahun, bila faktor lain tetap.")
+
+    regions = list(table.index)
+    index = regions.index(default_region) if default_region in regions else 0
+    col1, col2 = st.columns(2)
+    col1.metric("Total produksi skenario (semua wilayah)", format_number(total_scenario),
+                f"{format_number(total_scenario - total_base)} dari {format_number(total_base)}")
+    region = col2.selectbox("Wilayah:", regions, index=index, key=f"{key}_wilayah")
+    col2.metric(f"Produksi skenario {region}", format_number(table.loc[region, 'produksi_skenario']),
+                f"{format_number(table.loc[region, 'perubahan'])}")
+
+    change = top_n(table['perubahan'], others='sum').reset_index()
+    fig = px.bar(change, x=change.columns[0], y='perubahan', title='Perubahan Produksi per Wilayah')
+    fig.update_layout(xaxis_title='Wilayah', yaxis_title='Perubahan Produksi')
+    st.plotly_chart(fig, key=f"{key}_perubahan")
+
+    # Kurva respons total produksi terhadap luas lahan (satu evaluasi matriks)
+    land_changes = np.arange(-50, 101, 5)
+    totals = evaluate_scenarios(model, land_changes, fertility_change, rain_change).sum(axis=1)
+    curve = pd.DataFrame({'perubahan_lahan_persen': land_changes, 'total_produksi': totals})
+    fig = px.line(curve, x='perubahan_lahan_persen', y='total_produksi',
+                  title='Total Produksi menurut Perubahan Luas Lahan (kesuburan dan curah hujan sesuai slider)')
+    fig.update_layout(xaxis_title='Perubahan Luas Lahan (%)', yaxis_title='Total Produksi')
+    st.plotly_chart(fig, key=f"{key}_kurva")
+
+    show_table(table.sort_values('perubahan', ascending=False), key=f"{key}_tabel")
@@ -3,22 +3,172 @@ import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.cluster import KMeans
 import plotly.express as px
 import graphviz
 import matplotlib.ticker as ticker
 
-# Fungsi untuk memuat data
-def load_data(data_path):
-    df = pd.read_csv(data_path)
+from core.cache import exclude_outliers_toggle, load_dataset, show_data_quality, single_flight, versioned_cache
+from core.clustering import POULTRY_FEATURES, show_clustering
+from core.export import COMMON_TABLES, show_export
+from core.longtail import top_n_mean
+from core.narrative import (conclusion_text, describe_change, describe_extremes,
+                            describe_position, describe_share, unit_formatter)
+from core.profitability import region_inputs, show_profitability
+from core.rendering import render_chart, show_chart, submit_charts
+from core.trends import analyze_trends, show_trends
+
+# Fungsi untuk memuat data (di-cache per versi dataset)
+def load_data(exclude_outliers=False):
+    df = load_dataset("ayam", exclude_outliers)
     return df
 
+# Fungsi untuk memfilter data wilayah Morotai
+def filter_morotai(df):
+    return df[df['wilayah'] == 'Kabupaten Pulau Morotai'].copy()
+
+# Fungsi untuk menyusun teks kesimpulan dari hasil analisis (di-cache per versi dataset)
+@single_flight
+@versioned_cache
+def build_conclusions(df):
+    kg = unit_formatter('kg')
+    rupiah = unit_formatter('Rp')
+    morotai_data = filter_morotai(df)
+    morotai_data['profit'] = morotai_data['harga'].astype('int64') * morotai_data['produksi_pertahun']
+
+    yearly = morotai_data.groupby('tahun')[['produksi_pertahun', 'harga', 'profit']].mean()
+    demand_counts = morotai_data['permintaan_ayam'].value_counts()
+    by_demand = morotai_data.groupby('permintaan_ayam', observed=True).agg(
+        harga_mean=('harga', 'mean'),
+        harga_std=('harga', 'std'),
+        produksi_mean=('produksi_pertahun', 'mean')
+    )
+    regional_production = df.groupby('wilayah', observed=True)['produksi_pertahun'].mean()
+
+    return {
+        'overview': [
+            describe_extremes(yearly['produksi_pertahun'], "Produksi ayam di Morotai", 'tahun ', kg),
+            describe_change(yearly['produksi_pertahun'], "produksi ayam di Morotai"),
+            describe_share(demand_counts, "Permintaan pasar di Morotai", 'kategori '),
+            describe_position(regional_production, 'Kabupaten Pulau Morotai', "rata-rata produksi", kg),
+        ],
+        'price_demand': [
+            describe_extremes(by_demand['harga_mean'], "Harga rata-rata ayam", 'permintaan ', rupiah),
+            describe_extremes(by_demand['harga_std'], "Variasi harga (standar deviasi)", 'permintaan ', rupiah),
+        ],
+        'profit': [
+            describe_extremes(yearly['profit'], "Profitabilitas", 'tahun ', rupiah),
+            describe_change(yearly['profit'], "profitabilitas"),
+            describe_change(yearly['produksi_pertahun'], "produksi"),
+            describe_change(yearly['harga'], "harga"),
+        ],
+        'opportunity': [
+            describe_extremes(by_demand['produksi_mean'], "Rata-rata produksi", 'permintaan ', kg),
+            "Wilayah dengan permintaan sedang memiliki potensi untuk ditingkatkan melalui strategi pemasaran.",
+        ],
+    }
+
+# Fungsi-fungsi grafik (dirender menjadi PNG di pool proses)
+def plot_production_price_trend(df):
+    morotai_data = filter_morotai(df)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.lineplot(data=morotai_data, x='tahun', y='produksi_pertahun', marker='o', color='blue', label='Produksi (kg)', ax=ax)
+    sns.lineplot(data=morotai_data, x='tahun', y='harga', marker='o', color='orange', label='Harga (Rp/kg)', ax=ax)
+    ax.set_title("Trend Produksi dan Harga Tahunan", fontsize=16)
+    ax.set_xlabel("Tahun", fontsize=12)
+    ax.set_ylabel("Produksi (kg) / Harga (Rp/kg)", fontsize=12)
+    ax.legend()
+    ax.grid(True)
+    return fig
+
+def plot_demand_distribution(df):
+    morotai_data = filter_morotai(df)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.countplot(data=morotai_data, x='permintaan_ayam', palette='cool', hue='permintaan_ayam', legend=False, ax=ax)
+    ax.set_title("Distribusi Permintaan Ayam", fontsize=16)
+    ax.set_xlabel("Kategori Permintaan", fontsize=12)
+    ax.set_ylabel("Jumlah Kasus", fontsize=12)
+    ax.grid(axis='y')
+    return fig
+
+def plot_regional_production(df):
+    production = top_n_mean(df.groupby('wilayah', observed=True)['produksi_pertahun'].mean(), df['wilayah'])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=production.index, y=production.values, hue=production.index, palette='viridis', legend=False, ax=ax)
+    ax.set_title("Perbandingan Produksi Antar Wilayah", fontsize=16)
+    ax.set_xlabel("Wilayah", fontsize=12)
+    ax.set_ylabel("Produksi Pertahun (kg)", fontsize=12)
+    ax.grid(axis='y')
+    return fig
+
+def plot_price_by_demand(df):
+    morotai_data = filter_morotai(df)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.boxplot(data=morotai_data, x='permintaan_ayam', y='harga', hue='permintaan_ayam', palette='cool', legend=False, ax=ax)
+    ax.set_title("Distribusi Harga per Kategori Permintaan", fontsize=16)
+    ax.set_xlabel("Kategori Permintaan", fontsize=12)
+    ax.set_ylabel("Harga (Rp/kg)", fontsize=12)
+    ax.grid(axis='y')
+    return fig
+
+def plot_profit_trend(df):
+    profit_data = filter_morotai(df)
+    profit_data['profit'] = profit_data['harga'].astype('int64') * profit_data['produksi_pertahun']
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.lineplot(data=profit_data, x='tahun', y='profit', marker='o', color='green', ax=ax)
+    ax.set_title("Profitabilitas per Tahun", fontsize=16)
+    ax.set_xlabel("Tahun", fontsize=12)
+    ax.set_ylabel("Profit (Rp)", fontsize=12)
+    ax.grid(True)
+    return fig
+
+def plot_market_opportunity(df):
+    morotai_data = filter_morotai(df)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(data=morotai_data, x='permintaan_ayam', y='produksi_pertahun', hue='permintaan_ayam', palette='cool', legend=False, ax=ax)
+    ax.set_title("Peluang Pasar Berdasarkan Permintaan", fontsize=16)
+    ax.set_xlabel("Kategori Permintaan", fontsize=12)
+    ax.set_ylabel("Produksi Pertahun (kg)", fontsize=12)
+    ax.grid(axis='y')
+    return fig
+
+# Grafik yang ditampilkan dashboard
+CHARTS = [
+    plot_production_price_trend,
+    plot_demand_distribution,
+    plot_regional_production,
+    plot_price_by_demand,
+    plot_profit_trend,
+    plot_market_opportunity,
+]
+
+# Tabel analisis yang dapat diekspor (diambil dari hasil yang sudah di-cache)
+EXPORT_TABLES = {
+    "Input Profitabilitas per Wilayah": region_inputs,
+    **COMMON_TABLES,
+}
+
+# Daftar perhitungan yang dipanaskan di latar belakang saat server mulai
+def warmup_tasks():
+    df = load_data()
+    return [
+        *[(builder.__name__, render_chart, builder, df) for builder in CHARTS],
+        ("Analisis Jendela Waktu", analyze_trends, df),
+        ("Kesimpulan", build_conclusions, df),
+        ("Data Tanpa Outlier", load_data, True),
+        ("Input Profitabilitas", region_inputs, df),
+    ]
+
 def main():
-    # Memuat data
-    df = load_data("data/data_ayam.csv")
-    
-    # Filter data untuk wilayah Morotai
-    morotai_data = df[df['wilayah'] == 'Kabupaten Pulau Morotai'].copy()
+    # Memuat data (tanpa outlier bila sakelar di sidebar aktif)
+    df = load_data(exclude_outliers_toggle())
+    show_data_quality("ayam")
+
+    # Memulai rendering seluruh grafik secara paralel; setiap grafik
+    # ditampilkan begitu selesai sehingga grafik pertama muncul lebih cepat
+    charts = submit_charts(CHARTS, df)
+
+    # Teks kesimpulan disusun dari hasil analisis versi dataset yang sama
+    conclusions = build_conclusions(df)
 
     # Tab untuk menampilkan analisis
     tabs = st.tabs([
@@ -36,46 +186,21 @@ def main():
         
         # Trend Produksi dan Harga
         st.subheader("Trend Produksi dan Harga Tahunan")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.lineplot(data=morotai_data, x='tahun', y='produksi_pertahun', marker='o', color='blue', label='Produksi (kg)', ax=ax)
-        sns.lineplot(data=morotai_data, x='tahun', y='harga', marker='o', color='orange', label='Harga (Rp/kg)', ax=ax)
-        ax.set_title("Trend Produksi dan Harga Tahunan", fontsize=16)
-        ax.set_xlabel("Tahun", fontsize=12)
-        ax.set_ylabel("Produksi (kg) / Harga (Rp/kg)", fontsize=12)
-        ax.legend()
-        ax.grid(True)
-        st.pyplot(fig)
-        plt.close()
+        show_chart(charts[plot_production_price_trend])
+
+        # Rata-rata bergulir, pertumbuhan tahunan, dan volatilitas per wilayah
+        show_trends(df)
         
         # Distribusi Permintaan
         st.subheader("Distribusi Permintaan Ayam")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.countplot(data=morotai_data, x='permintaan_ayam', palette='cool', hue='permintaan_ayam', legend=False, ax=ax)
-        ax.set_title("Distribusi Permintaan Ayam", fontsize=16)
-        ax.set_xlabel("Kategori Permintaan", fontsize=12)
-        ax.set_ylabel("Jumlah Kasus", fontsize=12)
-        ax.grid(axis='y')
-        st.pyplot(fig)
-        plt.close()
+        show_chart(charts[plot_demand_distribution])
         
         # Posisi Kompetitif
         st.subheader("Posisi Kompetitif Antar Wilayah")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(data=df, x='wilayah', y='produksi_pertahun', hue='wilayah', palette='viridis', legend=False, ax=ax)
-        ax.set_title("Perbandingan Produksi Antar Wilayah", fontsize=16)
-        ax.set_xlabel("Wilayah", fontsize=12)
-        ax.set_ylabel("Produksi Pertahun (kg)", fontsize=12)
-        ax.grid(axis='y')
-        st.pyplot(fig)
-        plt.close()
+        show_chart(charts[plot_regional_production])
         
         # Kesimpulan
-        st.markdown("""
-        **Kesimpulan:**
-        - Produksi ayam di Morotai menunjukkan tren yang fluktuatif, dengan peningkatan signifikan pada tahun 2024.
-        - Permintaan pasar didominasi oleh kategori "sedang", menunjukkan potensi peningkatan melalui strategi pemasaran.
-        - Morotai memiliki posisi kompetitif yang cukup baik, tetapi perlu meningkatkan produksi untuk bersaing dengan wilayah lain.
-        """)
+        st.markdown(conclusion_text(conclusions['overview']))
 
     # Tab 2: Analisis Detail Pasar Ternak Ayam di Morotai
     with tabs[1]:
@@ -83,20 +208,12 @@ def main():
         
         # Contoh analisis detail pasar
         st.subheader("Distribusi Harga per Kategori Permintaan")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.boxplot(data=morotai_data, x='permintaan_ayam', y='harga', hue='permintaan_ayam', palette='cool', legend=False, ax=ax)
-        ax.set_title("Distribusi Harga per Kategori Permintaan", fontsize=16)
-        ax.set_xlabel("Kategori Permintaan", fontsize=12)
-        ax.set_ylabel("Harga (Rp/kg)", fontsize=12)
-        ax.grid(axis='y')
-        st.pyplot(fig)
-        plt.close()
+        show_chart(charts[plot_price_by_demand])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Harga ayam cenderung lebih tinggi di wilayah dengan permintaan tinggi.
-        - Wilayah dengan permintaan rendah memiliki variasi harga yang lebih besar.
-        """)
+        st.markdown(conclusion_text(conclusions['price_demand']))
+
+        # Segmentasi wilayah dan catatan produksi berdasarkan fitur kandang dan pakan
+        show_clustering(df, POULTRY_FEATURES)
 
     # Tab 3: Analisis Profitabilitas Detail Ternak Ayam di Morotai
     with tabs[2]:
@@ -104,21 +221,12 @@ def main():
         
         # Contoh analisis profitabilitas
         st.subheader("Profitabilitas per Tahun")
-        morotai_data['profit'] = morotai_data['harga'] * morotai_data['produksi_pertahun']
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.lineplot(data=morotai_data, x='tahun', y='profit', marker='o', color='green', ax=ax)
-        ax.set_title("Profitabilitas per Tahun", fontsize=16)
-        ax.set_xlabel("Tahun", fontsize=12)
-        ax.set_ylabel("Profit (Rp)", fontsize=12)
-        ax.grid(True)
-        st.pyplot(fig)
-        plt.close()
+        show_chart(charts[plot_profit_trend])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Profitabilitas meningkat signifikan pada tahun 2024.
-        - Peningkatan profitabilitas disebabkan oleh peningkatan produksi dan harga.
-        """)
+        st.markdown(conclusion_text(conclusions['profit']))
+
+        # Simulasi laba dengan biaya pakan, kapasitas, dan kondisi kandang
+        show_profitability(df)
 
     # Tab 4: Analisis dan Rencana Implementasi
     with tabs[3]:
@@ -138,20 +246,9 @@ def main():
         
         # Contoh analisis peluang pasar
         st.subheader("Peluang Pasar Berdasarkan Permintaan")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(data=morotai_data, x='permintaan_ayam', y='produksi_pertahun', hue='permintaan_ayam', palette='cool', legend=False, ax=ax)
-        ax.set_title("Peluang Pasar Berdasarkan Permintaan", fontsize=16)
-        ax.set_xlabel("Kategori Permintaan", fontsize=12)
-        ax.set_ylabel("Produksi Pertahun (kg)", fontsize=12)
-        ax.grid(axis='y')
-        st.pyplot(fig)
-        plt.close()
+        show_chart(charts[plot_market_opportunity])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Peluang pasar terbesar ada di wilayah dengan permintaan tinggi.
-        - Wilayah dengan permintaan sedang memiliki potensi untuk ditingkatkan melalui strategi pemasaran.
-        """)
+        st.markdown(conclusion_text(conclusions['opportunity']))
 
     # Tab 6: Kesimpulan Utama
     with tabs[5]:
@@ -165,6 +262,9 @@ def main():
         - Manajemen risiko dan diversifikasi produk diperlukan untuk mengurangi fluktuasi harga.
         """)
 
+    # Unduhan tabel analisis dan data mentah
+    show_export(df, EXPORT_TABLES, key='ayam_export', title='ayam')
+
 # Panggil fungsi main() untuk menjalankan dashboard
 if __name__ == "__main__":
     main()
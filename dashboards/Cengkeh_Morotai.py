@@ -2,25 +2,245 @@ import streamlit as st
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.preprocessing import LabelEncoder
 import plotly.express as px
 import graphviz
 import matplotlib.ticker as ticker
 
-# Fungsi untuk memuat data
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/data_cengkeh.csv")
+from core.analysis import (analyze_correlation, analyze_market_demand, analyze_price_per_region,
+                           analyze_production_risk, analyze_rain_production, analyze_top_regions,
+                           analyze_yearly_production)
+from core.cache import exclude_outliers_toggle, load_dataset, show_data_quality, single_flight, versioned_cache
+from core.clustering import CROP_FEATURES, show_clustering
+from core.export import COMMON_TABLES, show_export
+from core.longtail import group_top, region_year_lines, top_n, top_n_mean
+from core.narrative import (conclusion_text, describe_change, describe_correlation,
+                            describe_extremes, describe_ranking, describe_share,
+                            unit_formatter)
+from core.rendering import render_chart, show_chart, submit_charts
+from core.montecarlo import revenue_risk, show_revenue_risk
+from core.schema import global_codes
+from core.trends import analyze_trends, show_rolling_risk, show_trends
+from core.whatif import fit_response, show_whatif
+
+# Fungsi untuk memuat data (di-cache per versi dataset)
+def load_data(exclude_outliers=False):
+    df = load_dataset("cengkeh", exclude_outliers)
     return df
 
-def main():
-    # Memuat data
+# Fungsi untuk mengubah data kategorikal menjadi numerik untuk analisis korelasi
+# (kode tetap rendah=0, sedang=1, tinggi=2 walaupun ada tingkat yang tidak muncul)
+def encode_categories(data):
+    data = data.copy()
+    data['curah_hujan_encoded'] = global_codes(data['curah_hujan'], 'level')
+    data['permintaan_pasar_encoded'] = global_codes(data['permintaan_pasar'], 'level')
+    return data
+
+# Kolom korelasi; curah hujan dan permintaan pasar memakai kode 0/1/2
+CORRELATION_COLUMNS = ('produksi_pertahun', 'curah_hujan', 'harga', 'permintaan_pasar')
+
+# Fungsi untuk menyusun teks kesimpulan dari hasil analisis (di-cache per versi dataset)
+@single_flight
+@versioned_cache
+def build_conclusions(data):
+    kg = unit_formatter('kg')
+    rupiah = unit_formatter('Rp')
+    percent = unit_formatter('%', 2)
+
+    yearly_production = analyze_yearly_production(data)['sum']
+    production_by_region = analyze_top_regions(data)
+    rain_production = analyze_rain_production(data)['mean']
+    demand_counts = data['permintaan_pasar'].value_counts()
+    demand_production = analyze_market_demand(data)['produksi_pertahun']
+    price_by_region = analyze_price_per_region(data)['harga']['mean']
+    correlation = analyze_correlation(data, CORRELATION_COLUMNS)
+    risk = analyze_production_risk(data)
+
+    return {
+        'trend': [
+            describe_extremes(yearly_production, "Total produksi cengkeh", 'tahun ', kg),
+            describe_change(yearly_production, "total produksi cengkeh"),
+        ],
+        'top_regions': [
+            describe_ranking(production_by_region['sum'], "total produksi", fmt=kg),
+        ],
+        'rain': [
+            describe_extremes(rain_production, "Rata-rata produksi", 'curah hujan ', kg),
+        ],
+        'market_demand': [
+            describe_share(demand_counts, "Permintaan pasar", 'permintaan '),
+            describe_extremes(demand_production, "Rata-rata produksi", 'permintaan pasar ', kg),
+        ],
+        'price': [
+            describe_extremes(price_by_region, "Harga rata-rata cengkeh", '', rupiah),
+        ],
+        'correlation': [
+            describe_correlation(correlation.loc['produksi_pertahun', 'harga'], "produksi", "harga"),
+            describe_correlation(correlation.loc['produksi_pertahun', 'curah_hujan'], "produksi", "curah hujan"),
+        ],
+        'potential': [
+            describe_ranking(production_by_region['mean'], "rata-rata produksi", fmt=kg),
+        ],
+        'distribution': [
+            describe_extremes(risk['cv'], "Koefisien variasi produksi", '', percent),
+            "Wilayah dengan koefisien variasi rendah memiliki produksi yang lebih stabil.",
+        ],
+        'risk': [
+            describe_extremes(risk['std'], "Standar deviasi produksi", '', kg),
+            "Wilayah dengan risiko produksi tinggi memerlukan strategi mitigasi risiko yang lebih baik.",
+        ],
+        'opportunity': [
+            describe_extremes(demand_production, "Rata-rata produksi", 'permintaan pasar ', kg),
+        ],
+    }
+
+# Fungsi-fungsi grafik (dirender menjadi PNG di pool proses)
+def plot_production_trend(data):
+    lines = region_year_lines(data)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.lineplot(data=lines, x='tahun', y='produksi_pertahun', hue='wilayah', marker='o', ax=ax)
+    ax.set_title("Trend Produksi Cengkeh per Tahun")
+    ax.set_xlabel("Tahun")
+    ax.set_ylabel("Produksi (kg)")
+    ax.grid(True)
+    return fig
+
+def plot_top_regions(data):
+    production_by_region = top_n(analyze_top_regions(data)['sum'])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=production_by_region.index, y=production_by_region.values, palette='viridis', ax=ax)
+    ax.set_title("Produksi Cengkeh per Wilayah")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Total Produksi (kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_rain_production(data):
+    data = encode_categories(data)
+    top_regions = top_n(analyze_top_regions(data)['sum'], others=None).index
+    data = data.assign(wilayah=group_top(data['wilayah'], top_regions))
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(data=data, x='curah_hujan_encoded', y='produksi_pertahun', hue='wilayah', ax=ax)
+    ax.set_title("Pengaruh Curah Hujan terhadap Produksi Cengkeh")
+    ax.set_xlabel("Curah Hujan (Encoded)")
+    ax.set_ylabel("Produksi (kg)")
+    return fig
+
+def plot_market_demand(data):
+    demand_counts = data['permintaan_pasar'].value_counts()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=demand_counts.index, y=demand_counts.values, palette='cool', ax=ax)
+    ax.set_title("Distribusi Permintaan Pasar")
+    ax.set_xlabel("Kategori Permintaan")
+    ax.set_ylabel("Jumlah Kasus")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_price_per_region(data):
+    price_by_region = top_n_mean(analyze_price_per_region(data)['harga']['mean'], data['wilayah'])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=price_by_region.index, y=price_by_region.values, palette='magma', ax=ax)
+    ax.set_title("Harga Rata-Rata Cengkeh per Wilayah")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Harga (Rp/kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_correlation(data):
+    correlation_matrix = analyze_correlation(data, CORRELATION_COLUMNS)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', ax=ax)
+    ax.set_title("Korelasi antara Produksi, Curah Hujan, Harga, dan Permintaan Pasar")
+    return fig
+
+def plot_potential_regions(data):
+    potential_regions = top_n_mean(analyze_top_regions(data)['mean'], data['wilayah'])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=potential_regions.index, y=potential_regions.values, palette='plasma', ax=ax)
+    ax.set_title("Wilayah dengan Potensi Produksi Tertinggi")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Rata-Rata Produksi (kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_production_distribution(data):
+    top_regions = top_n(analyze_top_regions(data)['sum'], others=None).index
+    data = data.assign(wilayah=group_top(data['wilayah'], top_regions))
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.boxplot(data=data, x='wilayah', y='produksi_pertahun', palette='viridis', ax=ax)
+    ax.set_title("Distribusi Produksi per Wilayah")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Produksi (kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_production_risk(data):
+    risk_data = top_n(analyze_production_risk(data)['std'], others=None).rename('produksi_pertahun').reset_index()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=risk_data['wilayah'], y=risk_data['produksi_pertahun'], palette='coolwarm', ax=ax)
+    ax.set_title("Risiko Produksi per Wilayah")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Standar Deviasi Produksi (kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_market_opportunity(data):
+    market_demand = analyze_market_demand(data)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=market_demand.index, y=market_demand['produksi_pertahun'], palette='cool', ax=ax)
+    ax.set_title("Peluang Pasar Berdasarkan Permintaan")
+    ax.set_xlabel("Kategori Permintaan")
+    ax.set_ylabel("Produksi (kg)")
+    return fig
+
+# Grafik yang ditampilkan dashboard
+CHARTS = [
+    plot_production_trend,
+    plot_top_regions,
+    plot_rain_production,
+    plot_market_demand,
+    plot_price_per_region,
+    plot_correlation,
+    plot_potential_regions,
+    plot_production_distribution,
+    plot_production_risk,
+    plot_market_opportunity,
+]
+
+# Tabel analisis yang dapat diekspor (diambil dari hasil yang sudah di-cache)
+EXPORT_TABLES = {
+    "Produksi per Tahun": analyze_yearly_production,
+    "Wilayah dengan Produksi Tertinggi": analyze_top_regions,
+    "Produksi per Curah Hujan": analyze_rain_production,
+    "Permintaan Pasar": analyze_market_demand,
+    "Harga per Wilayah": analyze_price_per_region,
+    "Korelasi": lambda df: analyze_correlation(df, CORRELATION_COLUMNS),
+    "Risiko Produksi per Wilayah": analyze_production_risk,
+    **COMMON_TABLES,
+}
+
+# Daftar perhitungan yang dipanaskan di latar belakang saat server mulai
+def warmup_tasks():
     data = load_data()
+    return [
+        *[(builder.__name__, render_chart, builder, data) for builder in CHARTS],
+        ("Simulasi Monte Carlo", revenue_risk, data),
+        ("Analisis Jendela Waktu", analyze_trends, data),
+        ("Kesimpulan", build_conclusions, data),
+        ("Model What-If", fit_response, data),
+        ("Data Tanpa Outlier", load_data, True),
+    ]
+
+def main():
+    # Memuat data (tanpa outlier bila sakelar di sidebar aktif)
+    data = load_data(exclude_outliers_toggle())
+    show_data_quality("cengkeh")
 
-    # Mengubah data kategorikal menjadi numerik untuk analisis korelasi
-    label_encoder = LabelEncoder()
-    data['curah_hujan_encoded'] = label_encoder.fit_transform(data['curah_hujan'])
-    data['permintaan_pasar_encoded'] = label_encoder.fit_transform(data['permintaan_pasar'])
+    # Memulai rendering seluruh grafik secara paralel; setiap grafik
+    # ditampilkan begitu selesai sehingga grafik pertama muncul lebih cepat
+    charts = submit_charts(CHARTS, data)
+
+    # Teks kesimpulan disusun dari hasil analisis versi dataset yang sama
+    conclusions = build_conclusions(data)
 
     # Tab untuk menampilkan analisis
     tabs = st.tabs([
@@ -37,124 +257,48 @@ def main():
         
         # Trend Produksi per Tahun
         st.subheader("Trend Produksi per Tahun")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.lineplot(data=data, x='tahun', y='produksi_pertahun', hue='wilayah', marker='o', ax=ax)
-        ax.set_title("Trend Produksi Cengkeh per Tahun")
-        ax.set_xlabel("Tahun")
-        ax.set_ylabel("Produksi (kg)")
-        ax.grid(True)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_production_trend])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Produksi cengkeh di Pulau Morotai menunjukkan fluktuasi dari tahun ke tahun.
-        - Puncak produksi terjadi pada tahun 2022, sementara produksi terendah terjadi pada tahun 2023.
-        - Tren produksi cenderung menurun setelah tahun 2022, menunjukkan perlunya intervensi untuk meningkatkan produktivitas.
-        """)
+        st.markdown(conclusion_text(conclusions['trend']))
+
+        # Rata-rata bergulir, pertumbuhan tahunan, dan volatilitas per wilayah
+        show_trends(data)
         
         # Wilayah dengan Produksi Tertinggi
         st.subheader("Wilayah dengan Produksi Tertinggi")
-        production_by_region = data.groupby('wilayah')['produksi_pertahun'].sum().sort_values(ascending=False)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=production_by_region.index, y=production_by_region.values, palette='viridis', ax=ax)
-        ax.set_title("Produksi Cengkeh per Wilayah")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Total Produksi (kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_top_regions])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Kabupaten Pulau Talibu memiliki produksi tertinggi dibandingkan wilayah lainnya.
-        - Wilayah lain seperti Halmahera Tengah dan Halmahera Barat juga menunjukkan produksi yang signifikan.
-        """)
+        st.markdown(conclusion_text(conclusions['top_regions']))
         
         # Pengaruh Curah Hujan terhadap Produksi
         st.subheader("Pengaruh Curah Hujan terhadap Produksi")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.scatterplot(data=data, x='curah_hujan_encoded', y='produksi_pertahun', hue='wilayah', ax=ax)
-        ax.set_title("Pengaruh Curah Hujan terhadap Produksi Cengkeh")
-        ax.set_xlabel("Curah Hujan (Encoded)")
-        ax.set_ylabel("Produksi (kg)")
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_rain_production])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Curah hujan sedang cenderung menghasilkan produksi yang lebih tinggi.
-        - Curah hujan rendah dan tinggi memiliki dampak negatif terhadap produksi cengkeh.
-        """)
+        st.markdown(conclusion_text(conclusions['rain']))
         
         # Analisis Permintaan Pasar
         st.subheader("Analisis Permintaan Pasar")
-        demand_counts = data['permintaan_pasar'].value_counts()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=demand_counts.index, y=demand_counts.values, palette='cool', ax=ax)
-        ax.set_title("Distribusi Permintaan Pasar")
-        ax.set_xlabel("Kategori Permintaan")
-        ax.set_ylabel("Jumlah Kasus")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_market_demand])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Permintaan pasar tinggi mendominasi, diikuti oleh permintaan rendah dan sedang.
-        - Permintaan pasar tinggi memiliki jumlah kasus yang lebih sedikit, menunjukkan potensi untuk meningkatkan permintaan melalui pemasaran yang tepat.
-        """)
+        st.markdown(conclusion_text(conclusions['market_demand']))
         
         # Harga per Wilayah
         st.subheader("Harga per Wilayah")
-        price_by_region = data.groupby('wilayah')['harga'].mean().sort_values(ascending=False)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=price_by_region.index, y=price_by_region.values, palette='magma', ax=ax)
-        ax.set_title("Harga Rata-Rata Cengkeh per Wilayah")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Harga (Rp/kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_price_per_region])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Harga cengkeh bervariasi antar wilayah, dengan Kabupaten Halmahera Timur memiliki harga tertinggi.
-        - Harga terendah ditemukan di Kabupaten Halmahera Selatan, yang mungkin disebabkan oleh volume produksi yang lebih tinggi.
-        """)
+        st.markdown(conclusion_text(conclusions['price']))
         
         # Analisis Korelasi
         st.subheader("Analisis Korelasi")
-        correlation_matrix = data[['produksi_pertahun', 'curah_hujan_encoded', 'harga', 'permintaan_pasar_encoded']].corr()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', ax=ax)
-        ax.set_title("Korelasi antara Produksi, Curah Hujan, Harga, dan Permintaan Pasar")
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_correlation])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Korelasi antara produksi dan harga sangat lemah, menunjukkan bahwa peningkatan produksi tidak secara langsung memengaruhi harga.
-        - Curah hujan memiliki korelasi positif yang lemah dengan produksi, menunjukkan bahwa curah hujan sedang dapat meningkatkan produksi.
-        """)
+        st.markdown(conclusion_text(conclusions['correlation']))
         
         # Wilayah Paling Potensial
         st.subheader("Wilayah Paling Potensial")
-        potential_regions = data.groupby('wilayah')['produksi_pertahun'].mean().sort_values(ascending=False)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=potential_regions.index, y=potential_regions.values, palette='plasma', ax=ax)
-        ax.set_title("Wilayah dengan Potensi Produksi Tertinggi")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Rata-Rata Produksi (kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_potential_regions])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Kabupaten Halmahera Utara memiliki potensi produksi tertinggi, diikuti oleh Pulau Morotai dan Halmahera Barat.
-        - Wilayah-wilayah ini memiliki rata-rata produksi yang tinggi, menunjukkan potensi untuk pengembangan lebih lanjut.
-        """)
+        st.markdown(conclusion_text(conclusions['potential']))
 
     # Tab 2: Analisis Data Cengkeh
     with tabs[1]:
@@ -162,20 +306,12 @@ def main():
         
         # Contoh analisis data cengkeh
         st.subheader("Distribusi Produksi per Wilayah")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.boxplot(data=data, x='wilayah', y='produksi_pertahun', palette='viridis', ax=ax)
-        ax.set_title("Distribusi Produksi per Wilayah")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Produksi (kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_production_distribution])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Produksi cengkeh bervariasi antar wilayah, dengan beberapa wilayah menunjukkan produksi yang lebih stabil.
-        - Wilayah dengan produksi tinggi memiliki potensi untuk ditingkatkan lebih lanjut.
-        """)
+        st.markdown(conclusion_text(conclusions['distribution']))
+
+        # Segmentasi wilayah dan catatan produksi berdasarkan lahan dan kesuburan
+        show_clustering(data, CROP_FEATURES)
 
     # Tab 3: Analisis Risiko dan Rekomendasi Implementasi
     with tabs[2]:
@@ -183,21 +319,18 @@ def main():
         
         # Contoh analisis risiko
         st.subheader("Risiko Produksi per Wilayah")
-        risk_data = data.groupby('wilayah')['produksi_pertahun'].std().reset_index()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=risk_data['wilayah'], y=risk_data['produksi_pertahun'], palette='coolwarm', ax=ax)
-        ax.set_title("Risiko Produksi per Wilayah")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Standar Deviasi Produksi (kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_production_risk])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Wilayah dengan risiko produksi tinggi memerlukan strategi mitigasi risiko yang lebih baik.
-        - Rekomendasi implementasi termasuk diversifikasi produk dan peningkatan kualitas lahan.
-        """)
+        st.markdown(conclusion_text(conclusions['risk']))
+
+        # Risiko produksi bergulir per tahun
+        show_rolling_risk(data, key='cengkeh_rolling_risk')
+
+        # Simulasi pendapatan per wilayah (VaR dan peluang rugi)
+        show_revenue_risk(data, key='cengkeh_montecarlo')
+
+        # Simulasi produksi bila lahan, kesuburan, atau curah hujan berubah
+        show_whatif(data, key='cengkeh_whatif')
 
     # Tab 4: Analisis Peluang Pasar Cengkeh di Pulau Morotai
     with tabs[3]:
@@ -205,19 +338,9 @@ def main():
         
         # Contoh analisis peluang pasar
         st.subheader("Peluang Pasar Berdasarkan Permintaan")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(data=data, x='permintaan_pasar', y='produksi_pertahun', palette='cool', ax=ax)
-        ax.set_title("Peluang Pasar Berdasarkan Permintaan")
-        ax.set_xlabel("Kategori Permintaan")
-        ax.set_ylabel("Produksi (kg)")
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_market_opportunity])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Peluang pasar terbesar ada di wilayah dengan permintaan tinggi.
-        - Wilayah dengan permintaan sedang memiliki potensi untuk ditingkatkan melalui strategi pemasaran.
-        """)
+        st.markdown(conclusion_text(conclusions['opportunity']))
 
     # Tab 5: Kesimpulan Utama
     with tabs[4]:
@@ -231,6 +354,9 @@ def main():
         - Manajemen risiko dan diversifikasi produk diperlukan untuk mengurangi fluktuasi harga.
         """)
 
+    # Unduhan tabel analisis dan data mentah
+    show_export(data, EXPORT_TABLES, key='cengkeh_export', title='cengkeh')
+
 # Panggil fungsi main() untuk menjalankan dashboard
 if __name__ == "__main__":
     main()
@@ -2,64 +2,37 @@ import streamlit as st
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.preprocessing import LabelEncoder
 import plotly.express as px
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.linear_model import LinearRegression
 import matplotlib.ticker as ticker
 
-# Fungsi untuk memuat data
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/data_kakao.csv")
-    return df
+from core.analysis import (analyze_correlation, analyze_market_demand, analyze_potential_regions,
+                           analyze_price_per_region, analyze_production_risk, analyze_rain_production,
+                           analyze_top_regions, analyze_yearly_production)
+from core.cache import exclude_outliers_toggle, load_dataset, show_data_quality, single_flight, versioned_cache
+from core.clustering import CROP_FEATURES, show_clustering
+from core.export import COMMON_TABLES, show_export
+from core.longtail import group_top, region_year_lines, show_table, top_n, top_n_mean
+from core.narrative import (conclusion_text, describe_change, describe_correlation,
+                            describe_extremes, describe_ranking, describe_slope,
+                            unit_formatter)
+from core.rendering import render_chart, show_chart, submit_charts
+from core.montecarlo import risk_columns, revenue_risk, show_revenue_risk
+from core.trends import analyze_trends, show_rolling_risk, show_trends
+from core.whatif import fit_response, show_whatif
+
+# Kolom faktor harga (korelasi terhadap harga)
+PRICE_FACTOR_COLUMNS = ('harga', 'produksi_pertahun', 'luas_lahan_hektar', 'tingkat_kesuburan_tanah')
 
-# Fungsi-fungsi analisis
-def analyze_yearly_production(df):
-    yearly_production = df.groupby('tahun')['produksi_pertahun'].agg(['mean', 'sum']).round(2)
-    return yearly_production
-
-def analyze_top_regions(df):
-    top_regions = df.groupby('wilayah')['produksi_pertahun'].agg(['mean', 'sum']).round(2).sort_values('sum', ascending=False)
-    return top_regions
-
-def analyze_rain_production(df):
-    rain_production = df.groupby('curah_hujan')['produksi_pertahun'].agg(['mean', 'count']).round(2)
-    return rain_production
-
-def analyze_market_demand(df):
-    market_demand = df.groupby('permintaan_pasar').agg({
-        'produksi_pertahun': 'mean',
-        'harga': 'mean',
-        'wilayah': 'count'
-    }).round(2)
-    return market_demand
-
-def analyze_price_per_region(df):
-    price_analysis = df.groupby('wilayah').agg({
-        'harga': ['mean', 'min', 'max'],
-        'permintaan_pasar': lambda x: x.value_counts().index[0]
-    }).round(2)
-    return price_analysis
-
-def analyze_correlation(df):
-    correlation = df[['produksi_pertahun', 'harga', 'luas_lahan_hektar', 'tingkat_konsumsi_perkapita_perkg']].corr()
-    return correlation
-
-def analyze_potential_regions(df):
-    potential_regions = df.groupby('wilayah').agg({
-        'produksi_pertahun': 'mean',
-        'permintaan_pasar': lambda x: x.value_counts().index[0],
-        'tingkat_konsumsi_perkapita_perkg': 'mean',
-        'harga': 'mean'
-    }).round(2)
-    potential_regions['skor_potensi'] = (
-        (potential_regions['produksi_pertahun'] / potential_regions['produksi_pertahun'].max()) * 0.3 +
-        (potential_regions['tingkat_konsumsi_perkapita_perkg'] / potential_regions['tingkat_konsumsi_perkapita_perkg'].max()) * 0.3 +
-        (potential_regions['harga'] / potential_regions['harga'].max()) * 0.4
-    ).round(2)
-    return potential_regions
+# Fungsi untuk memuat data (di-cache per versi dataset)
+def load_data(exclude_outliers=False):
+    df = load_dataset("kakao", exclude_outliers)
+    return df
 
+# Fungsi-fungsi analisis khusus kakao (analisis umum ada di core/analysis.py)
+@single_flight
+@versioned_cache
 def generate_recommendations(df):
     """
     Menghasilkan rekomendasi implementasi strategi berdasarkan analisis wilayah dan risiko.
@@ -67,16 +40,278 @@ def generate_recommendations(df):
     # Contoh sederhana: rekomendasi berdasarkan skor potensi
     potential_regions = analyze_potential_regions(df)
     recommendations = potential_regions.sort_values('skor_potensi', ascending=False)
-    return recommendations
+    # Value-at-risk dan peluang rugi dari simulasi Monte Carlo pendapatan
+    return recommendations.join(risk_columns(df, recommendations.index))
 
-def main():
-    # Memuat data
+@single_flight
+@versioned_cache
+def build_conclusions(df):
+    """
+    Menyusun teks kesimpulan setiap bagian dashboard dari hasil analisis.
+    """
+    kg = unit_formatter('kg')
+    rupiah = unit_formatter('Rp')
+    score = unit_formatter('', 2)
+    percent = unit_formatter('%', 2)
+
+    yearly_production = analyze_yearly_production(df)
+    top_regions = analyze_top_regions(df)
+    rain_production = analyze_rain_production(df)
+    market_demand = analyze_market_demand(df)
+    price_analysis = analyze_price_per_region(df)
+    correlation = analyze_correlation(df)
+    potential_scores = analyze_potential_regions(df)['skor_potensi']
+    market_share = top_regions['sum'] / top_regions['sum'].sum() * 100
+    risk = analyze_production_risk(df)
+    price_factors = analyze_correlation(df, PRICE_FACTOR_COLUMNS)['harga']
+
+    return {
+        'trend': [
+            describe_extremes(yearly_production['sum'], "Total produksi kakao", 'tahun ', kg),
+            describe_change(yearly_production['sum'], "total produksi kakao"),
+        ],
+        'top_regions': [
+            describe_ranking(top_regions['sum'], "total produksi", fmt=kg),
+            "Wilayah dengan produksi tertinggi memiliki potensi besar untuk pengembangan lebih lanjut.",
+        ],
+        'rain': [
+            describe_extremes(rain_production['mean'], "Rata-rata produksi", 'curah hujan ', kg),
+        ],
+        'market_demand': [
+            describe_extremes(market_demand['produksi_pertahun'], "Rata-rata produksi", 'permintaan pasar ', kg),
+            describe_extremes(market_demand['harga'], "Harga rata-rata", 'permintaan pasar ', rupiah),
+        ],
+        'price': [
+            describe_extremes(price_analysis['harga']['mean'], "Harga rata-rata kakao", '', rupiah),
+        ],
+        'correlation': [
+            describe_correlation(correlation.loc['produksi_pertahun', 'harga'], "produksi per tahun", "harga"),
+            describe_correlation(correlation.loc['produksi_pertahun', 'luas_lahan_hektar'], "produksi per tahun", "luas lahan"),
+        ],
+        'potential': [
+            describe_ranking(potential_scores, "skor potensi", fmt=score),
+        ],
+        'seasonality': [
+            describe_extremes(rain_production['mean'], "Rata-rata produksi", 'curah hujan ', kg),
+            describe_extremes(rain_production['harga'], "Harga rata-rata", 'curah hujan ', rupiah),
+        ],
+        'projection': [
+            describe_slope(yearly_production['sum'], "total produksi kakao", kg),
+            describe_change(yearly_production['sum'], "total produksi kakao"),
+        ],
+        'market_share': [
+            describe_ranking(market_share, "pangsa produksi", fmt=percent),
+        ],
+        'price_factors': [
+            describe_correlation(price_factors['produksi_pertahun'], "harga", "produksi per tahun"),
+            describe_correlation(price_factors['luas_lahan_hektar'], "harga", "luas lahan"),
+            describe_correlation(price_factors['tingkat_kesuburan_tanah'], "harga", "tingkat kesuburan tanah"),
+        ],
+        'regional_scores': [
+            describe_extremes(potential_scores, "Skor potensi", '', score),
+            "Wilayah dengan skor menengah memiliki potensi untuk ditingkatkan dengan intervensi yang tepat.",
+        ],
+        'risk': [
+            describe_extremes(risk['std'], "Standar deviasi produksi", '', kg),
+            describe_extremes(risk['cv'], "Koefisien variasi produksi", '', percent),
+            "Wilayah dengan risiko produksi tinggi memerlukan strategi mitigasi risiko untuk meningkatkan stabilitas produksi.",
+        ],
+        'opportunity': [
+            describe_extremes(market_demand['produksi_pertahun'], "Rata-rata produksi", 'permintaan pasar ', kg),
+        ],
+    }
+
+# Fungsi-fungsi grafik (dirender menjadi PNG di pool proses)
+def plot_production_trend(data):
+    lines = region_year_lines(data)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.lineplot(data=lines, x='tahun', y='produksi_pertahun', hue='wilayah', marker='o', ax=ax)
+    ax.set_title("Trend Produksi Kakao per Tahun")
+    ax.set_xlabel("Tahun")
+    ax.set_ylabel("Produksi (kg)")
+    ax.grid(True)
+    return fig
+
+def plot_top_regions(data):
+    top_regions = analyze_top_regions(data).head()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=top_regions.index, y=top_regions['sum'], palette='viridis', ax=ax)
+    ax.set_title("Produksi Kakao per Wilayah")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Total Produksi (kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_rain_production(data):
+    rain_production = analyze_rain_production(data)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=rain_production.index, y=rain_production['mean'], palette='coolwarm', ax=ax)
+    ax.set_title("Pengaruh Curah Hujan terhadap Produksi Kakao")
+    ax.set_xlabel("Curah Hujan")
+    ax.set_ylabel("Rata-Rata Produksi (kg)")
+    return fig
+
+def plot_market_demand(data):
+    market_demand = analyze_market_demand(data)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=market_demand.index, y=market_demand['produksi_pertahun'], palette='cool', ax=ax)
+    ax.set_title("Distribusi Permintaan Pasar")
+    ax.set_xlabel("Kategori Permintaan")
+    ax.set_ylabel("Rata-Rata Produksi (kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_price_per_region(data):
+    price_by_region = top_n_mean(analyze_price_per_region(data)['harga']['mean'], data['wilayah'])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=price_by_region.index, y=price_by_region.values, palette='magma', ax=ax)
+    ax.set_title("Harga Rata-Rata Kakao per Wilayah")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Harga (Rp/kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_correlation(data):
+    correlation = analyze_correlation(data)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.heatmap(correlation, annot=True, cmap='coolwarm', ax=ax)
+    ax.set_title("Korelasi antara Produksi, Curah Hujan, Harga, dan Permintaan Pasar")
+    return fig
+
+def plot_potential_regions(data):
+    potential_regions = analyze_potential_regions(data).sort_values('skor_potensi', ascending=False).head()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=potential_regions.index, y=potential_regions['skor_potensi'], palette='plasma', ax=ax)
+    ax.set_title("Wilayah dengan Potensi Produksi Tertinggi")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Skor Potensi")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_seasonality(data):
+    seasonality_data = data.groupby(['tahun', 'curah_hujan'])['produksi_pertahun'].mean().reset_index()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.lineplot(data=seasonality_data, x='tahun', y='produksi_pertahun', hue='curah_hujan', marker='o', ax=ax)
+    ax.set_title("Analisis Seasonality")
+    ax.set_xlabel("Tahun")
+    ax.set_ylabel("Produksi (kg)")
+    ax.grid(True)
+    return fig
+
+def plot_production_projection(data):
+    yearly_production = analyze_yearly_production(data)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.lineplot(data=yearly_production.reset_index(), x='tahun', y='sum', marker='o', ax=ax)
+    ax.set_title("Proyeksi Permintaan dan Produksi")
+    ax.set_xlabel("Tahun")
+    ax.set_ylabel("Total Produksi (kg)")
+    ax.grid(True)
+    return fig
+
+def plot_market_share(data):
+    market_share = top_n(analyze_top_regions(data)['sum'])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=market_share.index, y=market_share.values, palette='viridis', ax=ax)
+    ax.set_title("Analisis Kompetisi (Market Share)")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Total Produksi (kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_price_factors(data):
+    top_regions = top_n(analyze_top_regions(data)['sum'], others=None).index
+    data = data.assign(wilayah=group_top(data['wilayah'], top_regions))
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(data=data, x='produksi_pertahun', y='harga', hue='wilayah', ax=ax)
+    ax.set_title("Analisis Faktor Harga")
+    ax.set_xlabel("Produksi (kg)")
+    ax.set_ylabel("Harga (Rp/kg)")
+    return fig
+
+def plot_regional_scores(data):
+    potential_regions = analyze_potential_regions(data).sort_values('skor_potensi', ascending=False).head()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=potential_regions.index, y=potential_regions['skor_potensi'], palette='plasma', ax=ax)
+    ax.set_title("Analisis Skor Wilayah")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Skor Potensi")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_production_risk(data):
+    risk_data = top_n(analyze_production_risk(data)['std'], others=None).rename('produksi_pertahun').reset_index()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=risk_data['wilayah'], y=risk_data['produksi_pertahun'], palette='coolwarm', ax=ax)
+    ax.set_title("Analisis Risiko Produksi")
+    ax.set_xlabel("Wilayah")
+    ax.set_ylabel("Standar Deviasi Produksi (kg)")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
+    return fig
+
+def plot_market_opportunity(data):
+    market_demand = analyze_market_demand(data)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=market_demand.index, y=market_demand['produksi_pertahun'], palette='cool', ax=ax)
+    ax.set_title("Peluang Pasar Berdasarkan Permintaan")
+    ax.set_xlabel("Kategori Permintaan")
+    ax.set_ylabel("Produksi (kg)")
+    return fig
+
+# Grafik yang ditampilkan dashboard
+CHARTS = [
+    plot_production_trend,
+    plot_top_regions,
+    plot_rain_production,
+    plot_market_demand,
+    plot_price_per_region,
+    plot_correlation,
+    plot_potential_regions,
+    plot_seasonality,
+    plot_production_projection,
+    plot_market_share,
+    plot_price_factors,
+    plot_regional_scores,
+    plot_production_risk,
+    plot_market_opportunity,
+]
+
+# Tabel analisis yang dapat diekspor (diambil dari hasil yang sudah di-cache)
+EXPORT_TABLES = {
+    "Produksi per Tahun": analyze_yearly_production,
+    "Wilayah dengan Produksi Tertinggi": analyze_top_regions,
+    "Produksi per Curah Hujan": analyze_rain_production,
+    "Permintaan Pasar": analyze_market_demand,
+    "Harga per Wilayah": analyze_price_per_region,
+    "Korelasi": analyze_correlation,
+    "Wilayah Potensial": analyze_potential_regions,
+    "Rekomendasi Implementasi": generate_recommendations,
+    **COMMON_TABLES,
+}
+
+# Daftar perhitungan yang dipanaskan di latar belakang saat server mulai
+def warmup_tasks():
     data = load_data()
+    return [
+        *[(builder.__name__, render_chart, builder, data) for builder in CHARTS],
+        ("Simulasi Monte Carlo", revenue_risk, data),
+        ("Rekomendasi Implementasi", generate_recommendations, data),
+        ("Analisis Jendela Waktu", analyze_trends, data),
+        ("Kesimpulan", build_conclusions, data),
+        ("Model What-If", fit_response, data),
+        ("Data Tanpa Outlier", load_data, True),
+    ]
+
+def main():
+    # Memuat data (tanpa outlier bila sakelar di sidebar aktif)
+    data = load_data(exclude_outliers_toggle())
+    show_data_quality("kakao")
+
+    # Memulai rendering seluruh grafik secara paralel; setiap grafik
+    # ditampilkan begitu selesai sehingga grafik pertama muncul lebih cepat
+    charts = submit_charts(CHARTS, data)
 
-    # Mengubah data kategorikal menjadi numerik untuk analisis korelasi
-    label_encoder = LabelEncoder()
-    data['curah_hujan_encoded'] = label_encoder.fit_transform(data['curah_hujan'])
-    data['permintaan_pasar_encoded'] = label_encoder.fit_transform(data['permintaan_pasar'])
+    # Teks kesimpulan disusun dari hasil analisis versi dataset yang sama
+    conclusions = build_conclusions(data)
 
     # Tab untuk menampilkan analisis
     tabs = st.tabs([
@@ -93,125 +328,48 @@ def main():
         
         # Trend Produksi per Tahun
         st.subheader("Trend Produksi per Tahun")
-        yearly_production = analyze_yearly_production(data)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.lineplot(data=data, x='tahun', y='produksi_pertahun', hue='wilayah', marker='o', ax=ax)
-        ax.set_title("Trend Produksi Kakao per Tahun")
-        ax.set_xlabel("Tahun")
-        ax.set_ylabel("Produksi (kg)")
-        ax.grid(True)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_production_trend])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik menunjukkan fluktuasi produksi kakao dari tahun ke tahun. Puncak produksi terjadi pada tahun tertentu (misalnya, 2022), sementara produksi terendah terjadi pada tahun lainnya (misalnya, 2023).
-        - Produksi rata-rata per tahun bervariasi, dengan tahun tertentu menunjukkan produksi rata-rata yang lebih tinggi dibandingkan tahun lainnya.
-        """)
+        st.markdown(conclusion_text(conclusions['trend']))
+
+        # Rata-rata bergulir, pertumbuhan tahunan, dan volatilitas per wilayah
+        show_trends(data)
         
         # Wilayah dengan Produksi Tertinggi
         st.subheader("Wilayah dengan Produksi Tertinggi")
-        top_regions = analyze_top_regions(data).head()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=top_regions.index, y=top_regions['sum'], palette='viridis', ax=ax)
-        ax.set_title("Produksi Kakao per Wilayah")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Total Produksi (kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_top_regions])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik batang menunjukkan wilayah dengan produksi tertinggi. Misalnya, Halmahera Utara memiliki produksi tertinggi, diikuti oleh wilayah lainnya.
-        - Wilayah dengan produksi tertinggi memiliki potensi besar untuk pengembangan lebih lanjut.
-        """)
+        st.markdown(conclusion_text(conclusions['top_regions']))
         
         # Pengaruh Curah Hujan terhadap Produksi
         st.subheader("Pengaruh Curah Hujan terhadap Produksi")
-        rain_production = analyze_rain_production(data)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=rain_production.index, y=rain_production['mean'], palette='coolwarm', ax=ax)
-        ax.set_title("Pengaruh Curah Hujan terhadap Produksi Kakao")
-        ax.set_xlabel("Curah Hujan")
-        ax.set_ylabel("Rata-Rata Produksi (kg)")
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_rain_production])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik menunjukkan bahwa curah hujan sedang memberikan dampak positif pada produksi kakao, dengan rata-rata produksi tertinggi.
-        - Curah hujan rendah dan tinggi menghasilkan rata-rata produksi yang lebih rendah.
-        """)
+        st.markdown(conclusion_text(conclusions['rain']))
         
         # Analisis Permintaan Pasar
         st.subheader("Analisis Permintaan Pasar")
-        market_demand = analyze_market_demand(data)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=market_demand.index, y=market_demand['produksi_pertahun'], palette='cool', ax=ax)
-        ax.set_title("Distribusi Permintaan Pasar")
-        ax.set_xlabel("Kategori Permintaan")
-        ax.set_ylabel("Rata-Rata Produksi (kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_market_demand])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik menunjukkan bahwa permintaan pasar tidak selalu selaras dengan produksi kakao. Permintaan pasar rendah memiliki produksi rata-rata lebih tinggi dibanding permintaan pasar tinggi.
-        - Harga rata-rata cenderung menurun seiring meningkatnya permintaan pasar.
-        """)
+        st.markdown(conclusion_text(conclusions['market_demand']))
         
         # Harga per Wilayah
         st.subheader("Harga per Wilayah")
-        price_analysis = analyze_price_per_region(data)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=price_analysis.index, y=price_analysis['harga']['mean'], palette='magma', ax=ax)
-        ax.set_title("Harga Rata-Rata Kakao per Wilayah")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Harga (Rp/kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_price_per_region])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik menunjukkan harga rata-rata kakao per wilayah. Misalnya, Halmahera Timur memiliki harga rata-rata tertinggi, sementara Halmahera Utara memiliki harga rata-rata terendah.
-        - Harga rata-rata mungkin mencerminkan volume produksi yang lebih tinggi di wilayah tertentu.
-        """)
+        st.markdown(conclusion_text(conclusions['price']))
         
         # Analisis Korelasi
         st.subheader("Analisis Korelasi")
-        correlation = analyze_correlation(data)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.heatmap(correlation, annot=True, cmap='coolwarm', ax=ax)
-        ax.set_title("Korelasi antara Produksi, Curah Hujan, Harga, dan Permintaan Pasar")
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_correlation])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Heatmap korelasi menunjukkan hubungan antara variabel produksi, harga, luas lahan, dan permintaan pasar.
-        - Hubungan antara produksi per tahun dengan harga menunjukkan korelasi yang lemah, mengindikasikan bahwa peningkatan produksi tidak secara langsung memengaruhi harga.
-        """)
+        st.markdown(conclusion_text(conclusions['correlation']))
         
         # Wilayah Paling Potensial
         st.subheader("Wilayah Paling Potensial")
-        potential_regions = analyze_potential_regions(data).sort_values('skor_potensi', ascending=False).head()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=potential_regions.index, y=potential_regions['skor_potensi'], palette='plasma', ax=ax)
-        ax.set_title("Wilayah dengan Potensi Produksi Tertinggi")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Skor Potensi")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_potential_regions])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik batang menunjukkan wilayah dengan skor potensi tertinggi. Misalnya, Halmahera Tengah dan Halmahera Utara dinilai paling potensial untuk pengembangan kakao.
-        - Wilayah ini memiliki rata-rata produksi tinggi, konsumsi per kapita stabil, dan harga rata-rata yang kompetitif.
-        """)
+        st.markdown(conclusion_text(conclusions['potential']))
 
     # Tab 2: Analisis Data Kakao
     with tabs[1]:
@@ -219,72 +377,30 @@ def main():
         
         # Analisis Seasonality
         st.subheader("Analisis Seasonality (Pola Produksi Berdasarkan Curah Hujan)")
-        seasonality_data = data.groupby(['tahun', 'curah_hujan'])['produksi_pertahun'].mean().reset_index()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.lineplot(data=seasonality_data, x='tahun', y='produksi_pertahun', hue='curah_hujan', marker='o', ax=ax)
-        ax.set_title("Analisis Seasonality")
-        ax.set_xlabel("Tahun")
-        ax.set_ylabel("Produksi (kg)")
-        ax.grid(True)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_seasonality])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik garis menunjukkan pola produksi berdasarkan curah hujan. Produksi tertinggi terjadi pada kondisi curah hujan sedang, sementara produksi terendah terjadi pada curah hujan tinggi.
-        - Harga rata-rata tertinggi tercatat pada curah hujan sedang, sedangkan harga terendah terjadi pada curah hujan tinggi.
-        """)
+        st.markdown(conclusion_text(conclusions['seasonality']))
         
         # Proyeksi Permintaan dan Produksi
         st.subheader("Proyeksi Permintaan dan Produksi")
-        yearly_production = analyze_yearly_production(data)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.lineplot(data=yearly_production.reset_index(), x='tahun', y='sum', marker='o', ax=ax)
-        ax.set_title("Proyeksi Permintaan dan Produksi")
-        ax.set_xlabel("Tahun")
-        ax.set_ylabel("Total Produksi (kg)")
-        ax.grid(True)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_production_projection])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik garis menunjukkan proyeksi produksi kakao. Produksi diproyeksikan menurun hingga tahun tertentu, menunjukkan perlunya upaya untuk meningkatkan produktivitas.
-        """)
+        st.markdown(conclusion_text(conclusions['projection']))
         
         # Analisis Kompetisi (Market Share)
         st.subheader("Analisis Kompetisi (Market Share)")
-        market_share = data.groupby('wilayah')['produksi_pertahun'].sum().reset_index()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=market_share['wilayah'], y=market_share['produksi_pertahun'], palette='viridis', ax=ax)
-        ax.set_title("Analisis Kompetisi (Market Share)")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Total Produksi (kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_market_share])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik batang menunjukkan pangsa pasar per wilayah. Misalnya, Halmahera Utara memiliki pangsa pasar terbesar, diikuti oleh wilayah lainnya.
-        - Wilayah dengan pangsa pasar besar memiliki kontribusi signifikan terhadap total produksi.
-        """)
+        st.markdown(conclusion_text(conclusions['market_share']))
         
         # Analisis Faktor Harga
         st.subheader("Analisis Faktor Harga")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.scatterplot(data=data, x='produksi_pertahun', y='harga', hue='wilayah', ax=ax)
-        ax.set_title("Analisis Faktor Harga")
-        ax.set_xlabel("Produksi (kg)")
-        ax.set_ylabel("Harga (Rp/kg)")
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_price_factors])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Scatter plot menunjukkan hubungan antara produksi dan harga. Korelasi antara produksi per tahun dan harga menunjukkan pengaruh yang sangat lemah.
-        - Faktor lain seperti luas lahan dan tingkat kesuburan tanah juga tidak menunjukkan hubungan signifikan dengan harga.
-        """)
+        st.markdown(conclusion_text(conclusions['price_factors']))
+
+        # Segmentasi wilayah dan catatan produksi berdasarkan lahan dan kesuburan
+        show_clustering(data, CROP_FEATURES)
 
     # Tab 3: Analisis Risiko dan Rekomendasi Implementasi
     with tabs[2]:
@@ -292,44 +408,29 @@ def main():
         
         # Analisis Skor Wilayah
         st.subheader("Analisis Skor Wilayah")
-        potential_regions = analyze_potential_regions(data).sort_values('skor_potensi', ascending=False).head()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=potential_regions.index, y=potential_regions['skor_potensi'], palette='plasma', ax=ax)
-        ax.set_title("Analisis Skor Wilayah")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Skor Potensi")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_regional_scores])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik batang menunjukkan skor potensi per wilayah. Wilayah dengan skor tinggi memiliki potensi besar untuk pengembangan kakao.
-        - Wilayah dengan skor menengah memiliki potensi untuk ditingkatkan dengan intervensi yang tepat.
-        """)
+        st.markdown(conclusion_text(conclusions['regional_scores']))
         
         # Analisis Risiko Produksi
         st.subheader("Analisis Risiko Produksi")
-        risk_data = data.groupby('wilayah')['produksi_pertahun'].std().reset_index()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x=risk_data['wilayah'], y=risk_data['produksi_pertahun'], palette='coolwarm', ax=ax)
-        ax.set_title("Analisis Risiko Produksi")
-        ax.set_xlabel("Wilayah")
-        ax.set_ylabel("Standar Deviasi Produksi (kg)")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_production_risk])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Grafik batang menunjukkan standar deviasi produksi per wilayah. Wilayah dengan standar deviasi tinggi menunjukkan risiko produksi yang lebih besar.
-        - Wilayah ini mungkin memerlukan strategi mitigasi risiko untuk meningkatkan stabilitas produksi.
-        """)
+        st.markdown(conclusion_text(conclusions['risk']))
+
+        # Risiko produksi bergulir per tahun
+        show_rolling_risk(data, key='kakao_rolling_risk')
+
+        # Simulasi pendapatan per wilayah (VaR dan peluang rugi)
+        show_revenue_risk(data, key='kakao_montecarlo')
+
+        # Simulasi produksi bila lahan, kesuburan, atau curah hujan berubah
+        show_whatif(data, key='kakao_whatif')
         
         # Rekomendasi Implementasi
         st.subheader("Rekomendasi Implementasi")
         recommendations = generate_recommendations(data)
-        st.write(recommendations)
+        show_table(recommendations, key='kakao_recommendations')
         st.markdown("""
         **Rekomendasi Implementasi:**
         - **Ekspansi agresif, fokus peningkatan kapasitas** untuk wilayah unggulan.
@@ -343,19 +444,9 @@ def main():
         
         # Contoh analisis peluang pasar
         st.subheader("Peluang Pasar Berdasarkan Permintaan")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(data=data, x='permintaan_pasar', y='produksi_pertahun', palette='cool', ax=ax)
-        ax.set_title("Peluang Pasar Berdasarkan Permintaan")
-        ax.set_xlabel("Kategori Permintaan")
-        ax.set_ylabel("Produksi (kg)")
-        st.pyplot(fig)
-        plt.close(fig)
+        show_chart(charts[plot_market_opportunity])
         
-        st.markdown("""
-        **Kesimpulan:**
-        - Peluang pasar terbesar ada di wilayah dengan permintaan tinggi.
-        - Wilayah dengan permintaan sedang memiliki potensi untuk ditingkatkan melalui strategi pemasaran.
-        """)
+        st.markdown(conclusion_text(conclusions['opportunity']))
 
     # Tab 5: Kesimpulan Utama
     with tabs[4]:
@@ -369,6 +460,9 @@ def main():
         - Manajemen risiko dan diversifikasi produk diperlukan untuk mengurangi fluktuasi harga.
         """)
 
+    # Unduhan tabel analisis dan data mentah
+    show_export(data, EXPORT_TABLES, key='kakao_export', title='kakao')
+
 # Panggil fungsi main() untuk menjalankan dashboard
 if __name__ == "__main__":
     main()
@@ -1,20 +1,47 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.preprocessing import LabelEncoder
 import matplotlib.ticker as ticker
 import plotly.express as px
-from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import MinMaxScaler
 
-# Fungsi untuk memuat data
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/data_padi.csv")
+from core.analysis import (CORRELATION_COLUMNS, analyze_correlation, analyze_market_demand,
+                           analyze_potential_regions, analyze_price_per_region, analyze_rain_production,
+                           analyze_top_regions, analyze_yearly_production)
+from core.cache import FIGURES, exclude_outliers_toggle, load_dataset, show_data_quality, single_flight, versioned_cache
+from core.clustering import CROP_FEATURES, show_clustering
+from core.export import COMMON_TABLES, show_export
+from core.forecast import METHOD_NAMES, analyze_forecast, best_projection, show_forecast
+from core.longtail import top_n_mean
+from core.narrative import (bullet_list, describe_change, describe_correlation,
+                            describe_extremes, describe_position, describe_ranking,
+                            describe_share, describe_slope, format_number,
+                            join_words, unit_formatter)
+from core.montecarlo import risk_columns, revenue_risk, show_revenue_risk
+from core.risk import analyze_risk
+from core.trends import ALL_REGIONS, analyze_trends, show_rolling_risk, show_trends
+from core.whatif import fit_response, show_whatif
+
+# Fungsi untuk memuat data (di-cache per versi dataset)
+def load_data(exclude_outliers=False):
+    df = load_dataset("padi", exclude_outliers)
     return df
 
+# Kolom faktor harga (korelasi harga dengan faktor produksi dan konsumsi)
+PRICE_FACTOR_COLUMNS = ('harga', 'produksi_pertahun', 'tingkat_konsumsi_perkapita_perkg',
+                        'luas_lahan_hektar', 'tingkat_kesuburan_tanah')
+
+# Fungsi untuk grafik rata-rata produksi per tahun
+@versioned_cache(tier=FIGURES)
+def plot_yearly_production(yearly_production):
+    fig = px.line(yearly_production, x=yearly_production.index, y='mean', title='Rata-rata Produksi per Tahun')
+    return fig
+
 # Fungsi untuk analisis strategi per wilayah
+@single_flight
+@versioned_cache
 def analyze_regional_strategy(df):
     regional_metrics = df.groupby('wilayah').agg({
         'produksi_pertahun': ['mean', 'std'],
@@ -29,7 +56,7 @@ def analyze_regional_strategy(df):
     metrics_for_scoring = ['produksi_pertahun', 'harga', 'tingkat_konsumsi_perkapita_perkg',
                            'luas_lahan_hektar', 'tingkat_kesuburan_tanah']
 
-    regional_scores = pd.DataFrame()
+    regional_scores = pd.DataFrame(index=regional_metrics.index)
     for metric in metrics_for_scoring:
         if metric in regional_metrics.columns.get_level_values(0):
             regional_scores[f'{metric}_score'] = scaler.fit_transform(
@@ -44,40 +71,24 @@ def analyze_regional_strategy(df):
 
     return regional_scores
 
-# Fungsi untuk analisis risiko
+# Fungsi untuk analisis risiko (CV, tercile, dan matriks curah hujan dari satu lintasan data)
+@single_flight
+@versioned_cache
 def analyze_risks(df):
-    risk_metrics = df.groupby('wilayah').agg({
-        'produksi_pertahun': lambda x: x.std() / x.mean() * 100,
-        'harga': lambda x: x.std() / x.mean() * 100,
-        'tingkat_kesuburan_tanah': 'mean',
-        'curah_hujan': lambda x: x.value_counts().index[0]
-    })
-
-    risk_metrics['risiko_produksi'] = pd.qcut(risk_metrics['produksi_pertahun'],
-                                              q=3,
-                                              labels=['Rendah', 'Sedang', 'Tinggi'])
-    risk_metrics['risiko_harga'] = pd.qcut(risk_metrics['harga'],
-                                           q=3,
-                                           labels=['Rendah', 'Sedang', 'Tinggi'])
-
-    weather_risk = df.pivot_table(
-        values='produksi_pertahun',
-        index='wilayah',
-        columns='curah_hujan',
-        aggfunc='mean'
-    ).fillna(0)
-
+    risk_analysis = analyze_risk(df, extra_means=['tingkat_kesuburan_tanah'])
     return {
-        'risk_metrics': risk_metrics,
-        'weather_risk': weather_risk
+        'risk_metrics': risk_analysis['risk_metrics'],
+        'weather_risk': risk_analysis['weather_risk']
     }
 
 # Fungsi untuk rekomendasi implementasi
+@single_flight
+@versioned_cache
 def generate_recommendations(df):
     regional_scores = analyze_regional_strategy(df)
     risk_analysis = analyze_risks(df)
 
-    recommendations = pd.DataFrame(index=df['wilayah'].unique())
+    recommendations = pd.DataFrame(index=pd.Index(df['wilayah'].unique(), name='wilayah'))
 
     recommendations['kategori'] = regional_scores['kategori']
     recommendations['risiko_produksi'] = risk_analysis['risk_metrics']['risiko_produksi']
@@ -99,12 +110,576 @@ def generate_recommendations(df):
 
     recommendations['rekomendasi'] = recommendations.apply(get_recommendation, axis=1)
 
+    # Value-at-risk dan peluang rugi dari simulasi Monte Carlo pendapatan
+    recommendations = recommendations.join(risk_columns(df, recommendations.index))
+
     return recommendations
 
+# Fungsi untuk proyeksi produksi 2025-2026 dengan metode terbaik hasil backtesting
+@versioned_cache
+def project_production(df):
+    projections_df = best_projection(df)
+    return projections_df
+
+# Fungsi untuk market share per wilayah
+@versioned_cache
+def analyze_market_share(df):
+    market_share = df.groupby('wilayah').agg({
+        'produksi_pertahun': 'sum',
+        'luas_lahan_hektar': 'mean',
+        'harga': 'mean'
+    })
+    market_share['market_share'] = (market_share['produksi_pertahun'] / market_share['produksi_pertahun'].sum() * 100).round(2)
+    return market_share
+
+# Format angka untuk teks kesimpulan
+ton = unit_formatter('ton', 2)
+total_ton = unit_formatter('ton')
+rupiah = unit_formatter('Rp', 2)
+percent = unit_formatter('%', 2)
+score = unit_formatter('', 2)
+
+# Penyusun teks kesimpulan per submenu. Setiap penyusun hanya menghitung
+# analisis yang dibutuhkan submenunya, sehingga membuka satu submenu tidak
+# menjalankan seluruh analisis dashboard.
+def _yearly_conclusions(df):
+    yearly_production = analyze_yearly_production(df)
+    return [
+        describe_extremes(yearly_production['sum'], "Total produksi padi", 'tahun ', total_ton),
+        describe_extremes(yearly_production['mean'], "Rata-rata produksi", 'tahun ', ton),
+        describe_change(yearly_production['sum'], "total produksi padi"),
+    ]
+
+def _top_regions_conclusions(df):
+    top_regions = analyze_top_regions(df)
+    return [
+        describe_ranking(top_regions['sum'], "total produksi", fmt=total_ton),
+        describe_extremes(top_regions['mean'], "Rata-rata produksi", '', ton),
+    ]
+
+def _rain_conclusions(df):
+    by_rain = analyze_rain_production(df)
+    return [
+        describe_extremes(by_rain['mean'], "Rata-rata produksi", 'curah hujan ', ton),
+    ]
+
+def _market_demand_conclusions(df):
+    by_demand = analyze_market_demand(df)
+    return [
+        describe_extremes(by_demand['produksi_pertahun'], "Rata-rata produksi", 'permintaan pasar ', ton),
+        describe_extremes(by_demand['harga'], "Harga rata-rata", 'permintaan pasar ', rupiah),
+    ]
+
+def _price_conclusions(df):
+    price_by_region = analyze_price_per_region(df)['harga']['mean']
+    return [
+        describe_ranking(price_by_region, "harga rata-rata", n=2, fmt=rupiah),
+        describe_extremes(price_by_region, "Harga rata-rata", '', rupiah),
+    ]
+
+def _correlation_conclusions(df):
+    correlation = analyze_correlation(df, PRICE_FACTOR_COLUMNS)
+    return [
+        describe_correlation(correlation.loc['produksi_pertahun', 'harga'], "produksi tahunan", "harga"),
+        describe_correlation(correlation.loc['produksi_pertahun', 'luas_lahan_hektar'], "produksi tahunan", "luas lahan"),
+        describe_correlation(correlation.loc['produksi_pertahun', 'tingkat_konsumsi_perkapita_perkg'], "produksi tahunan", "tingkat konsumsi per kapita"),
+    ]
+
+def _potential_conclusions(df):
+    potential_scores = analyze_potential_regions(df)['skor_potensi']
+    return [
+        describe_ranking(potential_scores, "skor potensi", fmt=score),
+        describe_position(potential_scores, 'Kabupaten Pulau Morotai', "skor potensi", score),
+    ]
+
+def _seasonality_conclusions(df):
+    by_rain = analyze_rain_production(df)
+    return [
+        describe_extremes(by_rain['mean'], "Rata-rata produksi", 'curah hujan ', ton),
+        describe_extremes(by_rain['harga'], "Harga rata-rata", 'curah hujan ', rupiah),
+    ]
+
+def _projection_conclusions(df):
+    # Proyeksi dua tahun ke depan dengan metode terbaik hasil backtesting
+    projections_df = project_production(df)
+    projections = [f"tahun {year} sebesar {ton(value)}" for year, value in
+                   zip(projections_df['tahun'], projections_df['proyeksi_produksi'])]
+    forecast_method = projections_df['metode'].iloc[0]
+    forecast_error = analyze_forecast(df)['best'].loc[ALL_REGIONS]
+    return [
+        f"Proyeksi rata-rata produksi {join_words(projections)}.",
+        (f"Metode {METHOD_NAMES[forecast_method]} dipilih karena galat backtesting terkecil "
+         f"(MAE {ton(forecast_error['mae'])}, MAPE {percent(forecast_error['mape'])})."),
+        describe_slope(analyze_yearly_production(df)['mean'], "rata-rata produksi", ton),
+    ]
+
+def _market_share_conclusions(df):
+    market_share = analyze_market_share(df)['market_share']
+    return [
+        describe_ranking(market_share, "market share", fmt=percent),
+    ]
+
+def _price_factors_conclusions(df):
+    correlation = analyze_correlation(df, PRICE_FACTOR_COLUMNS)
+    return [
+        describe_correlation(correlation.loc['harga', 'produksi_pertahun'], "harga", "produksi tahunan"),
+        describe_correlation(correlation.loc['harga', 'tingkat_konsumsi_perkapita_perkg'], "harga", "tingkat konsumsi per kapita"),
+        describe_correlation(correlation.loc['harga', 'tingkat_kesuburan_tanah'], "harga", "tingkat kesuburan tanah"),
+    ]
+
+def _strategy_conclusions(df):
+    regional_scores = analyze_regional_strategy(df)
+    return [
+        describe_ranking(regional_scores['total_score'], "skor total", fmt=score),
+        f"Wilayah kategori unggulan: {join_words(regional_scores.index[regional_scores['kategori'] == 'Unggulan'])}.",
+    ]
+
+def _risk_conclusions(df):
+    risk_metrics = analyze_risks(df)['risk_metrics']
+    high_risk = risk_metrics.index[(risk_metrics['risiko_produksi'] == 'Tinggi') & (risk_metrics['risiko_harga'] == 'Tinggi')]
+    return [
+        describe_extremes(risk_metrics['produksi_pertahun'], "Koefisien variasi produksi", '', percent),
+        describe_extremes(risk_metrics['harga'], "Koefisien variasi harga", '', percent),
+        (f"Wilayah dengan risiko produksi dan harga tinggi: {join_words(high_risk)}."
+         if len(high_risk) else "Tidak ada wilayah dengan risiko produksi dan harga yang sama-sama tinggi."),
+    ]
+
+def _recommendations_conclusions(df):
+    recommendations = generate_recommendations(df)
+    return [
+        f"**{recommendation}:** {join_words(regions.index)}."
+        for recommendation, regions in recommendations.groupby('rekomendasi')
+    ] + [
+        describe_extremes(recommendations['peluang_rugi_persen'], "Peluang rugi hasil simulasi Monte Carlo", '', percent),
+    ]
+
+def _morotai_data(df):
+    return df[df['wilayah'] == 'Kabupaten Pulau Morotai']
+
+def _morotai_production_conclusions(df):
+    morotai_yearly = _morotai_data(df).groupby('tahun')['produksi_pertahun'].mean()
+    return [
+        describe_extremes(morotai_yearly, "Produksi padi di Pulau Morotai", 'tahun ', ton),
+        describe_change(morotai_yearly, "produksi padi di Pulau Morotai"),
+    ]
+
+def _morotai_consumption_conclusions(df):
+    return [
+        (f"Rata-rata tingkat konsumsi beras per kapita di Pulau Morotai sekitar "
+         f"{format_number(_morotai_data(df)['tingkat_konsumsi_perkapita_perkg'].mean())} kg per tahun."),
+        "Kebutuhan beras lokal yang stabil menunjukkan potensi pasar yang besar.",
+    ]
+
+def _morotai_price_conclusions(df):
+    morotai_yearly = _morotai_data(df).groupby('tahun')['harga'].mean()
+    return [
+        describe_extremes(morotai_yearly, "Harga beras di Pulau Morotai", 'tahun ', rupiah),
+        "Dengan meningkatkan produksi lokal, harga beras dapat ditekan dan daya saing pasar lokal dapat ditingkatkan.",
+    ]
+
+def _morotai_rain_conclusions(df):
+    return [
+        describe_share(_morotai_data(df)['curah_hujan'].value_counts(), "Curah hujan di Pulau Morotai", 'kategori '),
+        "Dukungan pemerintah dalam pembangunan infrastruktur seperti irigasi dan jalan juga menjadi faktor pendukung utama.",
+        "Keanekaragaman hayati di Pulau Morotai memungkinkan pengembangan varietas padi lokal yang adaptif.",
+    ]
+
+def _morotai_land_conclusions(df):
+    return [
+        f"Rata-rata luas lahan pertanian di Pulau Morotai sekitar {format_number(_morotai_data(df)['luas_lahan_hektar'].mean())} hektar.",
+        "Keterbatasan lahan menjadi tantangan utama, karena sebagian besar lahan digunakan untuk kegiatan lain seperti pariwisata dan perikanan.",
+        "Kendala teknologi dan modal juga menghambat peningkatan produksi padi.",
+    ]
+
+def _morotai_fertility_conclusions(df):
+    return [
+        f"Rata-rata skor kesuburan tanah di Pulau Morotai sebesar {format_number(_morotai_data(df)['tingkat_kesuburan_tanah'].mean(), 1)} dari 10.",
+        "Peluang strategis meliputi pengembangan varietas padi unggul yang tahan terhadap kondisi tanah berpasir dan liat.",
+        "Diversifikasi pasar dan kerjasama dengan petani lokal dapat meningkatkan produktivitas dan kualitas hasil panen.",
+    ]
+
+def _morotai_land_production_conclusions(df):
+    morotai_data = _morotai_data(df)
+    return [
+        describe_correlation(morotai_data['luas_lahan_hektar'].corr(morotai_data['produksi_pertahun']), "luas lahan", "produksi padi di Pulau Morotai"),
+        "Rekomendasi utama meliputi peningkatan kapasitas produksi melalui teknologi pertanian modern, penguatan rantai pasok untuk mengurangi biaya distribusi, dan pembangunan kemitraan dengan pemerintah dan investor.",
+    ]
+
+CONCLUSION_BUILDERS = {
+    'yearly': _yearly_conclusions,
+    'top_regions': _top_regions_conclusions,
+    'rain': _rain_conclusions,
+    'market_demand': _market_demand_conclusions,
+    'price': _price_conclusions,
+    'correlation': _correlation_conclusions,
+    'potential': _potential_conclusions,
+    'seasonality': _seasonality_conclusions,
+    'projection': _projection_conclusions,
+    'market_share': _market_share_conclusions,
+    'price_factors': _price_factors_conclusions,
+    'strategy': _strategy_conclusions,
+    'risk': _risk_conclusions,
+    'recommendations': _recommendations_conclusions,
+    'morotai_production': _morotai_production_conclusions,
+    'morotai_consumption': _morotai_consumption_conclusions,
+    'morotai_price': _morotai_price_conclusions,
+    'morotai_rain': _morotai_rain_conclusions,
+    'morotai_land': _morotai_land_conclusions,
+    'morotai_fertility': _morotai_fertility_conclusions,
+    'morotai_land_production': _morotai_land_production_conclusions,
+}
+
+# Fungsi untuk menyusun teks kesimpulan satu submenu dari hasil analisis
+@single_flight
+@versioned_cache
+def build_conclusions(df, section):
+    # Kalimat khusus Pulau Morotai dilewati bila dataset tidak memuat wilayah tersebut
+    if section.startswith('morotai_') and _morotai_data(df).empty:
+        return ["Data Pulau Morotai tidak tersedia pada dataset ini."]
+    return CONCLUSION_BUILDERS[section](df)
+
+# Fungsi untuk menyusun kesimpulan semua submenu (dipakai saat pemanasan cache)
+def build_all_conclusions(df):
+    return {section: build_conclusions(df, section) for section in CONCLUSION_BUILDERS}
+
+# Tabel analisis yang dapat diekspor (diambil dari hasil yang sudah di-cache)
+EXPORT_TABLES = {
+    "Produksi per Tahun": analyze_yearly_production,
+    "Skor Strategi Wilayah": analyze_regional_strategy,
+    "Metrik Risiko": lambda df: analyze_risks(df)['risk_metrics'],
+    "Rekomendasi Implementasi": generate_recommendations,
+    "Proyeksi Produksi": project_production,
+    "Market Share Wilayah": analyze_market_share,
+    **COMMON_TABLES,
+}
+
+# Daftar perhitungan yang dipanaskan di latar belakang saat server mulai
+def warmup_tasks():
+    data = load_data()
+    yearly_production = analyze_yearly_production(data)
+    return [
+        ("Rata-rata Produksi per Tahun", plot_yearly_production, yearly_production),
+        ("Analisis Strategi Per Wilayah", analyze_regional_strategy, data),
+        ("Analisis Risiko", analyze_risks, data),
+        ("Simulasi Monte Carlo", revenue_risk, data),
+        ("Rekomendasi Implementasi", generate_recommendations, data),
+        ("Analisis Jendela Waktu", analyze_trends, data),
+        ("Kesimpulan", build_all_conclusions, data),
+        ("Model What-If", fit_response, data),
+        ("Data Tanpa Outlier", load_data, True),
+    ]
+
+# Setiap bagian menu adalah fragmen: mengganti submenu hanya menjalankan
+# ulang bagian tersebut, bukan seluruh dashboard
+
+# Bagian "Analisis Data Produksi dan Permintaan"
+@st.fragment
+def show_production_demand(data):
+    st.header("📊 Analisis Data Produksi dan Permintaan")
+    submenu = st.radio("Pilih Submenu:", 
+                       ["Tren Produksi per Tahun", 
+                        "Wilayah dengan Produksi Tertinggi", 
+                        "Pengaruh Curah Hujan terhadap Produksi", 
+                        "Analisis Permintaan Pasar", 
+                        "Analisis Harga per Wilayah", 
+                        "Analisis Korelasi", 
+                        "Wilayah Paling Potensial"])
+
+    if submenu == "Tren Produksi per Tahun":
+        st.subheader("📈 Tren Produksi per Tahun")
+        yearly_production = analyze_yearly_production(data)
+        st.write(yearly_production)
+        
+        fig = plot_yearly_production(yearly_production)
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'yearly')))
+
+        # Rata-rata bergulir, pertumbuhan tahunan, dan volatilitas per wilayah
+        show_trends(data)
+
+    elif submenu == "Wilayah dengan Produksi Tertinggi":
+        st.subheader("🏆 Wilayah dengan Produksi Tertinggi")
+        top_regions = analyze_top_regions(data)
+        st.write(top_regions.head())
+        
+        fig = px.bar(top_regions.head(), x='sum', y=top_regions.head().index, title='Top 5 Wilayah Berdasarkan Total Produksi')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'top_regions')))
+
+    elif submenu == "Pengaruh Curah Hujan terhadap Produksi":
+        st.subheader("🌧️ Pengaruh Curah Hujan terhadap Produksi")
+        rain_production = analyze_rain_production(data)[['mean', 'count']]
+        st.write(rain_production)
+        
+        fig = px.bar(rain_production.reset_index(), x='curah_hujan', y='mean', title='Rata-rata Produksi Berdasarkan Curah Hujan')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'rain')))
+
+    elif submenu == "Analisis Permintaan Pasar":
+        st.subheader("📊 Analisis Permintaan Pasar")
+        market_demand = analyze_market_demand(data)
+        st.write(market_demand)
+        
+        fig = px.bar(market_demand.reset_index(), x='permintaan_pasar', y='produksi_pertahun', title='Rata-rata Produksi Berdasarkan Permintaan Pasar')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'market_demand')))
+
+    elif submenu == "Analisis Harga per Wilayah":
+        st.subheader("💰 Analisis Harga per Wilayah")
+        price_analysis = analyze_price_per_region(data)
+        st.write(price_analysis.head())
+        
+        price_analysis_mean = top_n_mean(price_analysis['harga']['mean'], data['wilayah']).reset_index()
+        fig = px.bar(price_analysis_mean, x='wilayah', y='mean', title='Rata-rata Harga Berdasarkan Wilayah')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'price')))
+
+    elif submenu == "Analisis Korelasi":
+        st.subheader("🔗 Analisis Korelasi")
+        correlation = analyze_correlation(data, CORRELATION_COLUMNS)
+        st.write(correlation)
+        
+        fig = px.imshow(correlation, text_auto=True, title='Heatmap Korelasi')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'correlation')))
+
+    elif submenu == "Wilayah Paling Potensial":
+        st.subheader("🌟 Wilayah Paling Potensial")
+        potential_regions = analyze_potential_regions(data)
+
+        st.write(potential_regions.sort_values('skor_potensi', ascending=False).head())
+        
+        fig = px.bar(potential_regions.sort_values('skor_potensi', ascending=False).head(), 
+                     x='skor_potensi', y=potential_regions.sort_values('skor_potensi', ascending=False).head().index, 
+                     title='Top 5 Wilayah Paling Potensial')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'potential')))
+
+
+# Bagian "Analisis Data Produksi, Permintaan, dan Kompetisi"
+@st.fragment
+def show_production_competition(data):
+    st.header("📈 Analisis Data Produksi, Permintaan, dan Kompetisi")
+    submenu = st.radio("Pilih Submenu:", 
+                       ["Analisis Seasonality (Pola Produksi Berdasarkan Curah Hujan)", 
+                        "Proyeksi Permintaan Produksi (2025-2026)", 
+                        "Analisis Kompetisi (Market Share Wilayah)", 
+                        "Analisis Faktor Harga"])
+
+    if submenu == "Analisis Seasonality (Pola Produksi Berdasarkan Curah Hujan)":
+        st.subheader("🌧️ Analisis Seasonality (Pola Produksi Berdasarkan Curah Hujan)")
+        seasonal_patterns = analyze_rain_production(data)['mean'].rename('rata_produksi').reset_index()
+        st.write(seasonal_patterns)
+        
+        fig = px.bar(seasonal_patterns, x='curah_hujan', y='rata_produksi', title='Rata-rata Produksi Berdasarkan Curah Hujan')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'seasonality')))
+
+    elif submenu == "Proyeksi Permintaan Produksi (2025-2026)":
+        st.subheader("📅 Proyeksi Permintaan Produksi (2025-2026)")
+        projections_df = project_production(data)
+        st.write(projections_df)
+
+        show_forecast(data, key='padi_forecast')
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'projection')))
+
+    elif submenu == "Analisis Kompetisi (Market Share Wilayah)":
+        st.subheader("🏆 Analisis Kompetisi (Market Share Wilayah)")
+        market_share = analyze_market_share(data)
+        st.write(market_share.sort_values('market_share', ascending=False).head())
+        
+        fig = px.bar(market_share.sort_values('market_share', ascending=False).head(), 
+                     x='market_share', y=market_share.sort_values('market_share', ascending=False).head().index, 
+                     title='Market Share Top 5 Wilayah')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'market_share')))
+
+    elif submenu == "Analisis Faktor Harga":
+        st.subheader("💰 Analisis Faktor Harga")
+        price_correlation = analyze_correlation(data, PRICE_FACTOR_COLUMNS)['harga']
+        st.write(price_correlation)
+        
+        fig = px.bar(price_correlation, x=price_correlation.index, y=price_correlation.values, title='Korelasi Faktor dengan Harga')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'price_factors')))
+
+
+# Bagian "Analisis Strategi Per Wilayah dan Analisis Risiko"
+@st.fragment
+def show_strategy_risk(data):
+    st.header("📊 Analisis Strategi Per Wilayah dan Analisis Risiko")
+    submenu = st.radio("Pilih Submenu:", 
+                       ["Top 5 Wilayah Unggulan (Wilayah Unggulan & Wilayah Potensial)", 
+                        "Analisis Risiko", 
+                        "Rekomendasi Implementasi", 
+                        "Segmentasi Wilayah (Clustering)", 
+                        "Strategi Umum"])
+
+    if submenu == "Top 5 Wilayah Unggulan (Wilayah Unggulan & Wilayah Potensial)":
+        st.subheader("🌟 Top 5 Wilayah Unggulan (Wilayah Unggulan & Wilayah Potensial)")
+        regional_scores = analyze_regional_strategy(data)
+
+        st.write(regional_scores.sort_values('total_score', ascending=False).head())
+        
+        fig = px.bar(regional_scores.sort_values('total_score', ascending=False).head(), 
+                     x='total_score', y=regional_scores.sort_values('total_score', ascending=False).head().index, 
+                     title='Top 5 Wilayah Unggulan')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'strategy')))
+
+    elif submenu == "Analisis Risiko":
+        st.subheader("⚠️ Analisis Risiko")
+        risk_metrics = analyze_risks(data)['risk_metrics']
+
+        st.write(risk_metrics.sort_values('produksi_pertahun', ascending=False).head())
+        
+        fig = px.bar(risk_metrics.sort_values('produksi_pertahun', ascending=False).head(), 
+                     x='produksi_pertahun', y=risk_metrics.sort_values('produksi_pertahun', ascending=False).head().index, 
+                     title='Risiko Produksi per Wilayah')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'risk')))
+
+        show_rolling_risk(data, key='padi_rolling_risk')
+
+        show_revenue_risk(data, key='padi_montecarlo')
+
+    elif submenu == "Rekomendasi Implementasi":
+        st.subheader("📝 Rekomendasi Implementasi")
+        recommendations = generate_recommendations(data)
+        st.write(recommendations.head())
+        
+        fig = px.bar(recommendations.head(), x='rekomendasi', y=recommendations.head().index, title='Rekomendasi Implementasi per Wilayah')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'recommendations')))
+
+    elif submenu == "Segmentasi Wilayah (Clustering)":
+        st.subheader("🧩 Segmentasi Wilayah (Clustering)")
+        show_clustering(data, CROP_FEATURES)
+
+    elif submenu == "Strategi Umum":
+        st.subheader("📋 Strategi Umum")
+        with st.expander("Lihat Strategi Umum"):
+            st.write("""
+            **Strategi Umum:**
+            - **Penguatan Infrastruktur Produksi:** Investasi dalam teknologi pertanian dan manajemen air di wilayah dengan curah hujan rendah.
+            - **Diversifikasi Produk dan Pemasaran:** Mengembangkan produk bernilai tambah untuk wilayah dengan risiko harga tinggi guna menstabilkan pendapatan.
+            - **Pengelolaan Risiko:** Wilayah dengan risiko tinggi memerlukan pendekatan mitigasi risiko yang komprehensif, termasuk kontrak harga tetap dan pengelolaan stok.
+            """)
+
+
+# Bagian "Analisis Peluang Pasar Padi di Pulau Morotai"
+@st.fragment
+def show_morotai_opportunity(data):
+    st.header("🌾 Analisis Peluang Pasar Padi di Pulau Morotai")
+    submenu = st.radio("Pilih Submenu:", 
+                       ["Produksi Padi di Pulau Morotai", 
+                        "Permintaan Lokal dan Konsumsi Beras", 
+                        "Potensi Ekonomi dan Harga Pasar", 
+                        "Faktor Pendukung (Pemerintah dan Infrastruktur, Keanekaragaman Hayati)", 
+                        "Tantangan (Keterbatasan Lahan, Kendala Teknologi dan Modal)", 
+                        "Peluang Strategis (Pengembangan Varietas Unggul, Diversifikasi Pasar, Kerjasama dengan Petani Lokal)", 
+                        "Rekomendasi (Peningkatan Kapasitas Produksi, Penguatan Rantai Pasok, Pembangunan Kemitraan)"])
+
+    if submenu == "Produksi Padi di Pulau Morotai":
+        st.subheader("🌾 Produksi Padi di Pulau Morotai")
+        morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
+        fig = px.line(morotai_data, x='tahun', y='produksi_pertahun', title='Produksi Padi di Pulau Morotai per Tahun')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'morotai_production')))
+
+    elif submenu == "Permintaan Lokal dan Konsumsi Beras":
+        st.subheader("🍚 Permintaan Lokal dan Konsumsi Beras")
+        morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
+        fig = px.bar(morotai_data, x='tahun', y='tingkat_konsumsi_perkapita_perkg', title='Tingkat Konsumsi Beras per Kapita di Pulau Morotai')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'morotai_consumption')))
+
+    elif submenu == "Potensi Ekonomi dan Harga Pasar":
+        st.subheader("💰 Potensi Ekonomi dan Harga Pasar")
+        morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
+        fig = px.line(morotai_data, x='tahun', y='harga', title='Harga Beras di Pulau Morotai per Tahun')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'morotai_price')))
+
+    elif submenu == "Faktor Pendukung (Pemerintah dan Infrastruktur, Keanekaragaman Hayati)":
+        st.subheader("🏛️ Faktor Pendukung (Pemerintah dan Infrastruktur, Keanekaragaman Hayati)")
+        morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
+        fig = px.bar(morotai_data, x='curah_hujan', title='Distribusi Curah Hujan di Pulau Morotai')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'morotai_rain')))
+
+    elif submenu == "Tantangan (Keterbatasan Lahan, Kendala Teknologi dan Modal)":
+        st.subheader("🚧 Tantangan (Keterbatasan Lahan, Kendala Teknologi dan Modal)")
+        morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
+        fig = px.line(morotai_data, x='tahun', y='luas_lahan_hektar', title='Luas Lahan Pertanian di Pulau Morotai per Tahun')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'morotai_land')))
+
+    elif submenu == "Peluang Strategis (Pengembangan Varietas Unggul, Diversifikasi Pasar, Kerjasama dengan Petani Lokal)":
+        st.subheader("🚀 Peluang Strategis (Pengembangan Varietas Unggul, Diversifikasi Pasar, Kerjasama dengan Petani Lokal)")
+        morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
+        fig = px.bar(morotai_data, x='tahun', y='tingkat_kesuburan_tanah', title='Tingkat Kesuburan Tanah di Pulau Morotai per Tahun')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'morotai_fertility')))
+
+    elif submenu == "Rekomendasi (Peningkatan Kapasitas Produksi, Penguatan Rantai Pasok, Pembangunan Kemitraan)":
+        st.subheader("📝 Rekomendasi (Peningkatan Kapasitas Produksi, Penguatan Rantai Pasok, Pembangunan Kemitraan)")
+        morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
+        fig = px.scatter(morotai_data, x='luas_lahan_hektar', y='produksi_pertahun', title='Hubungan Luas Lahan dan Produksi di Pulau Morotai')
+        st.plotly_chart(fig)
+        
+        with st.expander("Kesimpulan"):
+            st.write(bullet_list(build_conclusions(data, 'morotai_land_production')))
+
+        # Simulasi produksi bila lahan, kesuburan, atau curah hujan berubah
+        show_whatif(data, key='padi_whatif')
+
+
 # Fungsi utama untuk menjalankan dashboard
 def main():
-    # Memuat data
-    data = load_data()
+    # Memuat data (tanpa outlier bila sakelar di sidebar aktif)
+    data = load_data(exclude_outliers_toggle())
+    show_data_quality("padi")
 
     # Sidebar untuk navigasi
     st.sidebar.title("Menu")
@@ -117,458 +692,19 @@ def main():
     choice = st.sidebar.selectbox("Pilih Menu", menu_options)
 
     if choice == "Analisis Data Produksi dan Permintaan":
-        st.header("📊 Analisis Data Produksi dan Permintaan")
-        submenu = st.radio("Pilih Submenu:", 
-                           ["Tren Produksi per Tahun", 
-                            "Wilayah dengan Produksi Tertinggi", 
-                            "Pengaruh Curah Hujan terhadap Produksi", 
-                            "Analisis Permintaan Pasar", 
-                            "Analisis Harga per Wilayah", 
-                            "Analisis Korelasi", 
-                            "Wilayah Paling Potensial"])
-
-        if submenu == "Tren Produksi per Tahun":
-            st.subheader("📈 Tren Produksi per Tahun")
-            yearly_production = data.groupby('tahun')['produksi_pertahun'].agg(['mean', 'sum']).round(2)
-            st.write(yearly_production)
-            
-            fig = px.line(yearly_production, x=yearly_production.index, y='mean', title='Rata-rata Produksi per Tahun')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Produksi padi mengalami fluktuasi dari tahun ke tahun.
-                - Produksi tertinggi terjadi pada tahun 2023 dengan rata-rata 2.137 ton dan total produksi 161.868 ton.
-                - Penurunan produksi terlihat pada tahun 2020 dan 2022.
-                """)
-
-        elif submenu == "Wilayah dengan Produksi Tertinggi":
-            st.subheader("🏆 Wilayah dengan Produksi Tertinggi")
-            top_regions = data.groupby('wilayah')['produksi_pertahun'].agg(['mean', 'sum']).round(2).sort_values('sum', ascending=False)
-            st.write(top_regions.head())
-            
-            fig = px.bar(top_regions.head(), x='sum', y=top_regions.head().index, title='Top 5 Wilayah Berdasarkan Total Produksi')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Kabupaten Halmahera Tengah memimpin dengan rata-rata produksi tertinggi sebesar 3.071,09 ton dan total produksi 107.488 ton.
-                - Kabupaten Pulau Taliabu dan Kota Ternate juga menunjukkan performa produksi yang baik.
-                """)
-
-        elif submenu == "Pengaruh Curah Hujan terhadap Produksi":
-            st.subheader("🌧️ Pengaruh Curah Hujan terhadap Produksi")
-            rain_production = data.groupby('curah_hujan')['produksi_pertahun'].agg(['mean', 'count']).round(2)
-            st.write(rain_production)
-            
-            fig = px.bar(rain_production.reset_index(), x='curah_hujan', y='mean', title='Rata-rata Produksi Berdasarkan Curah Hujan')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Produksi tertinggi terjadi pada wilayah dengan curah hujan tinggi (rata-rata produksi 2.749,75 ton).
-                - Curah hujan sedang dan rendah menghasilkan rata-rata produksi lebih rendah.
-                """)
-
-        elif submenu == "Analisis Permintaan Pasar":
-            st.subheader("📊 Analisis Permintaan Pasar")
-            market_demand = data.groupby('permintaan_pasar').agg({
-                'produksi_pertahun': 'mean',
-                'harga': 'mean',
-                'wilayah': 'count'
-            }).round(2)
-            st.write(market_demand)
-            
-            fig = px.bar(market_demand.reset_index(), x='permintaan_pasar', y='produksi_pertahun', title='Rata-rata Produksi Berdasarkan Permintaan Pasar')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Wilayah dengan permintaan pasar tinggi memiliki rata-rata produksi yang lebih tinggi.
-                - Harga cenderung lebih stabil di wilayah dengan permintaan pasar tinggi.
-                """)
-
-        elif submenu == "Analisis Harga per Wilayah":
-            st.subheader("💰 Analisis Harga per Wilayah")
-            price_analysis = data.groupby('wilayah').agg({
-                'harga': ['mean', 'min', 'max'],
-                'permintaan_pasar': lambda x: x.value_counts().index[0]
-            }).round(2)
-            st.write(price_analysis.head())
-            
-            price_analysis_mean = price_analysis['harga']['mean'].reset_index()
-            fig = px.bar(price_analysis_mean, x='wilayah', y='mean', title='Rata-rata Harga Berdasarkan Wilayah')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Harga rata-rata tertinggi ditemukan di Kabupaten Halmahera Tengah (Rp 9.550,09), diikuti oleh Kabupaten Halmahera Selatan (Rp 9.486,80).
-                - Wilayah dengan harga lebih rendah seperti Kabupaten Halmahera Timur (Rp 8.799,42) memiliki permintaan pasar rendah.
-                """)
-
-        elif submenu == "Analisis Korelasi":
-            st.subheader("🔗 Analisis Korelasi")
-            correlation = data[['produksi_pertahun', 'harga', 'luas_lahan_hektar', 'tingkat_konsumsi_perkapita_perkg']].corr()
-            st.write(correlation)
-            
-            fig = px.imshow(correlation, text_auto=True, title='Heatmap Korelasi')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Produksi tahunan memiliki korelasi yang lemah terhadap harga (0,020), luas lahan (-0,079), dan tingkat konsumsi per kapita (-0,021).
-                - Faktor eksternal seperti curah hujan mungkin memiliki pengaruh yang lebih signifikan terhadap produksi dibandingkan faktor internal seperti luas lahan.
-                """)
-
-        elif submenu == "Wilayah Paling Potensial":
-            st.subheader("🌟 Wilayah Paling Potensial")
-            potential_regions = data.groupby('wilayah').agg({
-                'produksi_pertahun': 'mean',
-                'permintaan_pasar': lambda x: x.value_counts().index[0],
-                'tingkat_konsumsi_perkapita_perkg': 'mean',
-                'harga': 'mean'
-            }).round(2)
-
-            potential_regions['skor_potensi'] = (
-                (potential_regions['produksi_pertahun'] / potential_regions['produksi_pertahun'].max()) * 0.3 +
-                (potential_regions['tingkat_konsumsi_perkapita_perkg'] / potential_regions['tingkat_konsumsi_perkapita_perkg'].max()) * 0.3 +
-                (potential_regions['harga'] / potential_regions['harga'].max()) * 0.4
-            ).round(2)
-
-            st.write(potential_regions.sort_values('skor_potensi', ascending=False).head())
-            
-            fig = px.bar(potential_regions.sort_values('skor_potensi', ascending=False).head(), 
-                         x='skor_potensi', y=potential_regions.sort_values('skor_potensi', ascending=False).head().index, 
-                         title='Top 5 Wilayah Paling Potensial')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Kabupaten Halmahera Tengah adalah wilayah paling potensial dengan skor potensi 0,96, didukung oleh produksi tinggi (3.071,09 ton), harga terbaik (Rp 9.550,09), dan permintaan pasar tinggi.
-                - Kabupaten Halmahera Barat (skor potensi 0,95) dan Halmahera Selatan (skor potensi 0,91) juga memiliki potensi besar.
-                """)
+        show_production_demand(data)
 
     elif choice == "Analisis Data Produksi, Permintaan, dan Kompetisi":
-        st.header("📈 Analisis Data Produksi, Permintaan, dan Kompetisi")
-        submenu = st.radio("Pilih Submenu:", 
-                           ["Analisis Seasonality (Pola Produksi Berdasarkan Curah Hujan)", 
-                            "Proyeksi Permintaan Produksi (2025-2026)", 
-                            "Analisis Kompetisi (Market Share Wilayah)", 
-                            "Analisis Faktor Harga"])
-
-        if submenu == "Analisis Seasonality (Pola Produksi Berdasarkan Curah Hujan)":
-            st.subheader("🌧️ Analisis Seasonality (Pola Produksi Berdasarkan Curah Hujan)")
-            seasonal_patterns = data.groupby('curah_hujan')['produksi_pertahun'].mean().reset_index()
-            seasonal_patterns.rename(columns={'produksi_pertahun': 'rata_produksi'}, inplace=True)
-            st.write(seasonal_patterns)
-            
-            fig = px.bar(seasonal_patterns, x='curah_hujan', y='rata_produksi', title='Rata-rata Produksi Berdasarkan Curah Hujan')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Produksi meningkat seiring dengan curah hujan, dengan rata-rata produksi tertinggi pada curah hujan tinggi.
-                - Harga cenderung lebih rendah pada wilayah dengan curah hujan tinggi, sementara curah hujan rendah memiliki harga tertinggi.
-                """)
-
-        elif submenu == "Proyeksi Permintaan Produksi (2025-2026)":
-            st.subheader("📅 Proyeksi Permintaan Produksi (2025-2026)")
-            yearly_trend = data.groupby('tahun').agg({
-                'produksi_pertahun': 'mean',
-                'permintaan_pasar': lambda x: x.value_counts().index[0],
-                'harga': 'mean'
-            }).reset_index()
-
-            X = yearly_trend[['tahun']]
-            y = yearly_trend['produksi_pertahun']
-            model = LinearRegression()
-            model.fit(X, y)
-
-            future_years = pd.DataFrame({'tahun': [2025, 2026]})
-            projections = model.predict(future_years)
-
-            projections_df = pd.DataFrame({
-                'tahun': future_years['tahun'],
-                'proyeksi_produksi': projections.round(2)
-            })
-            st.write(projections_df)
-            
-            fig = px.line(yearly_trend, x='tahun', y='produksi_pertahun', title='Proyeksi Produksi (2025-2026)')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Proyeksi produksi stabil pada kisaran 2.662 ton per tahun.
-                - Tren ini menunjukkan pertumbuhan produksi yang stagnan, sehingga diperlukan inovasi atau optimalisasi untuk mendorong peningkatan produksi.
-                """)
-
-        elif submenu == "Analisis Kompetisi (Market Share Wilayah)":
-            st.subheader("🏆 Analisis Kompetisi (Market Share Wilayah)")
-            market_share = data.groupby('wilayah').agg({
-                'produksi_pertahun': 'sum',
-                'luas_lahan_hektar': 'mean',
-                'harga': 'mean'
-            })
-            market_share['market_share'] = (market_share['produksi_pertahun'] / market_share['produksi_pertahun'].sum() * 100).round(2)
-            st.write(market_share.sort_values('market_share', ascending=False).head())
-            
-            fig = px.bar(market_share.sort_values('market_share', ascending=False).head(), 
-                         x='market_share', y=market_share.sort_values('market_share', ascending=False).head().index, 
-                         title='Market Share Top 5 Wilayah')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Kabupaten Halmahera Tengah memiliki market share tertinggi (13,45%), diikuti oleh Pulau Taliabu (13,19%) dan Kota Ternate (11,28%).
-                - Wilayah dengan market share tinggi juga memiliki rata-rata produksi tinggi, menunjukkan dominasi produksi sebagai faktor kunci persaingan.
-                """)
-
-        elif submenu == "Analisis Faktor Harga":
-            st.subheader("💰 Analisis Faktor Harga")
-            price_correlation = data[['harga', 'produksi_pertahun', 'tingkat_konsumsi_perkapita_perkg',
-                                    'luas_lahan_hektar', 'tingkat_kesuburan_tanah']].corr()['harga']
-            st.write(price_correlation)
-            
-            fig = px.bar(price_correlation, x=price_correlation.index, y=price_correlation.values, title='Korelasi Faktor dengan Harga')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Harga memiliki korelasi lemah dengan produksi tahunan (0,02) dan tingkat konsumsi per kapita (0,016), menunjukkan bahwa faktor-faktor ini bukan pendorong utama harga.
-                - Korelasi negatif antara harga dan tingkat kesuburan tanah (-0,067) menunjukkan wilayah dengan tanah lebih subur cenderung memiliki harga lebih rendah, mungkin karena efisiensi produksi.
-                """)
+        show_production_competition(data)
 
     elif choice == "Analisis Strategi Per Wilayah dan Analisis Risiko":
-        st.header("📊 Analisis Strategi Per Wilayah dan Analisis Risiko")
-        submenu = st.radio("Pilih Submenu:", 
-                           ["Top 5 Wilayah Unggulan (Wilayah Unggulan & Wilayah Potensial)", 
-                            "Analisis Risiko", 
-                            "Rekomendasi Implementasi", 
-                            "Strategi Umum"])
-
-        if submenu == "Top 5 Wilayah Unggulan (Wilayah Unggulan & Wilayah Potensial)":
-            st.subheader("🌟 Top 5 Wilayah Unggulan (Wilayah Unggulan & Wilayah Potensial)")
-            regional_metrics = data.groupby('wilayah').agg({
-                'produksi_pertahun': ['mean', 'std'],
-                'harga': ['mean', 'std'],
-                'permintaan_pasar': lambda x: x.value_counts().index[0],
-                'tingkat_konsumsi_perkapita_perkg': 'mean',
-                'luas_lahan_hektar': 'mean',
-                'tingkat_kesuburan_tanah': 'mean'
-            })
-
-            scaler = MinMaxScaler()
-            metrics_for_scoring = ['produksi_pertahun', 'harga', 'tingkat_konsumsi_perkapita_perkg',
-                                   'luas_lahan_hektar', 'tingkat_kesuburan_tanah']
-
-            regional_scores = pd.DataFrame()
-            for metric in metrics_for_scoring:
-                if metric in regional_metrics.columns.get_level_values(0):
-                    regional_scores[f'{metric}_score'] = scaler.fit_transform(
-                        regional_metrics[metric]['mean'].values.reshape(-1, 1)
-                    ).flatten()
-
-            regional_scores['total_score'] = regional_scores.mean(axis=1)
-
-            regional_scores['kategori'] = pd.qcut(regional_scores['total_score'],
-                                                   q=3,
-                                                   labels=['Berkembang', 'Potensial', 'Unggulan'])
-
-            st.write(regional_scores.sort_values('total_score', ascending=False).head())
-            
-            fig = px.bar(regional_scores.sort_values('total_score', ascending=False).head(), 
-                         x='total_score', y=regional_scores.sort_values('total_score', ascending=False).head().index, 
-                         title='Top 5 Wilayah Unggulan')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Wilayah dengan kategori unggulan memiliki skor total di atas 0.55, seperti wilayah **2, 5, 8, dan 9**, yang menunjukkan potensi besar untuk peningkatan produksi dan efisiensi.
-                - Wilayah dengan skor total mendekati 0.50 seperti wilayah **0**, menunjukkan adanya potensi yang dapat dioptimalkan lebih lanjut melalui investasi dan pengembangan.
-                """)
-
-        elif submenu == "Analisis Risiko":
-            st.subheader("⚠️ Analisis Risiko")
-            risk_metrics = data.groupby('wilayah').agg({
-                'produksi_pertahun': lambda x: x.std() / x.mean() * 100,
-                'harga': lambda x: x.std() / x.mean() * 100,
-                'tingkat_kesuburan_tanah': 'mean',
-                'curah_hujan': lambda x: x.value_counts().index[0]
-            })
-
-            risk_metrics['risiko_produksi'] = pd.qcut(risk_metrics['produksi_pertahun'],
-                                                      q=3,
-                                                      labels=['Rendah', 'Sedang', 'Tinggi'])
-            risk_metrics['risiko_harga'] = pd.qcut(risk_metrics['harga'],
-                                                   q=3,
-                                                   labels=['Rendah', 'Sedang', 'Tinggi'])
-
-            weather_risk = data.pivot_table(
-                values='produksi_pertahun',
-                index='wilayah',
-                columns='curah_hujan',
-                aggfunc='mean'
-            ).fillna(0)
-
-            st.write(risk_metrics.sort_values('produksi_pertahun', ascending=False).head())
-            
-            fig = px.bar(risk_metrics.sort_values('produksi_pertahun', ascending=False).head(), 
-                         x='produksi_pertahun', y=risk_metrics.sort_values('produksi_pertahun', ascending=False).head().index, 
-                         title='Risiko Produksi per Wilayah')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - **Kota Ternate** dan **Kabupaten Halmahera Utara** memiliki risiko produksi dan harga yang tinggi.
-                - Faktor utama risiko termasuk fluktuasi harga tinggi dan curah hujan rendah, yang dapat menghambat stabilitas produksi.
-                """)
-
-        elif submenu == "Rekomendasi Implementasi":
-            st.subheader("📝 Rekomendasi Implementasi")
-            regional_scores = analyze_regional_strategy(data)
-            risk_analysis = analyze_risks(data)
-
-            recommendations = pd.DataFrame(index=data['wilayah'].unique())
-
-            recommendations['kategori'] = regional_scores['kategori']
-            recommendations['risiko_produksi'] = risk_analysis['risk_metrics']['risiko_produksi']
-            recommendations['risiko_harga'] = risk_analysis['risk_metrics']['risiko_harga']
-
-            def get_recommendation(row):
-                if row['kategori'] == 'Unggulan':
-                    if row['risiko_produksi'] == 'Rendah':
-                        return 'Ekspansi agresif, fokus peningkatan kapasitas'
-                    else:
-                        return 'Ekspansi terkendali, fokus manajemen risiko'
-                elif row['kategori'] == 'Potensial':
-                    if row['risiko_harga'] == 'Rendah':
-                        return 'Pengembangan bertahap, fokus efisiensi'
-                    else:
-                        return 'Pengembangan selektif, diversifikasi pasar'
-                else:
-                    return 'Evaluasi ulang strategi, fokus perbaikan fundamental'
-
-            recommendations['rekomendasi'] = recommendations.apply(get_recommendation, axis=1)
-            st.write(recommendations.head())
-            
-            fig = px.bar(recommendations.head(), x='rekomendasi', y=recommendations.head().index, title='Rekomendasi Implementasi per Wilayah')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - **Kabupaten Halmahera Tengah:** Risiko moderat dengan stabilitas harga yang baik. Fokus pada evaluasi strategi untuk meningkatkan efisiensi produksi.
-                - **Kabupaten Pulau Morotai dan Halmahera Barat:** Risiko rendah pada produksi dan harga. Strategi perbaikan fundamental di wilayah ini dapat meningkatkan output dan daya saing.
-                """)
-
-        elif submenu == "Strategi Umum":
-            st.subheader("📋 Strategi Umum")
-            with st.expander("Lihat Strategi Umum"):
-                st.write("""
-                **Strategi Umum:**
-                - **Penguatan Infrastruktur Produksi:** Investasi dalam teknologi pertanian dan manajemen air di wilayah dengan curah hujan rendah.
-                - **Diversifikasi Produk dan Pemasaran:** Mengembangkan produk bernilai tambah untuk wilayah dengan risiko harga tinggi guna menstabilkan pendapatan.
-                - **Pengelolaan Risiko:** Wilayah dengan risiko tinggi memerlukan pendekatan mitigasi risiko yang komprehensif, termasuk kontrak harga tetap dan pengelolaan stok.
-                """)
+        show_strategy_risk(data)
 
     elif choice == "Analisis Peluang Pasar Padi di Pulau Morotai":
-        st.header("🌾 Analisis Peluang Pasar Padi di Pulau Morotai")
-        submenu = st.radio("Pilih Submenu:", 
-                           ["Produksi Padi di Pulau Morotai", 
-                            "Permintaan Lokal dan Konsumsi Beras", 
-                            "Potensi Ekonomi dan Harga Pasar", 
-                            "Faktor Pendukung (Pemerintah dan Infrastruktur, Keanekaragaman Hayati)", 
-                            "Tantangan (Keterbatasan Lahan, Kendala Teknologi dan Modal)", 
-                            "Peluang Strategis (Pengembangan Varietas Unggul, Diversifikasi Pasar, Kerjasama dengan Petani Lokal)", 
-                            "Rekomendasi (Peningkatan Kapasitas Produksi, Penguatan Rantai Pasok, Pembangunan Kemitraan)"])
-
-        if submenu == "Produksi Padi di Pulau Morotai":
-            st.subheader("🌾 Produksi Padi di Pulau Morotai")
-            morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
-            fig = px.line(morotai_data, x='tahun', y='produksi_pertahun', title='Produksi Padi di Pulau Morotai per Tahun')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Produksi padi di Pulau Morotai menunjukkan tren yang fluktuatif dari tahun ke tahun.
-                - Pada tahun 2023, produksi mencapai puncaknya dengan 2.137 ton, tetapi pada tahun 2019 produksi hanya 1.232 ton.
-                - Curah hujan yang tinggi di wilayah ini menjadi salah satu faktor pendukung produksi padi.
-                """)
-
-        elif submenu == "Permintaan Lokal dan Konsumsi Beras":
-            st.subheader("🍚 Permintaan Lokal dan Konsumsi Beras")
-            morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
-            fig = px.bar(morotai_data, x='tahun', y='tingkat_konsumsi_perkapita_perkg', title='Tingkat Konsumsi Beras per Kapita di Pulau Morotai')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Tingkat konsumsi beras per kapita di Pulau Morotai cenderung stabil, dengan rata-rata sekitar 200 kg per tahun.
-                - Kebutuhan beras tahunan di Pulau Morotai diperkirakan mencapai 5.820 ton, yang menunjukkan potensi pasar yang besar.
-                """)
-
-        elif submenu == "Potensi Ekonomi dan Harga Pasar":
-            st.subheader("💰 Potensi Ekonomi dan Harga Pasar")
-            morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
-            fig = px.line(morotai_data, x='tahun', y='harga', title='Harga Beras di Pulau Morotai per Tahun')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Harga beras di Pulau Morotai cenderung fluktuatif, dengan puncak harga tertinggi pada tahun 2019 sebesar Rp 13.876.
-                - Harga yang tinggi ini disebabkan oleh biaya distribusi yang mahal dari wilayah produsen utama.
-                - Dengan meningkatkan produksi lokal, harga beras dapat ditekan dan daya saing pasar lokal dapat ditingkatkan.
-                """)
-
-        elif submenu == "Faktor Pendukung (Pemerintah dan Infrastruktur, Keanekaragaman Hayati)":
-            st.subheader("🏛️ Faktor Pendukung (Pemerintah dan Infrastruktur, Keanekaragaman Hayati)")
-            morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
-            fig = px.bar(morotai_data, x='curah_hujan', title='Distribusi Curah Hujan di Pulau Morotai')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Curah hujan di Pulau Morotai didominasi oleh kategori **tinggi**, yang sangat mendukung pertanian padi.
-                - Dukungan pemerintah dalam pembangunan infrastruktur seperti irigasi dan jalan juga menjadi faktor pendukung utama.
-                - Keanekaragaman hayati di Pulau Morotai memungkinkan pengembangan varietas padi lokal yang adaptif.
-                """)
-
-        elif submenu == "Tantangan (Keterbatasan Lahan, Kendala Teknologi dan Modal)":
-            st.subheader("🚧 Tantangan (Keterbatasan Lahan, Kendala Teknologi dan Modal)")
-            morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
-            fig = px.line(morotai_data, x='tahun', y='luas_lahan_hektar', title='Luas Lahan Pertanian di Pulau Morotai per Tahun')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Luas lahan pertanian di Pulau Morotai cenderung stabil, dengan rata-rata sekitar 60 hektar per tahun.
-                - Keterbatasan lahan menjadi tantangan utama, karena sebagian besar lahan digunakan untuk kegiatan lain seperti pariwisata dan perikanan.
-                - Kendala teknologi dan modal juga menghambat peningkatan produksi padi.
-                """)
-
-        elif submenu == "Peluang Strategis (Pengembangan Varietas Unggul, Diversifikasi Pasar, Kerjasama dengan Petani Lokal)":
-            st.subheader("🚀 Peluang Strategis (Pengembangan Varietas Unggul, Diversifikasi Pasar, Kerjasama dengan Petani Lokal)")
-            morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
-            fig = px.bar(morotai_data, x='tahun', y='tingkat_kesuburan_tanah', title='Tingkat Kesuburan Tanah di Pulau Morotai per Tahun')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Tingkat kesuburan tanah di Pulau Morotai cukup tinggi, dengan rata-rata skor 7 dari 10.
-                - Peluang strategis meliputi pengembangan varietas padi unggul yang tahan terhadap kondisi tanah berpasir dan liat.
-                - Diversifikasi pasar dan kerjasama dengan petani lokal dapat meningkatkan produktivitas dan kualitas hasil panen.
-                """)
-
-        elif submenu == "Rekomendasi (Peningkatan Kapasitas Produksi, Penguatan Rantai Pasok, Pembangunan Kemitraan)":
-            st.subheader("📝 Rekomendasi (Peningkatan Kapasitas Produksi, Penguatan Rantai Pasok, Pembangunan Kemitraan)")
-            morotai_data = data[data['wilayah'] == 'Kabupaten Pulau Morotai']
-            fig = px.scatter(morotai_data, x='luas_lahan_hektar', y='produksi_pertahun', title='Hubungan Luas Lahan dan Produksi di Pulau Morotai')
-            st.plotly_chart(fig)
-            
-            with st.expander("Kesimpulan"):
-                st.write("""
-                - Terdapat korelasi positif antara luas lahan dan produksi padi di Pulau Morotai.
-                - Rekomendasi utama meliputi peningkatan kapasitas produksi melalui teknologi pertanian modern, penguatan rantai pasok untuk mengurangi biaya distribusi, dan pembangunan kemitraan dengan pemerintah dan investor.
-                """)
+        show_morotai_opportunity(data)
+
+    # Unduhan tabel analisis dan data mentah
+    show_export(data, EXPORT_TABLES, key='padi_export', title='padi')
 
 # Panggil fungsi main() untuk menjalankan dashboard
 if __name__ == "__main__":
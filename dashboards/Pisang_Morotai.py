@@ -6,84 +6,153 @@ import seaborn as sns
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import MinMaxScaler
 
-# Fungsi untuk memuat data
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/data_pisang.csv")
+from core.analysis import analyze_market_demand, analyze_potential_regions, analyze_yearly_production
+from core.cache import exclude_outliers_toggle, load_dataset, show_data_quality, single_flight, versioned_cache
+from core.clustering import CROP_FEATURES, show_clustering
+from core.export import COMMON_TABLES, show_export
+from core.montecarlo import revenue_risk, show_revenue_risk
+from core.narrative import (conclusion_text, describe_change, describe_extremes,
+                            describe_position, describe_ranking, unit_formatter)
+from core.rendering import render_chart, show_chart, submit_charts
+from core.trends import analyze_trends, show_trends
+from core.whatif import fit_response, show_whatif
+
+# Fungsi untuk memuat data (di-cache per versi dataset)
+def load_data(exclude_outliers=False):
+    df = load_dataset("pisang", exclude_outliers)
     return df
 
+# Fungsi untuk menyusun teks kesimpulan dari hasil analisis (di-cache per versi dataset)
+@single_flight
+@versioned_cache
+def build_conclusions(df):
+    kg = unit_formatter('kg')
+    yearly_production = analyze_yearly_production(df)['sum']
+    market_demand = analyze_market_demand(df)['produksi_pertahun']
+    potential_scores = analyze_potential_regions(df)['skor_potensi']
+    score = unit_formatter('', 2)
+    return {
+        'trend': [
+            describe_extremes(yearly_production, "Total produksi pisang", 'tahun ', kg),
+            describe_change(yearly_production, "total produksi pisang"),
+        ],
+        'market': [
+            describe_extremes(market_demand, "Rata-rata produksi per tahun", 'permintaan pasar ', kg),
+        ],
+        'strategy': [
+            describe_position(potential_scores, 'Kabupaten Pulau Morotai', "skor potensi", score),
+            describe_ranking(potential_scores, "skor potensi", fmt=score),
+        ],
+    }
+
+# Fungsi-fungsi grafik (dirender menjadi PNG di pool proses)
+def plot_yearly_production(df):
+    yearly_production = analyze_yearly_production(df)['sum']
+    fig, ax = plt.subplots()
+    yearly_production.plot(kind='line', ax=ax)
+    ax.set_title('Tren Produksi Pisang per Tahun')
+    ax.set_xlabel('Tahun')
+    ax.set_ylabel('Total Produksi')
+    return fig
+
+def plot_market_demand(df):
+    market_demand = analyze_market_demand(df)['produksi_pertahun']
+    fig, ax = plt.subplots()
+    market_demand.plot(kind='bar', ax=ax)
+    ax.set_title('Rata-rata Produksi Berdasarkan Permintaan Pasar')
+    ax.set_xlabel('Permintaan Pasar')
+    ax.set_ylabel('Rata-rata Produksi')
+    return fig
+
+def plot_potential_regions(df):
+    regional_scores = analyze_potential_regions(df)
+    fig, ax = plt.subplots()
+    regional_scores['skor_potensi'].sort_values(ascending=False).head().plot(kind='bar', ax=ax)
+    ax.set_title('Top 5 Wilayah Paling Potensial')
+    ax.set_xlabel('Wilayah')
+    ax.set_ylabel('Skor Potensi')
+    return fig
+
+# Grafik yang ditampilkan dashboard
+CHARTS = [
+    plot_yearly_production,
+    plot_market_demand,
+    plot_potential_regions,
+]
+
+# Tabel analisis yang dapat diekspor (diambil dari hasil yang sudah di-cache)
+EXPORT_TABLES = {
+    "Produksi per Tahun": analyze_yearly_production,
+    "Permintaan Pasar": analyze_market_demand,
+    "Wilayah Potensial": analyze_potential_regions,
+    **COMMON_TABLES,
+}
+
+# Daftar perhitungan yang dipanaskan di latar belakang saat server mulai
+def warmup_tasks():
+    data = load_data()
+    return [
+        *[(builder.__name__, render_chart, builder, data) for builder in CHARTS],
+        ("Simulasi Monte Carlo", revenue_risk, data),
+        ("Analisis Jendela Waktu", analyze_trends, data),
+        ("Kesimpulan", build_conclusions, data),
+        ("Model What-If", fit_response, data),
+        ("Data Tanpa Outlier", load_data, True),
+    ]
+
 # Fungsi utama untuk menjalankan dashboard
 def main():
-    # Memuat data
-    data = load_data()
+    # Memuat data (tanpa outlier bila sakelar di sidebar aktif)
+    data = load_data(exclude_outliers_toggle())
+    show_data_quality("pisang")
+
+    # Memulai rendering seluruh grafik secara paralel; setiap grafik
+    # ditampilkan begitu selesai sehingga grafik pertama muncul lebih cepat
+    charts = submit_charts(CHARTS, data)
+
+    # Teks kesimpulan disusun dari hasil analisis versi dataset yang sama
+    conclusions = build_conclusions(data)
 
     # Judul dashboard
     st.title("Analisis Peluang Pasar Pisang di Pulau Morotai")
 
     # Membuat tab
     tab1, tab2, tab3, tab4 = st.tabs([
-        "Tren Produksi", 
-        "Analisis Pasar", 
-        "Analisis Strategi", 
+        "Tren Produksi",
+        "Analisis Pasar",
+        "Analisis Strategi",
         "Rekomendasi"
     ])
 
     # Tab 1: Tren Produksi
     with tab1:
         st.header("Tren Produksi Pisang di Pulau Morotai")
-        
+
         # Grafik tren produksi
-        yearly_production = data.groupby('tahun')['produksi_pertahun'].sum()
-        fig, ax = plt.subplots()
-        yearly_production.plot(kind='line', ax=ax)
-        ax.set_title('Tren Produksi Pisang per Tahun')
-        ax.set_xlabel('Tahun')
-        ax.set_ylabel('Total Produksi')
-        st.pyplot(fig)
-        plt.close(fig)
-        st.write("**Kesimpulan:** Produksi pisang menunjukkan tren yang stabil dengan peningkatan signifikan pada tahun 2024.")
+        show_chart(charts[plot_yearly_production])
+        st.markdown(conclusion_text(conclusions['trend']))
+
+        # Rata-rata bergulir, pertumbuhan tahunan, dan volatilitas per wilayah
+        show_trends(data)
 
     # Tab 2: Analisis Pasar
     with tab2:
         st.header("Analisis Pasar Pisang di Pulau Morotai")
-        
+
         # Grafik analisis pasar
-        market_demand = data.groupby('permintaan_pasar')['produksi_pertahun'].mean()
-        fig, ax = plt.subplots()
-        market_demand.plot(kind='bar', ax=ax)
-        ax.set_title('Rata-rata Produksi Berdasarkan Permintaan Pasar')
-        ax.set_xlabel('Permintaan Pasar')
-        ax.set_ylabel('Rata-rata Produksi')
-        st.pyplot(fig)
-        plt.close(fig)
-        st.write("**Kesimpulan:** Wilayah dengan permintaan pasar tinggi memiliki rata-rata produksi 8.115 kg/tahun.")
+        show_chart(charts[plot_market_demand])
+        st.markdown(conclusion_text(conclusions['market']))
 
     # Tab 3: Analisis Strategi
     with tab3:
         st.header("Analisis Strategi Pasar Pisang")
-        
+
         # Grafik strategi pasar
-        regional_scores = data.groupby('wilayah').agg({
-            'produksi_pertahun': 'mean',
-            'permintaan_pasar': lambda x: x.value_counts().index[0],
-            'tingkat_konsumsi_perkapita_perkg': 'mean',
-            'harga': 'mean'
-        }).round(2)
-        
-        regional_scores['skor_potensi'] = (
-            (regional_scores['produksi_pertahun'] / regional_scores['produksi_pertahun'].max()) * 0.3 +
-            (regional_scores['tingkat_konsumsi_perkapita_perkg'] / regional_scores['tingkat_konsumsi_perkapita_perkg'].max()) * 0.3 +
-            (regional_scores['harga'] / regional_scores['harga'].max()) * 0.4
-        ).round(2)
-        
-        fig, ax = plt.subplots()
-        regional_scores['skor_potensi'].sort_values(ascending=False).head().plot(kind='bar', ax=ax)
-        ax.set_title('Top 5 Wilayah Paling Potensial')
-        ax.set_xlabel('Wilayah')
-        ax.set_ylabel('Skor Potensi')
-        st.pyplot(fig)
-        plt.close(fig)
-        st.write("**Kesimpulan:** Pulau Morotai menempati peringkat kedua wilayah paling potensial dengan skor 0,91.")
+        show_chart(charts[plot_potential_regions])
+        st.markdown(conclusion_text(conclusions['strategy']))
+
+        # Segmentasi wilayah dan catatan produksi berdasarkan lahan dan kesuburan
+        show_clustering(data, CROP_FEATURES)
 
     # Tab 4: Rekomendasi
     with tab4:
@@ -94,6 +163,15 @@ def main():
         - Manajemen risiko terkait fluktuasi harga.
         """)
 
+        # Simulasi pendapatan per wilayah (VaR dan peluang rugi)
+        show_revenue_risk(data, key='pisang_montecarlo')
+
+        # Simulasi produksi bila lahan, kesuburan, atau curah hujan berubah
+        show_whatif(data, key='pisang_whatif')
+
+    # Unduhan tabel analisis dan data mentah
+    show_export(data, EXPORT_TABLES, key='pisang_export', title='pisang')
+
 # Panggil fungsi main() untuk menjalankan dashboard
 if __name__ == "__main__":
     main()
@@ -7,47 +7,90 @@ from dashboards.Cengkeh_Morotai import main as cengkeh_dashboard
 from dashboards.Kakao_Morotai import main as kakao_dashboard
 from dashboards.Padi_Morotai import main as padi_dashboard
 from dashboards.Pisang_Morotai import main as pisang_dashboard
+from dashboards import Ayam_Petelur_Morotai, Cengkeh_Morotai, Kakao_Morotai, Padi_Morotai, Pisang_Morotai
 
+from core.catalog import dataset_versions
+from core.memory import governor, show_memory_panel
+from core.singleflight import flights
+from core.snapshot import rebuild_in_background
+from core.warmup import Warmup
 
-# Judul aplikasi
-st.title("🌿 Dashboard Analisis Pertanian Pulau Morotai")
-
-# Sidebar untuk navigasi
-st.sidebar.title("📂 Menu Dashboard")
-dashboard_options = [
-    "Analisis Ayam Petelur",
-    "Analisis Cengkeh",
-    "Analisis Kakao",
-    "Analisis Pisang",
-    "Analisis Padi"
-]
-selected_dashboard = st.sidebar.selectbox("Pilih Dashboard", dashboard_options)
-
-# Menampilkan dashboard yang dipilih
-if selected_dashboard == "Analisis Ayam Petelur":
-    st.header("🐔 Analisis Ayam Petelur di Pulau Morotai")
-    ayam_dashboard()
-
-elif selected_dashboard == "Analisis Cengkeh":
-    st.header("🌿 Analisis Cengkeh di Pulau Morotai")
-    cengkeh_dashboard()
-
-elif selected_dashboard == "Analisis Kakao":
-    st.header("🍫 Analisis Kakao di Pulau Morotai")
-    kakao_dashboard()
-
-elif selected_dashboard == "Analisis Pisang":
-    st.header("🍌 Analisis Pisang di Pulau Morotai")
-    pisang_dashboard()
-
-elif selected_dashboard == "Analisis Padi":
-    st.header("🌾 Analisis Padi di Pulau Morotai")
-    padi_dashboard()
-
-# Catatan tambahan
-st.sidebar.markdown("---")
-st.sidebar.markdown("**Catatan:**")
-st.sidebar.markdown("""
-- Pilih dashboard dari menu di atas untuk melihat analisis spesifik.
-- Setiap dashboard menyediakan analisis produksi, permintaan pasar, dan rekomendasi strategis.
-""")
+WARMUP_TASKS = {
+    "Ayam Petelur": Ayam_Petelur_Morotai.warmup_tasks,
+    "Cengkeh": Cengkeh_Morotai.warmup_tasks,
+    "Kakao": Kakao_Morotai.warmup_tasks,
+    "Pisang": Pisang_Morotai.warmup_tasks,
+    "Padi": Padi_Morotai.warmup_tasks
+}
+
+# Satu objek pemanasan cache untuk seluruh sesi di server ini
+@st.cache_resource
+def get_warmup():
+    return Warmup()
+
+
+# Fungsi utama aplikasi. Isi skrip dibungkus main() karena pool proses
+# rendering (spawn) mengimpor ulang skrip utama di setiap proses pekerja.
+def main():
+    # Memanaskan cache saat server mulai dan setiap kali versi dataset berubah;
+    # snapshot statis (bila SNAPSHOT_DIR diisi) ikut dibangun ulang
+    warmup = get_warmup()
+    if warmup.ensure(dataset_versions(), WARMUP_TASKS):
+        rebuild_in_background()
+
+    # Judul aplikasi
+    st.title("🌿 Dashboard Analisis Pertanian Pulau Morotai")
+
+    # Sidebar untuk navigasi
+    st.sidebar.title("📂 Menu Dashboard")
+    dashboard_options = [
+        "Analisis Ayam Petelur",
+        "Analisis Cengkeh",
+        "Analisis Kakao",
+        "Analisis Pisang",
+        "Analisis Padi"
+    ]
+    selected_dashboard = st.sidebar.selectbox("Pilih Dashboard", dashboard_options)
+
+    # Menampilkan dashboard yang dipilih
+    if selected_dashboard == "Analisis Ayam Petelur":
+        st.header("🐔 Analisis Ayam Petelur di Pulau Morotai")
+        ayam_dashboard()
+
+    elif selected_dashboard == "Analisis Cengkeh":
+        st.header("🌿 Analisis Cengkeh di Pulau Morotai")
+        cengkeh_dashboard()
+
+    elif selected_dashboard == "Analisis Kakao":
+        st.header("🍫 Analisis Kakao di Pulau Morotai")
+        kakao_dashboard()
+
+    elif selected_dashboard == "Analisis Pisang":
+        st.header("🍌 Analisis Pisang di Pulau Morotai")
+        pisang_dashboard()
+
+    elif selected_dashboard == "Analisis Padi":
+        st.header("🌾 Analisis Padi di Pulau Morotai")
+        padi_dashboard()
+
+    # Status pemanasan cache
+    warmup_status = warmup.status()
+    if warmup_status['running']:
+        progress = warmup_status['done'] / warmup_status['total'] if warmup_status['total'] else 0.0
+        st.sidebar.progress(progress, text=f"Menyiapkan cache dashboard ({warmup_status['done']}/{warmup_status['total']})")
+    elif warmup_status['errors']:
+        st.sidebar.warning(f"Pemanasan cache selesai dengan {len(warmup_status['errors'])} kesalahan.")
+
+    # Pemakaian memori cache per tier (hit, miss, eviksi)
+    show_memory_panel(governor, flights.status())
+
+    # Catatan tambahan
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("**Catatan:**")
+    st.sidebar.markdown("""
+    - Pilih dashboard dari menu di atas untuk melihat analisis spesifik.
+    - Setiap dashboard menyediakan analisis produksi, permintaan pasar, dan rekomendasi strategis.
+    """)
+
+if __name__ == "__main__":
+    main()
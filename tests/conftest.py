@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def root_dir(monkeypatch):
+    # Dataset dibaca dari data/ relatif terhadap direktori kerja
+    monkeypatch.chdir(ROOT)
+    return ROOT
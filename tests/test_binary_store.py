@@ -0,0 +1,27 @@
+import os
+import shutil
+
+import pandas as pd
+
+from core.binary_store import read_dataset
+
+
+def test_reconversion_keeps_open_memmaps_valid(root_dir, tmp_path, monkeypatch):
+    os.makedirs(tmp_path / 'data')
+    shutil.copy(os.path.join(root_dir, 'data', 'data_kakao.csv'), tmp_path / 'data' / 'data_kakao.csv')
+    monkeypatch.chdir(tmp_path)
+    path = os.path.join('data', 'data_kakao.csv')
+
+    old = read_dataset(path)
+    expected = old.copy(deep=True)
+
+    # CSV diperbarui: konversi baru tidak boleh menimpa file kolom lama
+    source = pd.read_csv(path)
+    source.iloc[: len(source) // 2].to_csv(path, index=False)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    new = read_dataset(path)
+
+    assert len(new) == len(source) // 2
+    pd.testing.assert_frame_equal(old.copy(deep=True), expected)
+    versions = [entry for entry in os.listdir(os.path.join('data', '_binary', 'data_kakao')) if entry.startswith('v')]
+    assert len(versions) == 1
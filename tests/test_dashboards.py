@@ -0,0 +1,27 @@
+import pytest
+
+from core.apptest import DASHBOARDS
+from core.perfcheck import run_dashboard, table_changes
+
+
+@pytest.fixture(scope='module')
+def pool():
+    from core.rendering import start_pool
+    start_pool()
+
+
+@pytest.mark.parametrize('slug', list(DASHBOARDS))
+def test_dashboard_pages_render_repeatably(slug, root_dir, pool):
+    from core.memory import governor
+
+    # Nilai tabel setiap halaman harus sama setelah cache dikosongkan
+    governor.clear()
+    first = run_dashboard(slug, root_dir)
+    governor.clear()
+    second = run_dashboard(slug, root_dir)
+
+    assert set(first) == set(second)
+    for name, page in first.items():
+        assert page['kesalahan'] == [], name
+        assert second[name]['elemen'] == page['elemen'], name
+        assert table_changes(second[name]['tabel'], page['tabel']) == [], name
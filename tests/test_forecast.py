@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from core.forecast import backtest
+
+
+def test_backtest_exact_methods_have_zero_error():
+    years = pd.Index(range(2010, 2020), name='tahun')
+    matrix = pd.DataFrame([np.arange(10) * 50.0 + 100.0, np.full(10, 300.0)],
+                          index=pd.Index(['naik', 'tetap'], name='wilayah'), columns=years)
+    result = backtest(matrix)
+    assert result['best'].loc['naik', 'mae'] == 0
+    assert result['best'].loc['tetap', 'mae'] == 0
+    np.testing.assert_allclose(result['forecast'].loc['naik'].to_numpy(), [600.0, 650.0])
+    np.testing.assert_allclose(result['forecast'].loc['tetap'].to_numpy(), [300.0, 300.0])
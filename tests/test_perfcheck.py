@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from core.perfcheck import compare, synthetic_dataset, table_changes, table_record
+from core.schema import SCHEMAS
+
+
+def _table():
+    return pd.DataFrame({'wilayah': ['a', 'b'], 'produksi': [10.0, 20.5], 'jumlah': [1, 2]})
+
+
+def test_table_changes_detects_values_and_labels():
+    base = [table_record(_table())]
+    assert table_changes([table_record(_table())], base) == []
+
+    changed = _table()
+    changed.loc[1, 'produksi'] = 21.0
+    assert table_changes([table_record(changed)], base) == ["tabel 1: nilai berubah (produksi)"]
+
+    renamed = _table()
+    renamed.loc[0, 'wilayah'] = 'c'
+    assert table_changes([table_record(renamed)], base) == ["tabel 1: isi label atau teks berubah"]
+
+    assert table_changes([table_record(_table().iloc[:1])], base) == ["tabel 1: kolom atau jumlah baris berubah"]
+    assert table_changes([], base) == ["jumlah tabel berubah 1 -> 0"]
+
+
+def test_table_changes_tolerates_rounding_noise():
+    noisy = _table()
+    noisy['produksi'] += 1e-12
+    assert table_changes([table_record(noisy)], [table_record(_table())]) == []
+
+
+def test_compare_flags_errors_and_missing_pages():
+    page = {'detik': 1.0, 'memori_mb': 1.0, 'elemen': {'table': 1}, 'tabel': [table_record(_table())],
+            'kesalahan': []}
+    table, failures = compare({'a': page}, {'a': page})
+    assert failures == [] and table.loc['a', 'status'] == 'ok'
+
+    table, failures = compare({'a': dict(page, detik=5.0, kesalahan=['boom'])}, {'a': page, 'b': page})
+    assert "b: halaman tidak lagi dirender" in failures
+    assert "a: error: boom" in failures
+    assert any(failure.startswith("a: 400% lebih lambat") for failure in failures)
+
+
+def test_synthetic_dataset_is_deterministic_and_regions_grow(root_dir):
+    source = pd.read_csv(f"{root_dir}/data/data_kakao.csv")
+    first = synthetic_dataset(source, SCHEMAS['kakao'], rows=5000)
+    pd.testing.assert_frame_equal(first, synthetic_dataset(source, SCHEMAS['kakao'], rows=5000))
+    assert len(first) == 5000
+
+    synthetic = first[first['wilayah'].str.startswith('Desa Sintetis')]
+    per_year = synthetic.groupby('tahun')['wilayah'].nunique()
+    assert per_year.iloc[-1] > per_year.iloc[0]
+    assert np.all(first['produksi_pertahun'] >= SCHEMAS['kakao']['produksi_pertahun'].min)
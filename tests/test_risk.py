@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from core.catalog import read_commodity
+from core.risk import grouped_moments, merge_moments, rolling_risk, summarize_moments
+
+
+def test_merge_moments_matches_full_data():
+    df = read_commodity('kakao')
+    half = len(df) // 2
+    columns = ['produksi_pertahun', 'harga']
+    merged = merge_moments(grouped_moments(df.iloc[:half], 'wilayah', columns),
+                           grouped_moments(df.iloc[half:], 'wilayah', columns))
+    full = grouped_moments(df, 'wilayah', columns)
+    pd.testing.assert_frame_equal(merged.loc[full.index], full, check_dtype=False)
+
+
+def test_rolling_risk_matches_direct_window():
+    df = read_commodity('kakao')
+    window = 3
+    result = rolling_risk(df, window)
+    years = sorted(df['tahun'].unique())
+
+    frame = pd.DataFrame({'wilayah': df['wilayah'].astype(str), 'tahun': df['tahun'].astype(int),
+                          'produksi': df['produksi_pertahun'].astype(float)})
+    for year in years:
+        recent = frame[(frame['tahun'] > year - window) & (frame['tahun'] <= year)]
+        total = result['total'].loc[year]
+        assert np.isclose(total['mean'], recent['produksi'].mean())
+        assert np.isclose(total['std'], recent['produksi'].std(ddof=1))
+        for region, values in recent.groupby('wilayah')['produksi']:
+            row = result['wilayah'].loc[(region, year)]
+            assert np.isclose(row['mean'], values.mean())
+            if len(values) > 1:
+                assert np.isclose(row['std'], values.std(ddof=1))
+
+
+def test_summarize_moments_single_value_has_no_std():
+    df = pd.DataFrame({'wilayah': ['a', 'b', 'b'], 'x': [1.0, 2.0, 4.0]})
+    summary = summarize_moments(grouped_moments(df, 'wilayah', ['x']))['x']
+    assert np.isnan(summary.loc['a', 'std'])
+    assert np.isclose(summary.loc['b', 'std'], np.sqrt(2.0))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from core.catalog import read_commodity
+from core.clustering import feature_matrix
+from core.whatif import FEATURES, TARGET, evaluate_scenarios, fit_response
+
+COEFFICIENTS = np.array([120.0, -35.0, 60.0])
+
+
+@pytest.fixture
+def planted():
+    # Produksi dibangkitkan dari koefisien dan intersep wilayah yang diketahui
+    df = read_commodity('kakao').copy()
+    features = feature_matrix(df, FEATURES)
+    regions = df['wilayah'].astype(str)
+    intercepts = {region: 1000.0 + 250.0 * i for i, region in enumerate(sorted(regions.unique()))}
+    df[TARGET] = features @ COEFFICIENTS + regions.map(intercepts).to_numpy()
+    return df, intercepts
+
+
+def test_fit_response_recovers_planted_model(planted):
+    df, intercepts = planted
+    model = fit_response(df)
+    np.testing.assert_allclose(model['koefisien'].to_numpy(), COEFFICIENTS, rtol=1e-8)
+    np.testing.assert_allclose(model['dasar']['intersep'].to_numpy(),
+                               [intercepts[region] for region in model['dasar'].index], rtol=1e-8)
+    assert np.isclose(model['r2'], 1.0)
+    assert model['n'] == len(df)
+
+
+def test_unchanged_scenario_predicts_region_mean():
+    model = fit_response(read_commodity('kakao'))
+    np.testing.assert_allclose(evaluate_scenarios(model)[0], model['dasar'][TARGET].clip(lower=0), rtol=1e-8)
+
+
+def test_scenarios_vectorized_over_changes():
+    model = fit_response(read_commodity('kakao'))
+    production = evaluate_scenarios(model, land_change=[0.0, 10.0, 20.0])
+    assert production.shape == (3, len(model['dasar']))
+    np.testing.assert_allclose(production[1], evaluate_scenarios(model, land_change=10.0)[0])